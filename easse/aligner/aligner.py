@@ -3,13 +3,16 @@ from easse.aligner.utils import *
 from easse.aligner.corenlp_utils import *
 
 
-def alignNouns(source, target, sourceParseResult, targetParseResult, existingAlignments):
+def alignNouns(source, target, sourceParseResult, targetParseResult, existingAlignments, similarities=None):
     # source and target:: each is a list of elements of the form:
     # [[character begin offset, character end offset], word index, word, lemma, pos tag]
 
     global ppdbSim
     global theta1
 
+    if similarities is None:
+        similarities = WordSimilarities()
+
     nounAlignments = []
 
     sourceWordIndices = [i + 1 for i in range(len(source))]
@@ -53,13 +56,13 @@ def alignNouns(source, target, sourceParseResult, targetParseResult, existingAli
 
             if (
                 max(
-                    wordRelatedness(
+                    similarities.relatedness(
                         sourceWords[i - 1],
                         sourcePosTags[i - 1],
                         targetWords[j - 1],
                         targetPosTags[j - 1],
                     ),
-                    wordRelatedness(
+                    similarities.relatedness(
                         sourceLemmas[i - 1],
                         sourcePosTags[i - 1],
                         targetLemmas[j - 1],
@@ -71,13 +74,13 @@ def alignNouns(source, target, sourceParseResult, targetParseResult, existingAli
                 continue
 
             wordSimilarities[(i, j)] = max(
-                wordRelatedness(
+                similarities.relatedness(
                     sourceWords[i - 1],
                     sourcePosTags[i - 1],
                     targetWords[j - 1],
                     targetPosTags[j - 1],
                 ),
-                wordRelatedness(
+                similarities.relatedness(
                     sourceLemmas[i - 1],
                     sourcePosTags[i - 1],
                     targetLemmas[j - 1],
@@ -119,13 +122,13 @@ def alignNouns(source, target, sourceParseResult, targetParseResult, existingAli
                     if (
                         (ktem[0], ltem[0]) in existingAlignments + nounAlignments
                         or max(
-                            wordRelatedness(
+                            similarities.relatedness(
                                 ktem[1],
                                 sourcePosTags[ktem[0] - 1],
                                 ltem[1],
                                 targetPosTags[ltem[0] - 1],
                             ),
-                            wordRelatedness(
+                            similarities.relatedness(
                                 sourceLemmas[ktem[0] - 1],
                                 sourcePosTags[ktem[0] - 1],
                                 targetLemmas[ltem[0] - 1],
@@ -159,13 +162,13 @@ def alignNouns(source, target, sourceParseResult, targetParseResult, existingAli
 
                         if (i, j) in evidenceCountsMatrix:
                             evidenceCountsMatrix[(i, j)] += max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -174,13 +177,13 @@ def alignNouns(source, target, sourceParseResult, targetParseResult, existingAli
                             )
                         else:
                             evidenceCountsMatrix[(i, j)] = max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -210,13 +213,13 @@ def alignNouns(source, target, sourceParseResult, targetParseResult, existingAli
                     if (
                         (ktem[0], ltem[0]) in existingAlignments + nounAlignments
                         or max(
-                            wordRelatedness(
+                            similarities.relatedness(
                                 ktem[1],
                                 sourcePosTags[ktem[0] - 1],
                                 ltem[1],
                                 targetPosTags[ltem[0] - 1],
                             ),
-                            wordRelatedness(
+                            similarities.relatedness(
                                 sourceLemmas[ktem[0] - 1],
                                 sourcePosTags[ktem[0] - 1],
                                 targetLemmas[ltem[0] - 1],
@@ -242,13 +245,13 @@ def alignNouns(source, target, sourceParseResult, targetParseResult, existingAli
 
                         if (i, j) in evidenceCountsMatrix:
                             evidenceCountsMatrix[(i, j)] += max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -257,13 +260,13 @@ def alignNouns(source, target, sourceParseResult, targetParseResult, existingAli
                             )
                         else:
                             evidenceCountsMatrix[(i, j)] = max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -304,13 +307,13 @@ def alignNouns(source, target, sourceParseResult, targetParseResult, existingAli
                     if (
                         (ktem[0], ltem[0]) in existingAlignments + nounAlignments
                         or max(
-                            wordRelatedness(
+                            similarities.relatedness(
                                 ktem[1],
                                 sourcePosTags[ktem[0] - 1],
                                 ltem[1],
                                 targetPosTags[ltem[0] - 1],
                             ),
-                            wordRelatedness(
+                            similarities.relatedness(
                                 sourceLemmas[ktem[0] - 1],
                                 sourcePosTags[ktem[0] - 1],
                                 targetLemmas[ltem[0] - 1],
@@ -344,13 +347,13 @@ def alignNouns(source, target, sourceParseResult, targetParseResult, existingAli
 
                         if (i, j) in evidenceCountsMatrix:
                             evidenceCountsMatrix[(i, j)] += max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -359,13 +362,13 @@ def alignNouns(source, target, sourceParseResult, targetParseResult, existingAli
                             )
                         else:
                             evidenceCountsMatrix[(i, j)] = max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -385,13 +388,13 @@ def alignNouns(source, target, sourceParseResult, targetParseResult, existingAli
                     if (
                         (ktem[0], ltem[0]) in existingAlignments + nounAlignments
                         or max(
-                            wordRelatedness(
+                            similarities.relatedness(
                                 ktem[1],
                                 sourcePosTags[ktem[0] - 1],
                                 ltem[1],
                                 targetPosTags[ltem[0] - 1],
                             ),
-                            wordRelatedness(
+                            similarities.relatedness(
                                 sourceLemmas[ktem[0] - 1],
                                 sourcePosTags[ktem[0] - 1],
                                 targetLemmas[ltem[0] - 1],
@@ -425,13 +428,13 @@ def alignNouns(source, target, sourceParseResult, targetParseResult, existingAli
 
                         if (i, j) in evidenceCountsMatrix:
                             evidenceCountsMatrix[(i, j)] += max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -440,13 +443,13 @@ def alignNouns(source, target, sourceParseResult, targetParseResult, existingAli
                             )
                         else:
                             evidenceCountsMatrix[(i, j)] = max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -471,7 +474,7 @@ def alignNouns(source, target, sourceParseResult, targetParseResult, existingAli
             if (
                 i in sourceWordIndicesAlreadyAligned
                 or sourcePosTags[i - 1][0].lower() != "n"
-                or sourceLemmas[i - 1] in stopwords
+                or sourceLemmas[i - 1] in stopwordsSet
             ):
                 continue
 
@@ -479,7 +482,7 @@ def alignNouns(source, target, sourceParseResult, targetParseResult, existingAli
                 if (
                     j in targetWordIndicesAlreadyAligned
                     or targetPosTags[j - 1][0].lower() != "n"
-                    or targetLemmas[j - 1] in stopwords
+                    or targetLemmas[j - 1] in stopwordsSet
                 ):
                     continue
 
@@ -517,13 +520,16 @@ def alignNouns(source, target, sourceParseResult, targetParseResult, existingAli
     return nounAlignments
 
 
-def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existingAlignments):
+def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existingAlignments, similarities=None):
     # source and target:: each is a list of elements of the form:
     # [[character begin offset, character end offset], word index, word, lemma, pos tag]
 
     global ppdbSim
     global theta1
 
+    if similarities is None:
+        similarities = WordSimilarities()
+
     mainVerbAlignments = []
 
     sourceWordIndices = [i + 1 for i in range(len(source))]
@@ -555,7 +561,7 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
         if (
             i in sourceWordIndicesAlreadyAligned
             or sourcePosTags[i - 1][0].lower() != "v"
-            or sourceLemmas[i - 1] in stopwords
+            or sourceLemmas[i - 1] in stopwordsSet
         ):
             continue
 
@@ -565,19 +571,19 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
             if (
                 j in targetWordIndicesAlreadyAligned
                 or targetPosTags[j - 1][0].lower() != "v"
-                or targetLemmas[j - 1] in stopwords
+                or targetLemmas[j - 1] in stopwordsSet
             ):
                 continue
 
             if (
                 max(
-                    wordRelatedness(
+                    similarities.relatedness(
                         sourceWords[i - 1],
                         sourcePosTags[i - 1],
                         targetWords[j - 1],
                         targetPosTags[j - 1],
                     ),
-                    wordRelatedness(
+                    similarities.relatedness(
                         sourceLemmas[i - 1],
                         sourcePosTags[i - 1],
                         targetLemmas[j - 1],
@@ -589,13 +595,13 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
                 continue
 
             wordSimilarities[(i, j)] = max(
-                wordRelatedness(
+                similarities.relatedness(
                     sourceWords[i - 1],
                     sourcePosTags[i - 1],
                     targetWords[j - 1],
                     targetPosTags[j - 1],
                 ),
-                wordRelatedness(
+                similarities.relatedness(
                     sourceLemmas[i - 1],
                     sourcePosTags[i - 1],
                     targetLemmas[j - 1],
@@ -630,13 +636,13 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
                     if (
                         (ktem[0], ltem[0]) in existingAlignments + mainVerbAlignments
                         or max(
-                            wordRelatedness(
+                            similarities.relatedness(
                                 ktem[1],
                                 sourcePosTags[ktem[0] - 1],
                                 ltem[1],
                                 targetPosTags[ltem[0] - 1],
                             ),
-                            wordRelatedness(
+                            similarities.relatedness(
                                 sourceLemmas[ktem[0] - 1],
                                 sourcePosTags[ktem[0] - 1],
                                 targetLemmas[ltem[0] - 1],
@@ -670,13 +676,13 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
 
                         if (i, j) in evidenceCountsMatrix:
                             evidenceCountsMatrix[(i, j)] += max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -685,13 +691,13 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
                             )
                         else:
                             evidenceCountsMatrix[(i, j)] = max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -718,13 +724,13 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
                     if (
                         (ktem[0], ltem[0]) in existingAlignments + mainVerbAlignments
                         or max(
-                            wordRelatedness(
+                            similarities.relatedness(
                                 ktem[1],
                                 sourcePosTags[ktem[0] - 1],
                                 ltem[1],
                                 targetPosTags[ltem[0] - 1],
                             ),
-                            wordRelatedness(
+                            similarities.relatedness(
                                 sourceLemmas[ktem[0] - 1],
                                 sourcePosTags[ktem[0] - 1],
                                 targetLemmas[ltem[0] - 1],
@@ -746,13 +752,13 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
 
                         if (i, j) in evidenceCountsMatrix:
                             evidenceCountsMatrix[(i, j)] += max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -761,13 +767,13 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
                             )
                         else:
                             evidenceCountsMatrix[(i, j)] = max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -808,13 +814,13 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
                     if (
                         (ktem[0], ltem[0]) in existingAlignments + mainVerbAlignments
                         or max(
-                            wordRelatedness(
+                            similarities.relatedness(
                                 ktem[1],
                                 sourcePosTags[ktem[0] - 1],
                                 ltem[1],
                                 targetPosTags[ltem[0] - 1],
                             ),
-                            wordRelatedness(
+                            similarities.relatedness(
                                 sourceLemmas[ktem[0] - 1],
                                 sourcePosTags[ktem[0] - 1],
                                 targetLemmas[ltem[0] - 1],
@@ -848,13 +854,13 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
 
                         if (i, j) in evidenceCountsMatrix:
                             evidenceCountsMatrix[(i, j)] += max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -863,13 +869,13 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
                             )
                         else:
                             evidenceCountsMatrix[(i, j)] = max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -889,13 +895,13 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
                     if (
                         (ktem[0], ltem[0]) in existingAlignments + mainVerbAlignments
                         or max(
-                            wordRelatedness(
+                            similarities.relatedness(
                                 ktem[1],
                                 sourcePosTags[ktem[0] - 1],
                                 ltem[1],
                                 targetPosTags[ltem[0] - 1],
                             ),
-                            wordRelatedness(
+                            similarities.relatedness(
                                 sourceLemmas[ktem[0] - 1],
                                 sourcePosTags[ktem[0] - 1],
                                 targetLemmas[ltem[0] - 1],
@@ -929,13 +935,13 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
 
                         if (i, j) in evidenceCountsMatrix:
                             evidenceCountsMatrix[(i, j)] += max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -944,13 +950,13 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
                             )
                         else:
                             evidenceCountsMatrix[(i, j)] = max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -975,7 +981,7 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
             if (
                 i in sourceWordIndicesAlreadyAligned
                 or sourcePosTags[i - 1][0].lower() != "v"
-                or sourceLemmas[i - 1] in stopwords
+                or sourceLemmas[i - 1] in stopwordsSet
             ):
                 continue
 
@@ -983,7 +989,7 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
                 if (
                     j in targetWordIndicesAlreadyAligned
                     or targetPosTags[j - 1][0].lower() != "v"
-                    or targetLemmas[j - 1] in stopwords
+                    or targetLemmas[j - 1] in stopwordsSet
                 ):
                     continue
 
@@ -1021,13 +1027,16 @@ def alignMainVerbs(source, target, sourceParseResult, targetParseResult, existin
     return mainVerbAlignments
 
 
-def alignAdjectives(source, target, sourceParseResult, targetParseResult, existingAlignments):
+def alignAdjectives(source, target, sourceParseResult, targetParseResult, existingAlignments, similarities=None):
     # source and target:: each is a list of elements of the form:
     # [[character begin offset, character end offset], word index, word, lemma, pos tag]
 
     global ppdbSim
     global theta1
 
+    if similarities is None:
+        similarities = WordSimilarities()
+
     adjectiveAlignments = []
 
     sourceWordIndices = [i + 1 for i in range(len(source))]
@@ -1067,13 +1076,13 @@ def alignAdjectives(source, target, sourceParseResult, targetParseResult, existi
 
             if (
                 max(
-                    wordRelatedness(
+                    similarities.relatedness(
                         sourceWords[i - 1],
                         sourcePosTags[i - 1],
                         targetWords[j - 1],
                         targetPosTags[j - 1],
                     ),
-                    wordRelatedness(
+                    similarities.relatedness(
                         sourceLemmas[i - 1],
                         sourcePosTags[i - 1],
                         targetLemmas[j - 1],
@@ -1085,13 +1094,13 @@ def alignAdjectives(source, target, sourceParseResult, targetParseResult, existi
                 continue
 
             wordSimilarities[(i, j)] = max(
-                wordRelatedness(
+                similarities.relatedness(
                     sourceWords[i - 1],
                     sourcePosTags[i - 1],
                     targetWords[j - 1],
                     targetPosTags[j - 1],
                 ),
-                wordRelatedness(
+                similarities.relatedness(
                     sourceLemmas[i - 1],
                     sourcePosTags[i - 1],
                     targetLemmas[j - 1],
@@ -1112,13 +1121,13 @@ def alignAdjectives(source, target, sourceParseResult, targetParseResult, existi
                     if (
                         (ktem[0], ltem[0]) in existingAlignments + adjectiveAlignments
                         or max(
-                            wordRelatedness(
+                            similarities.relatedness(
                                 ktem[1],
                                 sourcePosTags[ktem[0] - 1],
                                 ltem[1],
                                 targetPosTags[ltem[0] - 1],
                             ),
-                            wordRelatedness(
+                            similarities.relatedness(
                                 sourceLemmas[ktem[0] - 1],
                                 sourcePosTags[ktem[0] - 1],
                                 targetLemmas[ltem[0] - 1],
@@ -1136,13 +1145,13 @@ def alignAdjectives(source, target, sourceParseResult, targetParseResult, existi
 
                         if (i, j) in evidenceCountsMatrix:
                             evidenceCountsMatrix[(i, j)] += max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -1151,13 +1160,13 @@ def alignAdjectives(source, target, sourceParseResult, targetParseResult, existi
                             )
                         else:
                             evidenceCountsMatrix[(i, j)] = max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -1177,13 +1186,13 @@ def alignAdjectives(source, target, sourceParseResult, targetParseResult, existi
                     if (
                         (ktem[0], ltem[0]) in existingAlignments + adjectiveAlignments
                         or max(
-                            wordRelatedness(
+                            similarities.relatedness(
                                 ktem[1],
                                 sourcePosTags[ktem[0] - 1],
                                 ltem[1],
                                 targetPosTags[ltem[0] - 1],
                             ),
-                            wordRelatedness(
+                            similarities.relatedness(
                                 sourceLemmas[ktem[0] - 1],
                                 sourcePosTags[ktem[0] - 1],
                                 targetLemmas[ltem[0] - 1],
@@ -1194,13 +1203,13 @@ def alignAdjectives(source, target, sourceParseResult, targetParseResult, existi
                     ) and (ktem[2] == ltem[2]):
                         if (i, j) in evidenceCountsMatrix:
                             evidenceCountsMatrix[(i, j)] += max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -1209,13 +1218,13 @@ def alignAdjectives(source, target, sourceParseResult, targetParseResult, existi
                             )
                         else:
                             evidenceCountsMatrix[(i, j)] = max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -1256,13 +1265,13 @@ def alignAdjectives(source, target, sourceParseResult, targetParseResult, existi
                     if (
                         (ktem[0], ltem[0]) in existingAlignments + adjectiveAlignments
                         or max(
-                            wordRelatedness(
+                            similarities.relatedness(
                                 ktem[1],
                                 sourcePosTags[ktem[0] - 1],
                                 ltem[1],
                                 targetPosTags[ltem[0] - 1],
                             ),
-                            wordRelatedness(
+                            similarities.relatedness(
                                 sourceLemmas[ktem[0] - 1],
                                 sourcePosTags[ktem[0] - 1],
                                 targetLemmas[ltem[0] - 1],
@@ -1296,13 +1305,13 @@ def alignAdjectives(source, target, sourceParseResult, targetParseResult, existi
 
                         if (i, j) in evidenceCountsMatrix:
                             evidenceCountsMatrix[(i, j)] += max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -1311,13 +1320,13 @@ def alignAdjectives(source, target, sourceParseResult, targetParseResult, existi
                             )
                         else:
                             evidenceCountsMatrix[(i, j)] = max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -1337,13 +1346,13 @@ def alignAdjectives(source, target, sourceParseResult, targetParseResult, existi
                     if (
                         (ktem[0], ltem[0]) in existingAlignments + adjectiveAlignments
                         or max(
-                            wordRelatedness(
+                            similarities.relatedness(
                                 ktem[1],
                                 sourcePosTags[ktem[0] - 1],
                                 ltem[1],
                                 targetPosTags[ltem[0] - 1],
                             ),
-                            wordRelatedness(
+                            similarities.relatedness(
                                 sourceLemmas[ktem[0] - 1],
                                 sourcePosTags[ktem[0] - 1],
                                 targetLemmas[ltem[0] - 1],
@@ -1377,13 +1386,13 @@ def alignAdjectives(source, target, sourceParseResult, targetParseResult, existi
 
                         if (i, j) in evidenceCountsMatrix:
                             evidenceCountsMatrix[(i, j)] += max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -1392,13 +1401,13 @@ def alignAdjectives(source, target, sourceParseResult, targetParseResult, existi
                             )
                         else:
                             evidenceCountsMatrix[(i, j)] = max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -1423,7 +1432,7 @@ def alignAdjectives(source, target, sourceParseResult, targetParseResult, existi
             if (
                 i in sourceWordIndicesAlreadyAligned
                 or sourcePosTags[i - 1][0].lower() != "j"
-                or sourceLemmas[i - 1] in stopwords
+                or sourceLemmas[i - 1] in stopwordsSet
             ):
                 continue
 
@@ -1431,7 +1440,7 @@ def alignAdjectives(source, target, sourceParseResult, targetParseResult, existi
                 if (
                     j in targetWordIndicesAlreadyAligned
                     or targetPosTags[j - 1][0].lower() != "j"
-                    or targetLemmas[j - 1] in stopwords
+                    or targetLemmas[j - 1] in stopwordsSet
                 ):
                     continue
 
@@ -1469,13 +1478,16 @@ def alignAdjectives(source, target, sourceParseResult, targetParseResult, existi
     return adjectiveAlignments
 
 
-def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingAlignments):
+def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingAlignments, similarities=None):
     # source and target:: each is a list of elements of the form:
     # [[character begin offset, character end offset], word index, word, lemma, pos tag]
 
     global ppdbSim
     global theta1
 
+    if similarities is None:
+        similarities = WordSimilarities()
+
     adverbAlignments = []
 
     sourceWordIndices = [i + 1 for i in range(len(source))]
@@ -1514,13 +1526,13 @@ def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingA
 
             if (
                 max(
-                    wordRelatedness(
+                    similarities.relatedness(
                         sourceWords[i - 1],
                         sourcePosTags[i - 1],
                         targetWords[j - 1],
                         targetPosTags[j - 1],
                     ),
-                    wordRelatedness(
+                    similarities.relatedness(
                         sourceLemmas[i - 1],
                         sourcePosTags[i - 1],
                         targetLemmas[j - 1],
@@ -1532,13 +1544,13 @@ def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingA
                 continue
 
             wordSimilarities[(i, j)] = max(
-                wordRelatedness(
+                similarities.relatedness(
                     sourceWords[i - 1],
                     sourcePosTags[i - 1],
                     targetWords[j - 1],
                     targetPosTags[j - 1],
                 ),
-                wordRelatedness(
+                similarities.relatedness(
                     sourceLemmas[i - 1],
                     sourcePosTags[i - 1],
                     targetLemmas[j - 1],
@@ -1557,13 +1569,13 @@ def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingA
                     if (
                         (ktem[0], ltem[0]) in existingAlignments + adverbAlignments
                         or max(
-                            wordRelatedness(
+                            similarities.relatedness(
                                 ktem[1],
                                 sourcePosTags[ktem[0] - 1],
                                 ltem[1],
                                 targetPosTags[ltem[0] - 1],
                             ),
-                            wordRelatedness(
+                            similarities.relatedness(
                                 sourceLemmas[ktem[0] - 1],
                                 sourcePosTags[ktem[0] - 1],
                                 targetLemmas[ltem[0] - 1],
@@ -1574,13 +1586,13 @@ def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingA
                     ) and (ktem[2] == ltem[2]):
                         if (i, j) in evidenceCountsMatrix:
                             evidenceCountsMatrix[(i, j)] += max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -1589,13 +1601,13 @@ def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingA
                             )
                         else:
                             evidenceCountsMatrix[(i, j)] = max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -1615,13 +1627,13 @@ def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingA
                     if (
                         (ktem[0], ltem[0]) in existingAlignments + adverbAlignments
                         or max(
-                            wordRelatedness(
+                            similarities.relatedness(
                                 ktem[1],
                                 sourcePosTags[ktem[0] - 1],
                                 ltem[1],
                                 targetPosTags[ltem[0] - 1],
                             ),
-                            wordRelatedness(
+                            similarities.relatedness(
                                 sourceLemmas[ktem[0] - 1],
                                 sourcePosTags[ktem[0] - 1],
                                 targetLemmas[ltem[0] - 1],
@@ -1632,13 +1644,13 @@ def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingA
                     ) and (ktem[2] == ltem[2]):
                         if (i, j) in evidenceCountsMatrix:
                             evidenceCountsMatrix[(i, j)] += max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -1647,13 +1659,13 @@ def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingA
                             )
                         else:
                             evidenceCountsMatrix[(i, j)] = max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -1686,13 +1698,13 @@ def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingA
                     if (
                         (ktem[0], ltem[0]) in existingAlignments + adverbAlignments
                         or max(
-                            wordRelatedness(
+                            similarities.relatedness(
                                 ktem[1],
                                 sourcePosTags[ktem[0] - 1],
                                 ltem[1],
                                 targetPosTags[ltem[0] - 1],
                             ),
-                            wordRelatedness(
+                            similarities.relatedness(
                                 sourceLemmas[ktem[0] - 1],
                                 sourcePosTags[ktem[0] - 1],
                                 targetLemmas[ltem[0] - 1],
@@ -1718,13 +1730,13 @@ def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingA
 
                         if (i, j) in evidenceCountsMatrix:
                             evidenceCountsMatrix[(i, j)] += max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -1733,13 +1745,13 @@ def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingA
                             )
                         else:
                             evidenceCountsMatrix[(i, j)] = max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -1759,13 +1771,13 @@ def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingA
                     if (
                         (ktem[0], ltem[0]) in existingAlignments + adverbAlignments
                         or max(
-                            wordRelatedness(
+                            similarities.relatedness(
                                 ktem[1],
                                 sourcePosTags[ktem[0] - 1],
                                 ltem[1],
                                 targetPosTags[ltem[0] - 1],
                             ),
-                            wordRelatedness(
+                            similarities.relatedness(
                                 sourceLemmas[ktem[0] - 1],
                                 sourcePosTags[ktem[0] - 1],
                                 targetLemmas[ltem[0] - 1],
@@ -1791,13 +1803,13 @@ def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingA
 
                         if (i, j) in evidenceCountsMatrix:
                             evidenceCountsMatrix[(i, j)] += max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -1806,13 +1818,13 @@ def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingA
                             )
                         else:
                             evidenceCountsMatrix[(i, j)] = max(
-                                wordRelatedness(
+                                similarities.relatedness(
                                     ktem[1],
                                     sourcePosTags[ktem[0] - 1],
                                     ltem[1],
                                     targetPosTags[ltem[0] - 1],
                                 ),
-                                wordRelatedness(
+                                similarities.relatedness(
                                     sourceLemmas[ktem[0] - 1],
                                     sourcePosTags[ktem[0] - 1],
                                     targetLemmas[ltem[0] - 1],
@@ -1837,7 +1849,7 @@ def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingA
             if (
                 i in sourceWordIndicesAlreadyAligned
                 or sourcePosTags[i - 1][0].lower() != "r"
-                or sourceLemmas[i - 1] in stopwords
+                or sourceLemmas[i - 1] in stopwordsSet
             ):
                 continue
 
@@ -1845,7 +1857,7 @@ def alignAdverbs(source, target, sourceParseResult, targetParseResult, existingA
                 if (
                     j in targetWordIndicesAlreadyAligned
                     or targetPosTags[j - 1][0].lower() != "r"
-                    or targetLemmas[j - 1] in stopwords
+                    or targetLemmas[j - 1] in stopwordsSet
                 ):
                     continue
 
@@ -2081,8 +2093,8 @@ def alignNamedEntities(source, target, sourceParseResult, targetParseResult, exi
                         if (
                             [item[1][k], jtem[1][l]] not in alignments
                             and target[jtem[1][l] - 1][2] not in sourceWords
-                            and item[2][k] not in punctuations
-                            and jtem[2][l] not in punctuations
+                            and item[2][k] not in punctuationsSet
+                            and jtem[2][l] not in punctuationsSet
                         ):
                             alignments.append([item[1][k], jtem[1][l]])
 
@@ -2110,8 +2122,8 @@ def alignNamedEntities(source, target, sourceParseResult, targetParseResult, exi
                         if (
                             [item[1][l], jtem[1][k]] not in alignments
                             and source[item[1][k] - 1][2] not in targetWords
-                            and item[2][l] not in punctuations
-                            and jtem[2][k] not in punctuations
+                            and item[2][l] not in punctuationsSet
+                            and jtem[2][k] not in punctuationsSet
                         ):
                             alignments.append([item[1][l], jtem[1][k]])
                             # unalignedWordIndicesInTheLongerName.remove(jtem[1][l])
@@ -2131,6 +2143,9 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
 
     global punctuations
 
+    # relatedness of the word pairs, shared by all the alignment passes of the sentence pair
+    similarities = WordSimilarities()
+
     sourceWordIndices = [i + 1 for i in range(len(source))]
     targetWordIndices = [i + 1 for i in range(len(target))]
 
@@ -2229,7 +2244,7 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
     sourceDParse = dependencyParseAndPutOffsets(sourceParseResult)
     targetDParse = dependencyParseAndPutOffsets(targetParseResult)
 
-    mainVerbAlignments = alignMainVerbs(source, target, sourceParseResult, targetParseResult, alignments)
+    mainVerbAlignments = alignMainVerbs(source, target, sourceParseResult, targetParseResult, alignments, similarities)
     for item in mainVerbAlignments:
         if item not in alignments:
             alignments.append(item)
@@ -2238,7 +2253,7 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
             if item[1] not in targetWordIndicesAlreadyAligned:
                 targetWordIndicesAlreadyAligned.append(item[1])
 
-    nounAlignments = alignNouns(source, target, sourceParseResult, targetParseResult, alignments)
+    nounAlignments = alignNouns(source, target, sourceParseResult, targetParseResult, alignments, similarities)
     for item in nounAlignments:
         if item not in alignments:
             alignments.append(item)
@@ -2247,7 +2262,9 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
             if item[1] not in targetWordIndicesAlreadyAligned:
                 targetWordIndicesAlreadyAligned.append(item[1])
 
-    adjectiveAlignments = alignAdjectives(source, target, sourceParseResult, targetParseResult, alignments)
+    adjectiveAlignments = alignAdjectives(
+        source, target, sourceParseResult, targetParseResult, alignments, similarities
+    )
     for item in adjectiveAlignments:
         if item not in alignments:
             alignments.append(item)
@@ -2256,7 +2273,7 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
             if item[1] not in targetWordIndicesAlreadyAligned:
                 targetWordIndicesAlreadyAligned.append(item[1])
 
-    adverbAlignments = alignAdverbs(source, target, sourceParseResult, targetParseResult, alignments)
+    adverbAlignments = alignAdverbs(source, target, sourceParseResult, targetParseResult, alignments, similarities)
     for item in adverbAlignments:
         if item not in alignments:
             alignments.append(item)
@@ -2271,30 +2288,28 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
     sourceWordIndicesBeingConsidered = []
     targetWordIndicesBeingConsidered = []
 
+    # only depend on each sentence, computed once instead of for each word pair
+    stopwordsAndPunctuations = stopwordsSet | punctuationsSet
+    ignoredLemmas = stopwordsAndPunctuations | {"'s", "'d", "'ll"}
+    sourceNeighborhoods = {i: findTextualNeighborhood(source, i, 3, 3) for i in sourceWordIndices}
+    targetNeighborhoods = {j: findTextualNeighborhood(target, j, 3, 3) for j in targetWordIndices}
+
     for i in sourceWordIndices:
-        if i in sourceWordIndicesAlreadyAligned or sourceLemmas[i - 1] in stopwords + punctuations + [
-            "'s",
-            "'d",
-            "'ll",
-        ]:
+        if i in sourceWordIndicesAlreadyAligned or sourceLemmas[i - 1] in ignoredLemmas:
             continue
 
         for j in targetWordIndices:
-            if j in targetWordIndicesAlreadyAligned or targetLemmas[j - 1] in stopwords + punctuations + [
-                "'s",
-                "'d",
-                "'ll",
-            ]:
+            if j in targetWordIndicesAlreadyAligned or targetLemmas[j - 1] in ignoredLemmas:
                 continue
 
             wordSimilarities[(i, j)] = max(
-                wordRelatedness(
+                similarities.relatedness(
                     sourceWords[i - 1],
                     sourcePosTags[i - 1],
                     targetWords[j - 1],
                     targetPosTags[j - 1],
                 ),
-                wordRelatedness(
+                similarities.relatedness(
                     sourceLemmas[i - 1],
                     sourcePosTags[i - 1],
                     targetLemmas[j - 1],
@@ -2305,15 +2320,15 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
             targetWordIndicesBeingConsidered.append(j)
 
             # textual neighborhood similarities
-            sourceNeighborhood = findTextualNeighborhood(source, i, 3, 3)
-            targetNeighborhood = findTextualNeighborhood(target, j, 3, 3)
+            sourceNeighborhood = sourceNeighborhoods[i]
+            targetNeighborhood = targetNeighborhoods[j]
             evidence = 0
             for k in range(len(sourceNeighborhood[0])):
                 for l in range(len(targetNeighborhood[0])):
-                    if (sourceNeighborhood[1][k] not in stopwords + punctuations) and (
+                    if (sourceNeighborhood[1][k] not in stopwordsAndPunctuations) and (
                         (sourceNeighborhood[0][k], targetNeighborhood[0][l]) in alignments
                         or (
-                            wordRelatedness(
+                            similarities.relatedness(
                                 sourceNeighborhood[1][k],
                                 "none",
                                 targetNeighborhood[1][l],
@@ -2322,7 +2337,7 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
                             >= ppdbSim
                         )
                     ):
-                        evidence += wordRelatedness(
+                        evidence += similarities.relatedness(
                             sourceNeighborhood[1][k],
                             "none",
                             targetNeighborhood[1][l],
@@ -2330,50 +2345,21 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
                         )
             textualNeighborhoodSimilarities[(i, j)] = evidence
 
-    numOfUnalignedWordsInSource = len(sourceWordIndicesBeingConsidered)
-
     # now align: find the best alignment in each iteration of the following loop and include in alignments if good enough
-    for item in range(numOfUnalignedWordsInSource):
-        highestWeightedSim = 0
-        bestWordSim = 0
-        bestSourceIndex = -1
-        bestTargetIndex = -1
-
-        for i in sourceWordIndicesBeingConsidered:
-            if i in sourceWordIndicesAlreadyAligned:
-                continue
-
-            for j in targetWordIndicesBeingConsidered:
-                if j in targetWordIndicesAlreadyAligned:
-                    continue
-
-                if (i, j) not in wordSimilarities:
-                    continue
-
-                theta2 = 1 - theta1
-                if (
-                    theta1 * wordSimilarities[(i, j)] + theta2 * textualNeighborhoodSimilarities[(i, j)]
-                    > highestWeightedSim
-                ):
-                    highestWeightedSim = (
-                        theta1 * wordSimilarities[(i, j)] + theta2 * textualNeighborhoodSimilarities[(i, j)]
-                    )
-                    bestSourceIndex = i
-                    bestTargetIndex = j
-                    bestWordSim = wordSimilarities[(i, j)]
-                    bestTextNeighborhoodSim = textualNeighborhoodSimilarities[(i, j)]
-
+    for bestSourceIndex, bestTargetIndex, bestWordSim, bestTextNeighborhoodSim in iterateBestPairs(
+        wordSimilarities,
+        textualNeighborhoodSimilarities,
+        sourceWordIndicesBeingConsidered,
+        targetWordIndicesBeingConsidered,
+        sourceWordIndicesAlreadyAligned,
+        targetWordIndicesAlreadyAligned,
+    ):
         if bestWordSim >= ppdbSim and [bestSourceIndex, bestTargetIndex] not in alignments:
-            if sourceLemmas[bestSourceIndex - 1] not in stopwords:
+            if sourceLemmas[bestSourceIndex - 1] not in stopwordsSet:
                 alignments.append([bestSourceIndex, bestTargetIndex])
                 sourceWordIndicesAlreadyAligned.append(bestSourceIndex)
                 targetWordIndicesAlreadyAligned.append(bestTargetIndex)
 
-        if bestSourceIndex in sourceWordIndicesBeingConsidered:
-            sourceWordIndicesBeingConsidered.remove(bestSourceIndex)
-        if bestTargetIndex in targetWordIndicesBeingConsidered:
-            targetWordIndicesBeingConsidered.remove(bestTargetIndex)
-
     # look if any remaining word is a part of a hyphenated word
     for i in sourceWordIndices:
         if i in sourceWordIndicesAlreadyAligned:
@@ -2382,7 +2368,7 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
             tokens = sourceWords[i - 1].split("-")
             commonContiguousSublists = findAllCommonContiguousSublists(tokens, targetWords)
             for item in commonContiguousSublists:
-                if len(item[0]) == 1 and target[item[1][0]][3] not in stopwords:
+                if len(item[0]) == 1 and target[item[1][0]][3] not in stopwordsSet:
                     for jtem in item[1]:
                         if [i, jtem + 1] not in alignments and jtem + 1 not in targetWordIndicesAlreadyAligned:
                             alignments.append([i, jtem + 1])
@@ -2396,7 +2382,7 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
             tokens = target[i - 1][2].split("-")
             commonContiguousSublists = findAllCommonContiguousSublists(sourceWords, tokens)
             for item in commonContiguousSublists:
-                if len(item[0]) == 1 and source[item[0][0]][3] not in stopwords:
+                if len(item[0]) == 1 and source[item[0][0]][3] not in stopwordsSet:
                     for jtem in item[0]:
                         if [jtem + 1, i] not in alignments and i not in targetWordIndicesAlreadyAligned:
                             alignments.append([jtem + 1, i])
@@ -2410,15 +2396,15 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
     targetWordIndicesBeingConsidered = []
 
     for i in sourceWordIndices:
-        if sourceLemmas[i - 1] not in stopwords or i in sourceWordIndicesAlreadyAligned:
+        if sourceLemmas[i - 1] not in stopwordsSet or i in sourceWordIndicesAlreadyAligned:
             continue
 
         for j in targetWordIndices:
-            if targetLemmas[j - 1] not in stopwords or j in targetWordIndicesAlreadyAligned:
+            if targetLemmas[j - 1] not in stopwordsSet or j in targetWordIndicesAlreadyAligned:
                 continue
 
             if (sourceLemmas[i - 1] != targetLemmas[j - 1]) and (
-                wordRelatedness(
+                similarities.relatedness(
                     sourceLemmas[i - 1],
                     sourcePosTags[i - 1],
                     targetLemmas[j - 1],
@@ -2429,13 +2415,13 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
                 continue
 
             wordSimilarities[(i, j)] = max(
-                wordRelatedness(
+                similarities.relatedness(
                     sourceWords[i - 1],
                     sourcePosTags[i - 1],
                     targetWords[j - 1],
                     targetPosTags[j - 1],
                 ),
-                wordRelatedness(
+                similarities.relatedness(
                     sourceLemmas[i - 1],
                     sourcePosTags[i - 1],
                     targetLemmas[j - 1],
@@ -2464,32 +2450,16 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
 
             dependencyNeighborhoodSimilarities[(i, j)] = evidence
 
-    numOfUnalignedWordsInSource = len(sourceWordIndicesBeingConsidered)
-
     # now align: find the best alignment in each iteration of the following loop and include in alignments if good enough
-    for item in range(numOfUnalignedWordsInSource):
-        highestWeightedSim = 0
-        bestWordSim = 0
-        bestSourceIndex = -1
-        bestTargetIndex = -1
-
-        for i in sourceWordIndicesBeingConsidered:
-            for j in targetWordIndicesBeingConsidered:
-                if (i, j) not in wordSimilarities:
-                    continue
-                theta2 = 1 - theta1
-                if (
-                    theta1 * wordSimilarities[(i, j)] + theta2 * dependencyNeighborhoodSimilarities[(i, j)]
-                    > highestWeightedSim
-                ):
-                    highestWeightedSim = (
-                        theta1 * wordSimilarities[(i, j)] + theta2 * dependencyNeighborhoodSimilarities[(i, j)]
-                    )
-                    bestSourceIndex = i
-                    bestTargetIndex = j
-                    bestWordSim = wordSimilarities[(i, j)]
-                    bestDependencyNeighborhoodSim = dependencyNeighborhoodSimilarities[(i, j)]
-
+    for bestSourceIndex, bestTargetIndex, bestWordSim, bestDependencyNeighborhoodSim in iterateBestPairs(
+        wordSimilarities,
+        dependencyNeighborhoodSimilarities,
+        sourceWordIndicesBeingConsidered,
+        targetWordIndicesBeingConsidered,
+        # already aligned words are considered as well
+        [],
+        [],
+    ):
         if (
             bestWordSim >= ppdbSim
             and bestDependencyNeighborhoodSim > 0
@@ -2499,11 +2469,6 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
             sourceWordIndicesAlreadyAligned.append(bestSourceIndex)
             targetWordIndicesAlreadyAligned.append(bestTargetIndex)
 
-        if bestSourceIndex in sourceWordIndicesBeingConsidered:
-            sourceWordIndicesBeingConsidered.remove(bestSourceIndex)
-        if bestTargetIndex in targetWordIndicesBeingConsidered:
-            targetWordIndicesBeingConsidered.remove(bestTargetIndex)
-
     # collect evidence from textual neighborhood for aligning stopwords and punctuations
     wordSimilarities = {}
     textualNeighborhoodSimilarities = {}
@@ -2511,19 +2476,15 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
     targetWordIndicesBeingConsidered = []
 
     for i in sourceWordIndices:
-        if (
-            sourceLemmas[i - 1] not in stopwords + punctuations + ["'s", "'d", "'ll"]
-        ) or i in sourceWordIndicesAlreadyAligned:
+        if sourceLemmas[i - 1] not in ignoredLemmas or i in sourceWordIndicesAlreadyAligned:
             continue
 
         for j in targetWordIndices:
-            if (
-                targetLemmas[j - 1] not in stopwords + punctuations + ["'s", "'d", "'ll"]
-            ) or j in targetWordIndicesAlreadyAligned:
+            if targetLemmas[j - 1] not in ignoredLemmas or j in targetWordIndicesAlreadyAligned:
                 continue
 
             if (
-                wordRelatedness(
+                similarities.relatedness(
                     sourceLemmas[i - 1],
                     sourcePosTags[i - 1],
                     targetLemmas[j - 1],
@@ -2534,13 +2495,13 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
                 continue
 
             wordSimilarities[(i, j)] = max(
-                wordRelatedness(
+                similarities.relatedness(
                     sourceWords[i - 1],
                     sourcePosTags[i - 1],
                     targetWords[j - 1],
                     targetPosTags[j - 1],
                 ),
-                wordRelatedness(
+                similarities.relatedness(
                     sourceLemmas[i - 1],
                     sourcePosTags[i - 1],
                     targetLemmas[j - 1],
@@ -2565,39 +2526,15 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
             except ZeroDivisionError:
                 textualNeighborhoodSimilarities[(i, j)] = 0
 
-    numOfUnalignedWordsInSource = len(sourceWordIndicesBeingConsidered)
-
     # now align: find the best alignment in each iteration of the following loop and include in alignments if good enough
-    for item in range(numOfUnalignedWordsInSource):
-        highestWeightedSim = 0
-        bestWordSim = 0
-        bestSourceIndex = -1
-        bestTargetIndex = -1
-
-        for i in sourceWordIndicesBeingConsidered:
-            if i in sourceWordIndicesAlreadyAligned:
-                continue
-
-            for j in targetWordIndicesBeingConsidered:
-                if j in targetWordIndicesAlreadyAligned:
-                    continue
-
-                if (i, j) not in wordSimilarities:
-                    continue
-
-                theta2 = 1 - theta1
-                if (
-                    theta1 * wordSimilarities[(i, j)] + theta2 * textualNeighborhoodSimilarities[(i, j)]
-                    > highestWeightedSim
-                ):
-                    highestWeightedSim = (
-                        theta1 * wordSimilarities[(i, j)] + theta2 * textualNeighborhoodSimilarities[(i, j)]
-                    )
-                    bestSourceIndex = i
-                    bestTargetIndex = j
-                    bestWordSim = wordSimilarities[(i, j)]
-                    bestTextNeighborhoodSim = textualNeighborhoodSimilarities[(i, j)]
-
+    for bestSourceIndex, bestTargetIndex, bestWordSim, bestTextNeighborhoodSim in iterateBestPairs(
+        wordSimilarities,
+        textualNeighborhoodSimilarities,
+        sourceWordIndicesBeingConsidered,
+        targetWordIndicesBeingConsidered,
+        sourceWordIndicesAlreadyAligned,
+        targetWordIndicesAlreadyAligned,
+    ):
         if (
             bestWordSim >= ppdbSim
             and bestTextNeighborhoodSim > 0
@@ -2607,11 +2544,6 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
             sourceWordIndicesAlreadyAligned.append(bestSourceIndex)
             targetWordIndicesAlreadyAligned.append(bestTargetIndex)
 
-        if bestSourceIndex in sourceWordIndicesBeingConsidered:
-            sourceWordIndicesBeingConsidered.remove(bestSourceIndex)
-        if bestTargetIndex in targetWordIndicesBeingConsidered:
-            targetWordIndicesBeingConsidered.remove(bestTargetIndex)
-
     alignments = [item for item in alignments if item[0] != 0 and item[1] != 0]
 
     return alignments
@@ -2619,38 +2551,20 @@ def alignWords(source, target, sourceParseResult, targetParseResult):
 
 class MonolingualWordAligner:
     def get_word_aligns(self, sentence1ParseResult, sentence2ParseResult):
-        sentence1Lemmatized = lemmatize(sentence1ParseResult)
-        sentence2Lemmatized = lemmatize(sentence2ParseResult)
-
-        sentence1PosTagged = posTag(sentence1ParseResult)
-        sentence2PosTagged = posTag(sentence2ParseResult)
-
-        sentence1LemmasAndPosTags = []
-        for i in range(len(sentence1Lemmatized)):
-            sentence1LemmasAndPosTags.append([])
-        for i in range(len(sentence1Lemmatized)):
-            for item in sentence1Lemmatized[i]:
-                sentence1LemmasAndPosTags[i].append(item)
-            sentence1LemmasAndPosTags[i].append(sentence1PosTagged[i][3])
-
-        sentence2LemmasAndPosTags = []
-        for i in range(len(sentence2Lemmatized)):
-            sentence2LemmasAndPosTags.append([])
-        for i in range(len(sentence2Lemmatized)):
-            for item in sentence2Lemmatized[i]:
-                sentence2LemmasAndPosTags[i].append(item)
-            sentence2LemmasAndPosTags[i].append(sentence2PosTagged[i][3])
+        # parse results can be prepared beforehand with prepareSentence() when a sentence is aligned several times
+        sentence1 = prepareSentence(sentence1ParseResult)
+        sentence2 = prepareSentence(sentence2ParseResult)
 
         myWordAlignments = alignWords(
-            sentence1LemmasAndPosTags,
-            sentence2LemmasAndPosTags,
-            sentence1ParseResult,
-            sentence2ParseResult,
+            sentence1.lemmasAndPosTags,
+            sentence2.lemmasAndPosTags,
+            sentence1,
+            sentence2,
         )
         myWordAlignmentTokens = [
             [
-                str(sentence1Lemmatized[item[0] - 1][2]),
-                str(sentence2Lemmatized[item[1] - 1][2]),
+                str(sentence1.lemmatized[item[0] - 1][2]),
+                str(sentence2.lemmatized[item[1] - 1][2]),
             ]
             for item in myWordAlignments
         ]
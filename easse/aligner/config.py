@@ -1,7 +1,6 @@
 from nltk.corpus import stopwords
 from nltk import SnowballStemmer
 
-ppdbDict = {}
 ppdbSim = 0.9
 theta1 = 0.9
 
@@ -31,3 +30,7 @@ punctuations = [
 ]
 
 stopwords = stopwords.words('english')
+
+# sets for constant time membership tests, the lists are kept for code that concatenates them
+stopwordsSet = frozenset(stopwords)
+punctuationsSet = frozenset(punctuations)
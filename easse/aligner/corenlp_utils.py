@@ -1,11 +1,18 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import List
+import atexit
+import bisect
+import copy
 import os
+import threading
 
 from stanfordnlp.server import CoreNLPClient
 from tqdm import tqdm
 
+from easse.utils.cache import SQLiteCache, get_content_hash
 from easse.utils.resources import download_stanford_corenlp
-from easse.utils.constants import STANFORD_CORENLP_DIR
+from easse.utils.constants import STANFORD_CORENLP_DIR, CORENLP_PARSE_CACHE_PATH
 
 
 def _format_token_info(sent_json):
@@ -104,13 +111,74 @@ def format_parser_output(sentence_parse):
     return results
 
 
-def syntactic_parse_texts(
-    texts: List[str],
-    tokenize=False,
-    sentence_split=False,
-    verbose=False,
-    with_constituency_parse=False,
-):
+# Characters that CoreNLP may consider as line breaks
+_LINE_BREAKS = set("\n\r\x0b\x0c\x85\u2028\u2029")
+
+
+def _utf16_length(text):
+    # CoreNLP character offsets are counted in Java chars (UTF-16 code units)
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _annotate_batch(client, texts, properties):
+    """
+    Annotates several lines in a single request (only valid with ssplit.eolonly) and returns the sentences of each
+    text, with character offsets relative to that text.
+    """
+    if len(texts) == 1:
+        return [client.annotate(texts[0], properties=properties)["sentences"]]
+    sentences = client.annotate("\n".join(texts), properties=properties)["sentences"]
+    if len(sentences) != len(texts):
+        # Unexpected sentence boundaries, annotate the texts separately
+        return [client.annotate(text, properties=properties)["sentences"] for text in texts]
+    line_start = 0
+    for text, sent_json in zip(texts, sentences):
+        for token in sent_json["tokens"]:
+            token["characterOffsetBegin"] -= line_start
+            token["characterOffsetEnd"] -= line_start
+        line_start += _utf16_length(text) + 1
+    return [[sent_json] for sent_json in sentences]
+
+
+def _map_bounded(function, items, n_workers):
+    """Same as executor.map() but keeps at most 2 * n_workers items in flight."""
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        futures = []
+        for item in items:
+            futures.append(executor.submit(function, item))
+            if len(futures) >= 2 * n_workers:
+                yield futures.pop(0).result()
+        for future in futures:
+            yield future.result()
+
+
+def _annotate_texts(client, texts, properties, sentence_split=False, n_workers=8, batch_size=16, verbose=False):
+    """
+    Sends concurrent requests to the CoreNLP server and returns the raw sentences of each text, in the same order.
+    Without sentence splitting each line is a sentence (ssplit.eolonly), several single-line texts are then sent in the
+    same request.
+    properties: CoreNLP properties sent with each request, including the annotators.
+    """
+    batches = []
+    for text in texts:
+        is_batchable = not sentence_split and not any(char in _LINE_BREAKS for char in text) and text.strip() != ""
+        if is_batchable and len(batches) > 0 and batches[-1][0] and len(batches[-1][1]) < batch_size:
+            batches[-1][1].append(text)
+        else:
+            batches.append((is_batchable, [text]))
+
+    sentences_per_text = []
+    with tqdm(total=len(texts), disable=(not verbose)) as progress_bar:
+        for batch_sentences in _map_bounded(
+            lambda batch: _annotate_batch(client, batch[1], properties), batches, n_workers
+        ):
+            sentences_per_text.extend(batch_sentences)
+            progress_bar.update(len(batch_sentences))
+    return sentences_per_text
+
+
+def get_corenlp_config(tokenize=False, sentence_split=False, with_constituency_parse=False):
+    """Returns the CoreNLP annotators and properties used by syntactic_parse_texts()."""
     corenlp_annotators = [
         "tokenize",
         "ssplit",
@@ -127,30 +195,184 @@ def syntactic_parse_texts(
         "depparse.model": "edu/stanford/nlp/models/parser/nndep/english_SD.gz",
         "outputFormat": "json",
     }
-    if not STANFORD_CORENLP_DIR.exists():
-        download_stanford_corenlp()
-    os.environ["CORENLP_HOME"] = str(STANFORD_CORENLP_DIR)
+    return corenlp_annotators, annotators_properties
+
+
+class CoreNLPServer:
+    """
+    Process-wide CoreNLP server shared across calls to syntactic_parse_texts(), so that a JVM is not started and
+    stopped for each call.
+    The server is reused as long as the annotators and properties are the same, and restarted when they change and it
+    is not in use. Every request carries its own annotators and properties, so a server that is in use is still
+    reused for a different configuration. The server is stopped after `idle_timeout` seconds without use, with stop()
+    and at exit.
+    """
+
+    def __init__(self, idle_timeout=300, threads=40):
+        self.idle_timeout = idle_timeout
+        self.threads = threads
+        self.endpoint = None
+        self._client = None
+        self._config = None
+        self._n_users = 0
+        self._idle_timer = None
+        self._lock = threading.RLock()
+
+    def attach(self, endpoint="http://localhost:9000"):
+        """Uses an already running server instead of starting one, it is never stopped by EASSE."""
+        with self._lock:
+            self.stop()
+            self.endpoint = endpoint
+
+    def detach(self):
+        with self._lock:
+            self.stop()
+            self.endpoint = None
+
+    def start(self, annotators, properties):
+        """Starts the server for the given configuration if needed and returns the client."""
+        with self._lock:
+            self._cancel_idle_timer()
+            config = get_content_hash(annotators, properties)
+            if self._client is not None and (config == self._config or self._n_users > 0 or self.endpoint is not None):
+                return self._client
+            self.stop()
+            if self.endpoint is not None:
+                self._client = CoreNLPClient(start_server=False, endpoint=self.endpoint)
+            else:
+                if not STANFORD_CORENLP_DIR.exists():
+                    download_stanford_corenlp()
+                os.environ["CORENLP_HOME"] = str(STANFORD_CORENLP_DIR)
+                self._client = CoreNLPClient(annotators=annotators, properties=properties, threads=self.threads)
+                self._client.start()
+            self._config = config
+            return self._client
 
-    parse_results = []
+    def stop(self):
+        with self._lock:
+            self._cancel_idle_timer()
+            if self._client is not None and self.endpoint is None:
+                self._client.stop()
+            self._client = None
+            self._config = None
+
+    @contextmanager
+    def client(self, annotators, properties):
+        with self._lock:
+            client = self.start(annotators, properties)
+            self._n_users += 1
+        try:
+            yield client
+        finally:
+            with self._lock:
+                self._n_users -= 1
+                if self._n_users == 0:
+                    self._start_idle_timer()
+
+    def _start_idle_timer(self):
+        self._cancel_idle_timer()
+        if self.idle_timeout is not None and self._client is not None:
+            self._idle_timer = threading.Timer(self.idle_timeout, self._stop_if_idle)
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    def _cancel_idle_timer(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _stop_if_idle(self):
+        with self._lock:
+            if self._n_users == 0:
+                self.stop()
+
+
+corenlp_server = CoreNLPServer()
+atexit.register(corenlp_server.stop)
+
+
+def start_corenlp_server(tokenize=False, sentence_split=False, with_constituency_parse=False, idle_timeout=300):
+    """Starts the shared server ahead of time, idle_timeout=None keeps it alive until stop_corenlp_server()."""
+    corenlp_server.idle_timeout = idle_timeout
+    corenlp_server.start(*get_corenlp_config(tokenize, sentence_split, with_constituency_parse))
 
-    with CoreNLPClient(
-        annotators=corenlp_annotators,
-        properties=annotators_properties,
-        threads=40,
-    ) as client:
-        for text in tqdm(texts, disable=(not verbose)):
-            if isinstance(text, List):
-                text = " ".join(text)
-            raw_parse_result = client.annotate(text)
-            parse_result = format_parser_output(raw_parse_result["sentences"])
 
-            if len(parse_result["sentences"]) > 1 and not sentence_split:
-                parse_result = join_parse_result(parse_result)
-            elif sentence_split:
-                parse_result = split_parse_result(parse_result["sentences"])
+def stop_corenlp_server():
+    corenlp_server.stop()
 
-            parse_results.append(parse_result)
 
+def attach_corenlp_server(endpoint="http://localhost:9000"):
+    """Sends all requests to an already running CoreNLP server instead of starting one."""
+    corenlp_server.attach(endpoint)
+
+
+_parse_caches = {}
+
+
+def get_parse_cache(cache_path=CORENLP_PARSE_CACHE_PATH):
+    """Returns the on-disk cache of parse results, a single instance is shared across all calls."""
+    if cache_path not in _parse_caches:
+        _parse_caches[cache_path] = SQLiteCache(cache_path)
+    return _parse_caches[cache_path]
+
+
+def syntactic_parse_texts(
+    texts: List[str],
+    tokenize=False,
+    sentence_split=False,
+    verbose=False,
+    with_constituency_parse=False,
+    use_cache=True,
+    n_workers=8,
+    batch_size=16,
+):
+    """
+    use_cache: Reuse the parse results stored on disk (CORENLP_PARSE_CACHE_PATH) for texts that were already parsed
+    with the same annotators and properties, only the other texts are sent to CoreNLP.
+    n_workers: Number of requests sent concurrently to the CoreNLP server.
+    batch_size: Maximum number of lines sent in a single request when sentence_split is False.
+    """
+    corenlp_annotators, annotators_properties = get_corenlp_config(tokenize, sentence_split, with_constituency_parse)
+    texts = [" ".join(text) if isinstance(text, List) else text for text in texts]
+    # The key covers everything that changes the parse result
+    keys = [get_content_hash(text, corenlp_annotators, annotators_properties) for text in texts]
+    parse_results_per_key = get_parse_cache().get_many(keys) if use_cache else {}
+    texts_to_parse = {key: text for key, text in zip(keys, texts) if key not in parse_results_per_key}
+
+    if len(texts_to_parse) > 0:
+        new_parse_results_per_key = {}
+        with corenlp_server.client(corenlp_annotators, annotators_properties) as client:
+            sentences_per_text = _annotate_texts(
+                client,
+                list(texts_to_parse.values()),
+                {**annotators_properties, "annotators": ",".join(corenlp_annotators)},
+                sentence_split=sentence_split,
+                n_workers=n_workers,
+                batch_size=batch_size,
+                verbose=verbose,
+            )
+            for key, sentences in zip(texts_to_parse.keys(), sentences_per_text):
+                parse_result = format_parser_output(sentences)
+
+                if len(parse_result["sentences"]) > 1 and not sentence_split:
+                    parse_result = join_parse_result(parse_result)
+                elif sentence_split:
+                    parse_result = split_parse_result(parse_result["sentences"])
+
+                new_parse_results_per_key[key] = parse_result
+        if use_cache:
+            get_parse_cache().set_many(new_parse_results_per_key)
+        parse_results_per_key.update(new_parse_results_per_key)
+
+    parse_results = []
+    seen_keys = set()
+    for key in keys:
+        parse_result = parse_results_per_key[key]
+        if key in seen_keys:
+            # Copy so that callers can modify the results of duplicate texts independently
+            parse_result = copy.deepcopy(parse_result)
+        seen_keys.add(key)
+        parse_results.append(parse_result)
     return parse_results
 
 
@@ -340,6 +562,8 @@ def lemmatize(parseResult):
 def dependencyParseAndPutOffsets(parseResult):
     # returns dependency parse of the sentence where each item is of the form:
     # (rel, left{charStartOffset, charEndOffset, wordNumber}, right{charStartOffset, charEndOffset, wordNumber})
+    if isinstance(parseResult, PreparedSentence):
+        return parseResult.dependencyParse
 
     dParse = parseResult["sentences"][0]["dependencies"]
     words = parseResult["sentences"][0]["words"]
@@ -389,123 +613,90 @@ def dependencyParseAndPutOffsets(parseResult):
 
         result.append(newItem)
 
-    return result
+    return IndexedDependencyParse(result)
+
+
+def _parseDependencyNode(node):
+    # "word{charStartOffset charEndOffset wordNumber}" -> (wordNumber, word)
+    return int(node.split("{")[1].split("}")[0].split(" ")[2]), node.split("{")[0]
+
+
+class IndexedDependencyParse(list):
+    # output of dependencyParseAndPutOffsets() with the parents and children of each word indexed by word number, so
+    # that findParents() and findChildren() don't parse the whole dependency list at each call
+
+    def __init__(self, dependencyParse):
+        super().__init__(dependencyParse)
+        self.parents = {}
+        self.children = {}
+        self.firstPositions = {}
+        for pos, item in enumerate(self):
+            parentIndex, parentWord = _parseDependencyNode(item[1])
+            childIndex, childWord = _parseDependencyNode(item[2])
+            self.parents.setdefault(childIndex, []).append((parentIndex, parentWord, item[0]))
+            self.children.setdefault(parentIndex, []).append((childIndex, childWord, item[0]))
+            self.firstPositions.setdefault(childIndex, pos)
+        self.sortedChildIndices = sorted(self.firstPositions)
+
+    def findCollapsedRelation(self, wordIndex, word):
+        # the dependencies of words that are not in the list are collapsed in the relation of the closest following
+        # word (e.g. prep_of), returns the position of the first one that mentions the word
+        nextIndexPosition = bisect.bisect_right(self.sortedChildIndices, wordIndex)
+        if nextIndexPosition == len(self.sortedChildIndices):
+            return None
+        for pos in range(self.firstPositions[self.sortedChildIndices[nextIndexPosition]], len(self)):
+            if "_" in self[pos][0] and word in self[pos][0]:
+                return pos
+        return None
 
 
 def findParents(dependencyParse, wordIndex, word):
     # word index assumed to be starting at 1
     # the third parameter is needed because of the collapsed representation of the dependencies...
+    if not isinstance(dependencyParse, IndexedDependencyParse):
+        dependencyParse = IndexedDependencyParse(dependencyParse)
 
-    wordsWithIndices = (
-        (
-            int(item[2].split("{")[1].split("}")[0].split(" ")[2]),
-            item[2].split("{")[0],
-        )
-        for item in dependencyParse
-    )
-    wordsWithIndices = list(set(wordsWithIndices))
-    wordsWithIndices = sorted(wordsWithIndices, key=lambda item: item[0])
-
-    wordIndexPresentInTheList = False
-    for item in wordsWithIndices:
-        if item[0] == wordIndex:
-            wordIndexPresentInTheList = True
-            break
-
-    parentsWithRelation = []
-
-    if wordIndexPresentInTheList:
-        for item in dependencyParse:
-            currentIndex = int(item[2].split("{")[1].split("}")[0].split(" ")[2])
-            if currentIndex == wordIndex:
-                parentsWithRelation.append(
-                    [
-                        int(item[1].split("{")[1].split("}")[0].split(" ")[2]),
-                        item[1].split("{")[0],
-                        item[0],
-                    ]
-                )
-    else:
-        # find the closest following word index which is in the list
-        nextIndex = 0
-        for i in range(len(wordsWithIndices)):
-            if wordsWithIndices[i][0] > wordIndex:
-                nextIndex = wordsWithIndices[i][0]
-                break
-        if nextIndex == 0:
-            return []  # ?
-        for i in range(len(dependencyParse)):
-            if int(dependencyParse[i][2].split("{")[1].split("}")[0].split(" ")[2]) == nextIndex:
-                pos = i
-                break
-        for i in range(pos, len(dependencyParse)):
-            if "_" in dependencyParse[i][0] and word in dependencyParse[i][0]:
-                parent = [
-                    int(dependencyParse[i][1].split("{")[1].split("}")[0].split(" ")[2]),
-                    dependencyParse[i][1].split("{")[0],
-                    dependencyParse[i][0],
-                ]
-                parentsWithRelation.append(parent)
-                break
+    if wordIndex in dependencyParse.parents:
+        return [list(parent) for parent in dependencyParse.parents[wordIndex]]
 
-    return parentsWithRelation
+    pos = dependencyParse.findCollapsedRelation(wordIndex, word)
+    if pos is None:
+        return []
+    return [[*_parseDependencyNode(dependencyParse[pos][1]), dependencyParse[pos][0]]]
 
 
 def findChildren(dependencyParse, wordIndex, word):
     # word index assumed to be starting at 1
     # the third parameter is needed because of the collapsed representation of the dependencies...
+    if not isinstance(dependencyParse, IndexedDependencyParse):
+        dependencyParse = IndexedDependencyParse(dependencyParse)
+
+    # as for the parents, the children are only looked up if the word is a dependent in the list
+    if wordIndex in dependencyParse.parents:
+        return [list(child) for child in dependencyParse.children.get(wordIndex, [])]
+
+    pos = dependencyParse.findCollapsedRelation(wordIndex, word)
+    if pos is None:
+        return []
+    return [[*_parseDependencyNode(dependencyParse[pos][2]), dependencyParse[pos][0]]]
+
+
+class PreparedSentence(dict):
+    # parse result of a sentence with the annotations used by the aligner computed once, so that a sentence aligned
+    # with several others (e.g. each scene with each sentence in SAMSA) is only processed once
+
+    def __init__(self, parseResult):
+        super().__init__(parseResult)
+        self.lemmatized = lemmatize(parseResult)
+        self.posTagged = posTag(parseResult)
+        # [[character begin offset, character end offset], word index, word, lemma, pos tag]
+        self.lemmasAndPosTags = [
+            lemmaItem + [posItem[3]] for lemmaItem, posItem in zip(self.lemmatized, self.posTagged)
+        ]
+        self.dependencyParse = dependencyParseAndPutOffsets(parseResult)
 
-    wordsWithIndices = (
-        (
-            int(item[2].split("{")[1].split("}")[0].split(" ")[2]),
-            item[2].split("{")[0],
-        )
-        for item in dependencyParse
-    )
-    wordsWithIndices = list(set(wordsWithIndices))
-    wordsWithIndices = sorted(wordsWithIndices, key=lambda item: item[0])
-
-    wordIndexPresentInTheList = False
-    for item in wordsWithIndices:
-        if item[0] == wordIndex:
-            wordIndexPresentInTheList = True
-            break
-
-    childrenWithRelation = []
-
-    if wordIndexPresentInTheList:
-        for item in dependencyParse:
-            currentIndex = int(item[1].split("{")[1].split("}")[0].split(" ")[2])
-            if currentIndex == wordIndex:
-                childrenWithRelation.append(
-                    [
-                        int(item[2].split("{")[1].split("}")[0].split(" ")[2]),
-                        item[2].split("{")[0],
-                        item[0],
-                    ]
-                )
-    else:
-        # find the closest following word index which is in the list
-        nextIndex = 0
-        for i in range(len(wordsWithIndices)):
-            if wordsWithIndices[i][0] > wordIndex:
-                nextIndex = wordsWithIndices[i][0]
-                break
-
-        if nextIndex == 0:
-            return []
-        for i in range(len(dependencyParse)):
-            if int(dependencyParse[i][2].split("{")[1].split("}")[0].split(" ")[2]) == nextIndex:
-                pos = i
-                break
-        for i in range(pos, len(dependencyParse)):
-            if "_" in dependencyParse[i][0] and word in dependencyParse[i][0]:
-                child = [
-                    int(dependencyParse[i][2].split("{")[1].split("}")[0].split(" ")[2]),
-                    dependencyParse[i][2].split("{")[0],
-                    dependencyParse[i][0],
-                ]
-                childrenWithRelation.append(child)
-                break
 
-    return childrenWithRelation
+def prepareSentence(parseResult):
+    if isinstance(parseResult, PreparedSentence):
+        return parseResult
+    return PreparedSentence(parseResult)
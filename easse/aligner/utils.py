@@ -1,3 +1,5 @@
+import collections
+
 from easse.aligner.config import *
 
 
@@ -7,7 +9,6 @@ def isSublist(A, B):
 
 
 def findAllCommonContiguousSublists(A, B, turnToLowerCases=True):
-    # this is a very inefficient implementation, you can use suffix trees to devise a much faster method
     # returns all the contiguous sublists in order of decreasing length
     # output format (0-indexed):
     # [
@@ -15,56 +16,109 @@ def findAllCommonContiguousSublists(A, B, turnToLowerCases=True):
     #    ...,
     #    [[indices in 'A' for utils sublist n], [indices in 'B' for utils sublist n]]
     # ]
+    # a common sublist is kept unless its indices are included in the indices of a longer sublist that was already
+    # kept, which can only be the case of sublists that can't be extended on the left nor on the right (any other
+    # sublist is included in its extension). these maximal sublists are found in O(number of matching token pairs)
+    # and then checked in the same order as an exhaustive search: decreasing length, then indices in the shorter list.
 
-    a = []
-    b = []
-    for item in A:
-        a.append(item)
-    for item in B:
-        b.append(item)
+    a = list(A)
+    b = list(B)
 
     if turnToLowerCases:
-        for i in range(len(a)):
-            a[i] = a[i].lower()
-        for i in range(len(b)):
-            b[i] = b[i].lower()
-
-    commonContiguousSublists = []
+        a = [item.lower() for item in a]
+        b = [item.lower() for item in b]
 
     swapped = False
     if len(a) > len(b):
-        temp = a
-        a = b
-        b = temp
+        a, b = b, a
         swapped = True
 
-    maxSize = len(a)
-    for size in range(maxSize, 0, -1):
-        startingIndicesForA = [item for item in range(0, len(a) - size + 1)]
-        startingIndicesForB = [item for item in range(0, len(b) - size + 1)]
-        for i in startingIndicesForA:
-            for j in startingIndicesForB:
-                if a[i : i + size] == b[j : j + size]:
-                    # check if a contiguous superset has already been inserted; don't insert this one in that case
-                    alreadyInserted = False
-                    currentAIndices = [item for item in range(i, i + size)]
-                    currentBIndices = [item for item in range(j, j + size)]
-                    for item in commonContiguousSublists:
-                        if isSublist(currentAIndices, item[0]) and isSublist(currentBIndices, item[1]):
-                            alreadyInserted = True
-                            break
-                    if not alreadyInserted:
-                        commonContiguousSublists.append([currentAIndices, currentBIndices])
-
-    if swapped:
-        for item in commonContiguousSublists:
-            temp = item[0]
-            item[0] = item[1]
-            item[1] = temp
+    positionsInB = {}
+    for j, item in enumerate(b):
+        positionsInB.setdefault(item, []).append(j)
+
+    maximalSublists = []
+    for i, item in enumerate(a):
+        for j in positionsInB.get(item, []):
+            if i > 0 and j > 0 and a[i - 1] == b[j - 1]:
+                continue
+            size = 1
+            while i + size < len(a) and j + size < len(b) and a[i + size] == b[j + size]:
+                size += 1
+            maximalSublists.append((size, i, j))
+    maximalSublists.sort(key=lambda sublist: (-sublist[0], sublist[1], sublist[2]))
+
+    commonContiguousSublists = []
+    insertedRanges = []
+    for size, i, j in maximalSublists:
+        # check if a contiguous superset has already been inserted; don't insert this one in that case
+        alreadyInserted = False
+        for startA, endA, startB, endB in insertedRanges:
+            if startA <= i and i + size <= endA and startB <= j and j + size <= endB:
+                alreadyInserted = True
+                break
+        if not alreadyInserted:
+            insertedRanges.append((i, i + size, j, j + size))
+            currentAIndices = list(range(i, i + size))
+            currentBIndices = list(range(j, j + size))
+            if swapped:
+                commonContiguousSublists.append([currentBIndices, currentAIndices])
+            else:
+                commonContiguousSublists.append([currentAIndices, currentBIndices])
 
     return commonContiguousSublists
 
 
+def iterateBestPairs(
+    wordSimilarities,
+    neighborhoodSimilarities,
+    sourceWordIndicesBeingConsidered,
+    targetWordIndicesBeingConsidered,
+    sourceWordIndicesAlreadyAligned,
+    targetWordIndicesAlreadyAligned,
+):
+    # yields the pair of word indices with the highest weighted similarity that is not already aligned, once for each
+    # word index of the source being considered, with its word and neighborhood similarities
+    # indices appear in the lists being considered once per pair they are part of: the best pair is the first one in
+    # the order of these lists in case of ties, and only the first occurrence of its indices is removed after each
+    # iteration. each pair is scanned once per iteration instead of once per occurrence of its indices.
+    # the lists of already aligned indices can be updated between iterations
+
+    theta2 = 1 - theta1
+    weightedSimilarities = {
+        pair: theta1 * wordSimilarities[pair] + theta2 * neighborhoodSimilarities[pair] for pair in wordSimilarities
+    }
+
+    sourcePositions = collections.defaultdict(collections.deque)
+    for position, i in enumerate(sourceWordIndicesBeingConsidered):
+        sourcePositions[i].append(position)
+    targetPositions = collections.defaultdict(collections.deque)
+    for position, j in enumerate(targetWordIndicesBeingConsidered):
+        targetPositions[j].append(position)
+
+    for _ in range(len(sourceWordIndicesBeingConsidered)):
+        bestKey = None
+        for (i, j), weightedSimilarity in weightedSimilarities.items():
+            if (
+                weightedSimilarity <= 0
+                or not sourcePositions[i]
+                or not targetPositions[j]
+                or i in sourceWordIndicesAlreadyAligned
+                or j in targetWordIndicesAlreadyAligned
+            ):
+                continue
+            key = (-weightedSimilarity, sourcePositions[i][0], targetPositions[j][0])
+            if bestKey is None or key < bestKey:
+                bestKey = key
+                bestPair = (i, j)
+        if bestKey is None:
+            # nothing changes in the next iterations
+            return
+        yield bestPair[0], bestPair[1], wordSimilarities[bestPair], neighborhoodSimilarities[bestPair]
+        sourcePositions[bestPair[0]].popleft()
+        targetPositions[bestPair[1]].popleft()
+
+
 def findTextualNeighborhood(sentenceDetails, wordIndex, leftSpan, rightSpan):
     # return the lemmas in the span [wordIndex-leftSpan, wordIndex+rightSpan]
     # and the positions actually available, left and right
@@ -79,11 +133,11 @@ def findTextualNeighborhood(sentenceDetails, wordIndex, leftSpan, rightSpan):
     lemmas = []
     wordIndices = []
     for item in sentenceDetails[startWordIndex - 1 : wordIndex - 1]:
-        if item[3] not in stopwords + punctuations:
+        if item[3] not in stopwordsSet and item[3] not in punctuationsSet:
             lemmas.append(item[3])
             wordIndices.append(item[1])
     for item in sentenceDetails[wordIndex:endWordIndex]:
-        if item[3] not in stopwords + punctuations:
+        if item[3] not in stopwordsSet and item[3] not in punctuationsSet:
             lemmas.append(item[3])
             wordIndices.append(item[1])
     return [wordIndices, lemmas, wordIndex - startWordIndex, endWordIndex - wordIndex]
@@ -1,25 +1,90 @@
-from easse.aligner.config import *
-from nltk.corpus.reader.wordlist import MWAPPDBCorpusReader
-
-PPDB_PATH = 'resources/ppdb-1.0-xxxl-lexical.extended.synonyms.uniquepairs'
-
-
-def loadPPDB(ppdb_file_name=PPDB_PATH):
+from functools import lru_cache
+import hashlib
+import os
+import threading
+import warnings
+from pathlib import Path
 
-    global ppdbSim
-    global ppdbDict
+import numpy as np
 
-    for entry in MWAPPDBCorpusReader(root="resources", fileids=ppdb_file_name).entries():
-        ppdbDict[entry] = ppdbSim
+from easse.aligner.config import *
+from easse.utils.constants import PPDB_PATH, PPDB_INDEX_PATH
+
+
+def _hash_ppdb_pair(word1, word2):
+    # pairs are symmetric, the words are sorted so that each pair has a single key
+    word1, word2 = sorted([word1, word2])
+    return int.from_bytes(hashlib.blake2b(f'{word1}\t{word2}'.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _get_ppdb_hashes(ppdb_path):
+    with open(ppdb_path, encoding='utf-8') as f:
+        # same lines as nltk's MWAPPDBCorpusReader
+        lines = f.read().splitlines()
+    pairs = (line.split('\t') for line in lines if line.rstrip())
+    return np.unique(np.array([_hash_ppdb_pair(*pair) for pair in pairs if len(pair) == 2], dtype=np.uint64))
+
+
+def compilePPDB(ppdb_path=PPDB_PATH, index_path=PPDB_INDEX_PATH):
+    # compiles the PPDB word pairs into a sorted array of 64-bit pair hashes saved as .npy, which is memory-mapped
+    # instead of being loaded in a dict (the probability of a false positive is about 1e-14 per lookup)
+    hashes = _get_ppdb_hashes(ppdb_path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    # written to a temporary file first so that other processes never read a partial index
+    temp_path = index_path.with_name(f'{index_path.stem}.{os.getpid()}.tmp.npy')
+    try:
+        np.save(temp_path, hashes)
+        os.replace(temp_path, index_path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+    return hashes
+
+
+def _load_ppdb_index(ppdb_path, index_path):
+    ppdb_path, index_path = Path(ppdb_path), Path(index_path)
+    if not ppdb_path.exists():
+        if index_path.exists():
+            return np.load(index_path, mmap_mode='r')
+        warnings.warn(f'PPDB file not found at {ppdb_path}, words will not be aligned using PPDB synonyms.')
+        return np.zeros(0, dtype=np.uint64)
+    if index_path.exists() and index_path.stat().st_mtime >= ppdb_path.stat().st_mtime:
+        return np.load(index_path, mmap_mode='r')
+    try:
+        return compilePPDB(ppdb_path, index_path)
+    except OSError:
+        # e.g. read-only cache directory, the index is only kept in memory
+        return _get_ppdb_hashes(ppdb_path)
+
+
+_ppdbIndex = None
+_ppdbIndexLock = threading.Lock()
+
+
+def loadPPDB(ppdb_file_name=PPDB_PATH, index_path=PPDB_INDEX_PATH):
+    # compiles the index on first use (or when the PPDB file changed) and memory-maps it, so that it is loaded in
+    # milliseconds and shared by all the processes using it
+    global _ppdbIndex
+
+    with _ppdbIndexLock:
+        if _ppdbIndex is None:
+            _ppdbIndex = _load_ppdb_index(ppdb_file_name, index_path)
+    return _ppdbIndex
 
 
 def present_in_ppdb(word1, word2):
+    ppdbIndex = _ppdbIndex if _ppdbIndex is not None else loadPPDB()
+    key = _hash_ppdb_pair(word1.lower(), word2.lower())
+    position = np.searchsorted(ppdbIndex, np.uint64(key))
+    return bool(position < len(ppdbIndex) and ppdbIndex[position] == key)
 
-    global ppdbDict
 
-    return ((word1.lower(), word2.lower()) in ppdbDict) or ((word2.lower(), word1.lower()) in ppdbDict)
+# maximum number of entries of the memo tables, the word tables are bounded by the vocabulary
+WORD_CACHE_SIZE = 2**16
+RELATEDNESS_CACHE_SIZE = 2**18
 
 
+@lru_cache(maxsize=WORD_CACHE_SIZE)
 def get_cannonical_word(word):
     if len(word) > 1:
         canonical_word = word.replace('.', '')
@@ -30,11 +95,15 @@ def get_cannonical_word(word):
     return canonical_word
 
 
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def get_stem(word):
+    return stemmer.stem(word).lower()
+
+
+@lru_cache(maxsize=RELATEDNESS_CACHE_SIZE)
 def wordRelatedness(word1, pos1, word2, pos2):
 
-    global stemmer
     global ppdbSim
-    global punctuations
 
     canonical_word1 = get_cannonical_word(word1)
     canonical_word2 = get_cannonical_word(word2)
@@ -42,7 +111,7 @@ def wordRelatedness(word1, pos1, word2, pos2):
     if canonical_word1.lower() == canonical_word2.lower():
         return 1
 
-    if stemmer.stem(word1).lower() == stemmer.stem(word2).lower():
+    if get_stem(word1) == get_stem(word2):
         return 1
 
     if canonical_word1.isdigit() and canonical_word2.isdigit() and canonical_word1 != canonical_word2:
@@ -57,13 +126,11 @@ def wordRelatedness(word1, pos1, word2, pos2):
         return 0
 
     # stopwords can be similar to only stopwords
-    if (word1.lower() in stopwords and word2.lower() not in stopwords) or (
-        word1.lower() not in stopwords and word2.lower() in stopwords
-    ):
+    if (word1.lower() in stopwordsSet) != (word2.lower() in stopwordsSet):
         return 0
 
     # punctuations can only be either identical or totally dissimilar
-    if word1 in punctuations or word2 in punctuations:
+    if word1 in punctuationsSet or word2 in punctuationsSet:
         return 0
 
     if present_in_ppdb(word1.lower(), word2.lower()):
@@ -72,4 +139,31 @@ def wordRelatedness(word1, pos1, word2, pos2):
         return 0
 
 
-# loadPPDB()
+def get_word_sim_cache_info():
+    # hits, misses and size of each memo table, e.g. to measure their effect on a large annotation run
+    return {
+        name: function.cache_info()
+        for name, function in [
+            ('canonical_word', get_cannonical_word),
+            ('stem', get_stem),
+            ('word_relatedness', wordRelatedness),
+        ]
+    }
+
+
+def clear_word_sim_caches():
+    get_cannonical_word.cache_clear()
+    get_stem.cache_clear()
+    wordRelatedness.cache_clear()
+
+
+class WordSimilarities(dict):
+    # wordRelatedness() of the word pairs of a sentence pair, each pair is only computed once across all the
+    # alignment passes
+
+    def relatedness(self, word1, pos1, word2, pos2):
+        key = (word1, pos1, word2, pos2)
+        if key not in self:
+            self[key] = wordRelatedness(word1, pos1, word2, pos2)
+        return self[key]
+
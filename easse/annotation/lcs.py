@@ -1,36 +1,48 @@
-from functools import lru_cache
-
-
-def get_lcs(seq1, seq2):
-    '''Returns the longest common subsequence using memoization (only in local scope)'''
-
-    @lru_cache(maxsize=None)
-    def recursive_lcs(seq1, seq2):
-        if len(seq1) == 0 or len(seq2) == 0:
-            return []
-        if seq1[-1] == seq2[-1]:
-            return recursive_lcs(seq1[:-1], seq2[:-1]) + [seq1[-1]]
-        else:
-            return max(recursive_lcs(seq1[:-1], seq2), recursive_lcs(seq1, seq2[:-1]), key=lambda seq: len(seq))
-
-    try:
-        return recursive_lcs(tuple(seq1), tuple(seq2))
-    except RecursionError as e:
-        print(e)
-        # TODO: Handle this case
-        return []
+def _get_lcs_rows(seq1, seq2):
+    '''Bit-parallel LCS (Hyyrö, 2004): row i encodes the lengths of the LCS of seq1[:i] with every prefix of seq2'''
+    match_masks = {}
+    for j, item in enumerate(seq2):
+        match_masks[item] = match_masks.get(item, 0) | (1 << j)
+    full_mask = (1 << len(seq2)) - 1
+    row = full_mask
+    rows = [row]
+    for item in seq1:
+        matches = row & match_masks.get(item, 0)
+        row = ((row + matches) | (row - matches)) & full_mask
+        rows.append(row)
+    return rows
+
+
+def _get_lcs_length(rows, i, j):
+    '''Length of the LCS of seq1[:i] and seq2[:j], i.e. the number of zero bits among the j lowest bits of row i'''
+    return j - bin(rows[i] & ((1 << j) - 1)).count('1')
 
 
 def get_lcs_alignment(seq1, seq2):
-    '''Same as get_lcs() but returning the alignments of indexes instead of words'''
-
-    @lru_cache()
-    def recursive_lcs(seq1, seq2):
-        if len(seq1) == 0 or len(seq2) == 0:
-            return []
-        if seq1[-1] == seq2[-1]:
-            return recursive_lcs(seq1[:-1], seq2[:-1]) + [(len(seq1) - 1, len(seq2) - 1)]
+    '''
+    Returns the alignment of indexes [(index in seq1, index in seq2), ...] of a longest common subsequence.
+    Iterative, in O(len(seq1) * len(seq2) / 64), ties are broken as in the recursive definition:
+    lcs(seq1, seq2) = lcs(seq1[:-1], seq2[:-1]) + [last item] if the last items are equal, else the longest of
+    lcs(seq1[:-1], seq2) and lcs(seq1, seq2[:-1]), the first one in case of tie.
+    '''
+    seq1 = list(seq1)
+    seq2 = list(seq2)
+    rows = _get_lcs_rows(seq1, seq2)
+    alignment = []
+    i, j = len(seq1), len(seq2)
+    while i > 0 and j > 0:
+        if seq1[i - 1] == seq2[j - 1]:
+            alignment.append((i - 1, j - 1))
+            i -= 1
+            j -= 1
+        elif _get_lcs_length(rows, i - 1, j) >= _get_lcs_length(rows, i, j - 1):
+            i -= 1
         else:
-            return max(recursive_lcs(seq1[:-1], seq2), recursive_lcs(seq1, seq2[:-1]), key=lambda seq: len(seq))
+            j -= 1
+    return alignment[::-1]
 
-    return recursive_lcs(tuple(seq1), tuple(seq2))
+
+def get_lcs(seq1, seq2):
+    '''Returns the longest common subsequence (items of seq1)'''
+    seq1 = list(seq1)
+    return [seq1[i] for i, _ in get_lcs_alignment(seq1, seq2)]
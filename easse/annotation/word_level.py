@@ -431,8 +431,8 @@ class WordOperationAnnotator:
         return np.stack(sentence_scores, axis=0)
 
     def identify_operations(self, orig_sentences: List[str], simp_sentences: List[str]):
-        orig_sentences = [utils_prep.normalize(sent, self._lowercase, self._tokenizer) for sent in orig_sentences]
-        simp_sentences = [utils_prep.normalize(sent, self._lowercase, self._tokenizer) for sent in simp_sentences]
+        orig_sentences = utils_prep.normalize_many(orig_sentences, self._lowercase, self._tokenizer)
+        simp_sentences = utils_prep.normalize_many(simp_sentences, self._lowercase, self._tokenizer)
 
         all_parses = syntactic_parse_texts(
             orig_sentences + simp_sentences,
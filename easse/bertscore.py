@@ -1,7 +1,153 @@
+from collections import defaultdict, OrderedDict
+import threading
 from typing import List
 
 from bert_score import BERTScorer
+from bert_score.utils import get_bert_embedding, greedy_cos_idf
+import numpy as np
+import torch
+from torch.nn.utils.rnn import pad_sequence
+
 import easse.utils.preprocessing as utils_prep
+from easse.utils.cache import get_content_hash
+
+
+# Scorers are expensive to build (the model is loaded in memory), they are shared by the whole process
+_bertscorers = {}
+_bertscorers_lock = threading.Lock()
+# Default maximum size of the cached reference embeddings (512MB), about 5k sentences of 25 tokens with roberta-large
+REFERENCE_EMBEDDINGS_CACHE_BYTES = 2**29
+
+
+class EmbeddingsCache:
+    """
+    Token embeddings of sentences, keyed by the hash of the scorer settings and of the sentence. The least recently
+    used sentences are evicted when the total size of the tensors exceeds max_bytes. Safe to use from several threads.
+    """
+
+    def __init__(self, max_bytes: int = REFERENCE_EMBEDDINGS_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.n_bytes = 0
+        self._embeddings = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_n_bytes(embedding_and_idf):
+        return sum(tensor.element_size() * tensor.nelement() for tensor in embedding_and_idf)
+
+    def get_many(self, keys: List[str]):
+        """Returns the cached (embedding, idf) of the keys that are present in the cache."""
+        with self._lock:
+            values = {}
+            for key in keys:
+                if key in self._embeddings:
+                    self._embeddings.move_to_end(key)
+                    values[key] = self._embeddings[key]
+            return values
+
+    def set_many(self, items):
+        with self._lock:
+            for key, value in items.items():
+                if key in self._embeddings:
+                    self.n_bytes -= self._get_n_bytes(self._embeddings.pop(key))
+                self._embeddings[key] = value
+                self.n_bytes += self._get_n_bytes(value)
+            while self.n_bytes > self.max_bytes and len(self._embeddings) > 0:
+                _, evicted_value = self._embeddings.popitem(last=False)
+                self.n_bytes -= self._get_n_bytes(evicted_value)
+
+    def clear(self):
+        with self._lock:
+            self._embeddings.clear()
+            self.n_bytes = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._embeddings)
+
+
+# Embeddings of the reference sentences, shared by the whole process unless another cache is passed
+_reference_embeddings = EmbeddingsCache()
+
+
+def get_bertscorer(
+    lang: str = "en",
+    model_type: str = None,
+    num_layers: int = None,
+    rescale_with_baseline: bool = True,
+    device: str = None,
+):
+    """Returns the scorer of these settings, built on first use and then reused."""
+    key = (lang, model_type, num_layers, rescale_with_baseline, device)
+    with _bertscorers_lock:
+        if key not in _bertscorers:
+            _bertscorers[key] = BERTScorer(
+                lang=lang,
+                model_type=model_type,
+                num_layers=num_layers,
+                rescale_with_baseline=rescale_with_baseline,
+                device=device,
+            )
+        return _bertscorers[key]
+
+
+def clear_bertscore_caches():
+    """Frees the scorers and the cached reference embeddings."""
+    with _bertscorers_lock:
+        _bertscorers.clear()
+    _reference_embeddings.clear()
+
+
+def _get_idf_dict(scorer: BERTScorer):
+    # Same uniform weights as BERTScorer.score() without idf
+    idf_dict = defaultdict(lambda: 1.0)
+    idf_dict[scorer._tokenizer.sep_token_id] = 0
+    idf_dict[scorer._tokenizer.cls_token_id] = 0
+    return idf_dict
+
+
+def _compute_embeddings(scorer: BERTScorer, sentences: List[str], batch_size: int):
+    """Returns {sentence: (embedding, idf)} on the cpu, without padding."""
+    # Sentences of similar lengths are batched together as in bert_score.utils.bert_cos_score_idf()
+    sentences = sorted(set(sentences), key=lambda sentence: len(sentence.split(" ")), reverse=True)
+    idf_dict = _get_idf_dict(scorer)
+    embeddings = {}
+    for start in range(0, len(sentences), batch_size):
+        batch_sentences = sentences[start : start + batch_size]
+        batch_embeddings, masks, padded_idf = get_bert_embedding(
+            batch_sentences, scorer._model, scorer._tokenizer, idf_dict, device=scorer.device
+        )
+        batch_embeddings, masks, padded_idf = batch_embeddings.cpu(), masks.cpu(), padded_idf.cpu()
+        for i, sentence in enumerate(batch_sentences):
+            sequence_length = masks[i].sum().item()
+            embeddings[sentence] = (batch_embeddings[i, :sequence_length], padded_idf[i, :sequence_length])
+    return embeddings
+
+
+def _get_reference_embeddings(
+    scorer: BERTScorer, sentences: List[str], batch_size: int, embeddings_cache: EmbeddingsCache
+):
+    """Same as _compute_embeddings() but only encodes the sentences that are not in the cache for this scorer,
+    so that fixed references (e.g. ASSET or TurkCorpus) are only encoded once."""
+    scorer_hash = scorer.hash
+    keys = {sentence: get_content_hash(scorer_hash, sentence) for sentence in sentences}
+    cached_embeddings = embeddings_cache.get_many(list(keys.values()))
+    embeddings = {sentence: cached_embeddings[key] for sentence, key in keys.items() if key in cached_embeddings}
+    missing_sentences = [sentence for sentence in keys if sentence not in embeddings]
+    if len(missing_sentences) > 0:
+        new_embeddings = _compute_embeddings(scorer, missing_sentences, batch_size)
+        embeddings_cache.set_many({keys[sentence]: value for sentence, value in new_embeddings.items()})
+        embeddings.update(new_embeddings)
+    return embeddings
+
+
+def _pad_embeddings(sentences: List[str], embeddings, device):
+    sentence_embeddings, idfs = zip(*[embeddings[sentence] for sentence in sentences])
+    lengths = torch.tensor([embedding.size(0) for embedding in sentence_embeddings], dtype=torch.long)
+    padded_embeddings = pad_sequence([e.to(device) for e in sentence_embeddings], batch_first=True, padding_value=2.0)
+    padded_idfs = pad_sequence([idf.to(device) for idf in idfs], batch_first=True)
+    masks = torch.arange(lengths.max().item(), dtype=torch.long).expand(len(lengths), -1) < lengths.unsqueeze(1)
+    return padded_embeddings, masks.to(device), padded_idfs
 
 
 def get_bertscore_sentence_scores(
@@ -9,14 +155,86 @@ def get_bertscore_sentence_scores(
     refs_sents: List[List[str]],
     lowercase: bool = False,
     tokenizer: str = "13a",
+    normalization_cache: utils_prep.NormalizationCache = None,
+    batch_size: int = 64,
+    nthreads: int = None,
+    scorer: BERTScorer = None,
+    embeddings_cache: EmbeddingsCache = None,
 ):
-    scorer = BERTScorer(lang="en", rescale_with_baseline=True)
+    """
+    Returns the (P, R, F1) tensors of shape (n_samples,), each sample is scored against its best reference.
+    Same scores as BERTScorer.score() but the scorer is shared and the references are only encoded once per process.
+    batch_size: Number of sentences encoded at once, lower it on hosts with little memory.
+    nthreads: Number of threads used by torch on the cpu (process-wide setting), torch's default if None.
+    embeddings_cache: Cache of the reference embeddings, the bounded cache shared by the process if None.
+    """
+    if scorer is None:
+        scorer = get_bertscorer()
+    if embeddings_cache is None:
+        embeddings_cache = _reference_embeddings
+    assert not scorer.idf and not scorer.all_layers, "Only scorers without idf and with a single layer are supported"
+    if nthreads is not None:
+        torch.set_num_threads(nthreads)
+
+    sys_sents = utils_prep.normalize_many(sys_sents, lowercase, tokenizer, cache=normalization_cache)
+    refs_sents = [
+        utils_prep.normalize_many(ref_sents, lowercase, tokenizer, cache=normalization_cache) for ref_sents in refs_sents
+    ]
+    # One (candidate, reference) pair per reference of each sample
+    pairs = [(sys_sent, ref_sent) for sys_sent, *ref_sents in zip(sys_sents, *refs_sents) for ref_sent in ref_sents]
+    n_refs = len(refs_sents)
 
-    sys_sents = [utils_prep.normalize(sent, lowercase, tokenizer) for sent in sys_sents]
-    refs_sents = [[utils_prep.normalize(sent, lowercase, tokenizer) for sent in ref_sents] for ref_sents in refs_sents]
-    refs_sents = [list(r) for r in zip(*refs_sents)]
+    embeddings = _get_reference_embeddings(scorer, [ref_sent for _, ref_sent in pairs], batch_size, embeddings_cache)
+    # System sentences that are identical to a reference are not encoded again
+    sys_sents_to_encode = [sys_sent for sys_sent in set(sys_sents) if sys_sent not in embeddings]
+    embeddings.update(_compute_embeddings(scorer, sys_sents_to_encode, batch_size))
 
-    return scorer.score(sys_sents, refs_sents)
+    device = next(scorer._model.parameters()).device
+    all_preds = []
+    with torch.no_grad():
+        for start in range(0, len(pairs), batch_size):
+            batch_sys_sents, batch_ref_sents = zip(*pairs[start : start + batch_size])
+            P, R, F1 = greedy_cos_idf(
+                *_pad_embeddings(batch_ref_sents, embeddings, device),
+                *_pad_embeddings(batch_sys_sents, embeddings, device),
+            )
+            all_preds.append(torch.stack((P, R, F1), dim=-1).cpu())
+    all_preds = torch.cat(all_preds, dim=0) if len(all_preds) > 0 else torch.zeros((0, 3))
+    # Best score among the references of each sample
+    all_preds = all_preds.view(len(sys_sents), n_refs, 3).max(dim=1)[0]
+    if scorer.rescale_with_baseline:
+        all_preds = (all_preds - scorer.baseline_vals) / (1 - scorer.baseline_vals)
+    return all_preds[..., 0], all_preds[..., 1], all_preds[..., 2]
+
+
+def bertscore_from_sentence_scores(sentence_scores):
+    """sentence_scores: array of shape (n_samples, 3) as returned by corpus_bertscore_with_sentence_scores(), e.g. the
+    rows of a subset of the samples. Returns the (precision, recall, f1) corpus scores, i.e. the average over samples."""
+    if len(sentence_scores) == 0:
+        return 0.0, 0.0, 0.0
+    precision, recall, f1 = (float(score) for score in np.mean(sentence_scores, axis=0, dtype=np.float64))
+    return precision, recall, f1
+
+
+def corpus_bertscore_with_sentence_scores(
+    sys_sents: List[str],
+    refs_sents: List[List[str]],
+    lowercase: bool = False,
+    tokenizer: str = "13a",
+    normalization_cache: utils_prep.NormalizationCache = None,
+    batch_size: int = 64,
+    nthreads: int = None,
+):
+    """
+    Runs the model once and returns both the corpus scores (precision, recall, f1) and the sentence scores as a
+    numpy array of shape (n_samples, 3), so that scores of subsets of the corpus (e.g. bins) or sorting samples by score
+    don't require running the model again.
+    """
+    sentence_scores = get_bertscore_sentence_scores(
+        sys_sents, refs_sents, lowercase, tokenizer, normalization_cache, batch_size=batch_size, nthreads=nthreads
+    )
+    sentence_scores = torch.stack(sentence_scores, dim=-1).cpu().numpy()
+    return bertscore_from_sentence_scores(sentence_scores), sentence_scores
 
 
 def corpus_bertscore(
@@ -24,10 +242,11 @@ def corpus_bertscore(
     refs_sents: List[List[str]],
     lowercase: bool = False,
     tokenizer: str = "13a",
+    normalization_cache: utils_prep.NormalizationCache = None,
+    batch_size: int = 64,
+    nthreads: int = None,
 ):
-    all_scores = get_bertscore_sentence_scores(sys_sents, refs_sents, lowercase, tokenizer)
-    avg_scores = [s.mean(dim=0) for s in all_scores]
-    precision = avg_scores[0].cpu().item()
-    recall = avg_scores[1].cpu().item()
-    f1 = avg_scores[2].cpu().item()
-    return precision, recall, f1
+    corpus_scores, _ = corpus_bertscore_with_sentence_scores(
+        sys_sents, refs_sents, lowercase, tokenizer, normalization_cache, batch_size=batch_size, nthreads=nthreads
+    )
+    return corpus_scores
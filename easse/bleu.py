@@ -19,9 +19,12 @@ def corpus_bleu(
     lowercase: bool = False,
     tokenizer: str = "13a",
     effective_order: bool = False,
+    normalization_cache: utils_prep.NormalizationCache = None,
 ):
-    sys_sents = [utils_prep.normalize(sent, lowercase, tokenizer) for sent in sys_sents]
-    refs_sents = [[utils_prep.normalize(sent, lowercase, tokenizer) for sent in ref_sents] for ref_sents in refs_sents]
+    sys_sents = utils_prep.normalize_many(sys_sents, lowercase, tokenizer, cache=normalization_cache)
+    refs_sents = [
+        utils_prep.normalize_many(ref_sents, lowercase, tokenizer, cache=normalization_cache) for ref_sents in refs_sents
+    ]
 
     bleu_scorer = BLEU(lowercase=False, force=force, tokenize="none", smooth_method=smooth_method, smooth_value=smooth_value, effective_order=effective_order)
 
@@ -31,6 +34,85 @@ def corpus_bleu(
     ).score
 
 
+def get_bleu_scorer_with_references(
+    refs_sents: List[List[str]],
+    force: bool = True,
+    lowercase: bool = False,
+    tokenizer: str = "13a",
+    normalization_cache: utils_prep.NormalizationCache = None,
+):
+    """
+    Returns a sacrebleu scorer holding the n-grams of the normalized references, to be passed to
+    get_sentence_bleu_stats() when several systems are scored against the same references.
+    """
+    refs_sents = [
+        utils_prep.normalize_many(ref_sents, lowercase, tokenizer, cache=normalization_cache) for ref_sents in refs_sents
+    ]
+    return BLEU(lowercase=False, force=force, tokenize="none", references=refs_sents)
+
+
+def get_sentence_bleu_stats(
+    sys_sents: List[str],
+    refs_sents: List[List[str]],
+    force: bool = True,
+    lowercase: bool = False,
+    tokenizer: str = "13a",
+    normalization_cache: utils_prep.NormalizationCache = None,
+    bleu_scorer: BLEU = None,
+):
+    """
+    Returns the sacrebleu statistics of each sample as an array of shape (n_samples, 2 + 2 * max_ngram_order):
+    system length, reference length, then the correct and total n-gram counts of each order.
+    The BLEU of any subset of samples can then be computed with bleu_from_stats() on the corresponding rows.
+    bleu_scorer: Scorer of get_bleu_scorer_with_references() built with the same references and options, the
+    references are then not normalized and counted again.
+    """
+    sys_sents = utils_prep.normalize_many(sys_sents, lowercase, tokenizer, cache=normalization_cache)
+    if bleu_scorer is None:
+        refs_sents = [
+            utils_prep.normalize_many(ref_sents, lowercase, tokenizer, cache=normalization_cache)
+            for ref_sents in refs_sents
+        ]
+        bleu_scorer = BLEU(lowercase=False, force=force, tokenize="none")
+    else:
+        # The references cached in the scorer are used
+        refs_sents = None
+    # Private sacrebleu API (see the pinned versions in requirements.txt), the shape is checked to fail loudly if the
+    # layout of the statistics changes
+    stats = np.array(bleu_scorer._extract_corpus_statistics(sys_sents, refs_sents), dtype=np.int64)
+    n_stats = 2 + 2 * bleu_scorer.max_ngram_order
+    assert stats.shape == (len(sys_sents), n_stats) or (
+        len(sys_sents) == 0 and stats.size == 0
+    ), f"Unexpected shape of sacrebleu statistics: {stats.shape} instead of ({len(sys_sents)}, {n_stats})"
+    return stats.reshape(len(sys_sents), n_stats)
+
+
+def bleu_from_stats(
+    stats,
+    smooth_method: str = "exp",
+    smooth_value: float = None,
+    effective_order: bool = False,
+):
+    """
+    stats: statistics of get_sentence_bleu_stats(), either of shape (n_samples, n_stats) which are summed over the
+    samples or already summed with shape (n_stats,).
+    """
+    stats = np.asarray(stats)
+    if stats.ndim == 2:
+        stats = stats.sum(axis=0)
+    max_ngram_order = (len(stats) - 2) // 2
+    return BLEU.compute_bleu(
+        correct=stats[2 : 2 + max_ngram_order].tolist(),
+        total=stats[2 + max_ngram_order :].tolist(),
+        sys_len=int(stats[0]),
+        ref_len=int(stats[1]),
+        smooth_method=smooth_method,
+        smooth_value=smooth_value,
+        effective_order=effective_order,
+        max_ngram_order=max_ngram_order,
+    ).score
+
+
 def sentence_bleu(
     sys_sent: str,
     ref_sents: List[str],
@@ -39,6 +121,7 @@ def sentence_bleu(
     lowercase: bool = False,
     tokenizer: str = "13a",
     effective_order: bool = True,
+    normalization_cache: utils_prep.NormalizationCache = None,
 ):
 
     return corpus_bleu(
@@ -50,6 +133,7 @@ def sentence_bleu(
         lowercase=lowercase,
         tokenizer=tokenizer,
         effective_order=effective_order,
+        normalization_cache=normalization_cache,
     )
 
 
@@ -61,6 +145,7 @@ def corpus_averaged_sentence_bleu(
     lowercase: bool = False,
     tokenizer: str = "13a",
     effective_order: bool = True,
+    normalization_cache: utils_prep.NormalizationCache = None,
 ):
 
     scores = []
@@ -74,6 +159,7 @@ def corpus_averaged_sentence_bleu(
                 lowercase=lowercase,
                 tokenizer=tokenizer,
                 effective_order=effective_order,
+                normalization_cache=normalization_cache,
             )
         )
     return np.mean(scores)
@@ -1,19 +1,26 @@
+from itertools import zip_longest
 from pathlib import Path
 
 import click
 
 from easse.fkgl import corpus_fkgl
-from easse.utils.helpers import read_lines
+from easse.utils.helpers import read_lines, yield_lines
+from easse.utils.preprocessing import NormalizationCache
 from easse.quality_estimation import corpus_quality_estimation
 from easse.sari import corpus_sari, get_corpus_sari_operation_scores
 from easse.bleu import corpus_bleu, corpus_averaged_sentence_bleu
 from easse.compression import corpus_f1_token
+from easse.significance import get_significance_scores, format_significance_scores
 from easse.utils.constants import (
     VALID_TEST_SETS,
     VALID_METRICS,
     DEFAULT_METRICS,
+    SIGNIFICANCE_METRICS,
+    MERGEABLE_METRICS,
 )
-from easse.utils.resources import get_orig_sents, get_refs_sents
+from easse.utils.resources import get_orig_sents, get_refs_sents, get_orig_sents_path, get_refs_sents_paths
+from easse.streaming import corpus_scores_streaming
+from easse.parallel import corpus_scores_parallel
 from easse.report import write_html_report, write_multiple_systems_html_report
 
 
@@ -46,13 +53,46 @@ def get_orig_and_refs_sents(test_set, orig_sents_path=None, refs_sents_paths=Non
     return orig_sents, refs_sents
 
 
+def yield_sys_sents(sys_sents_path=None):
+    # Same as get_sys_sents() but reads the sentences lazily
+    if sys_sents_path is not None:
+        yield from yield_lines(sys_sents_path)
+    else:
+        with click.get_text_stream("stdin", encoding="utf-8") as system_output_file:
+            for line in system_output_file:
+                yield line.rstrip("\r\n")
+
+
+def yield_samples(test_set, sys_sents_path=None, orig_sents_path=None, refs_sents_paths=None):
+    """Yields (orig_sent, sys_sent, ref_sents) tuples read lazily from the files."""
+    if test_set == "custom":
+        assert orig_sents_path is not None
+        assert refs_sents_paths is not None
+        if type(refs_sents_paths) == str:
+            refs_sents_paths = refs_sents_paths.split(",")
+    else:
+        orig_sents_path = get_orig_sents_path(test_set)
+        refs_sents_paths = get_refs_sents_paths(test_set)
+    missing = object()
+    for orig_sent, sys_sent, *ref_sents in zip_longest(
+        yield_lines(orig_sents_path),
+        yield_sys_sents(sys_sents_path),
+        *[yield_lines(ref_sents_path) for ref_sents_path in refs_sents_paths],
+        fillvalue=missing,
+    ):
+        assert all(
+            sent is not missing for sent in [orig_sent, sys_sent, *ref_sents]
+        ), f"Not same number of lines for test_set={test_set}, sys_sents_path={sys_sents_path}, orig_sents_path={orig_sents_path}, refs_sents_paths={refs_sents_paths}"  # noqa: E501
+        yield orig_sent, sys_sent, tuple(ref_sents)
+
+
 @click.group(context_settings={"help_option_names": ["-h", "--help"]})
 @click.version_option()
 def cli():
     pass
 
 
-def common_options(function):
+def test_set_options(function):
     function = click.option(
         "--test_set",
         "-t",
@@ -85,6 +125,11 @@ def common_options(function):
         default="13a",
         help="Tokenization method to use.",
     )(function)
+    return function
+
+
+def common_options(function):
+    function = test_set_options(function)
     function = click.option(
         "--metrics",
         "-m",
@@ -119,6 +164,24 @@ def common_options(function):
     default=None,
     help="Path to the system predictions input file that is to be evaluated.",
 )
+@click.option(
+    "--streaming",
+    is_flag=True,
+    help="Read and score the files by chunks so that memory usage does not depend on the size of the corpus.",
+)
+@click.option(
+    "--chunk_size",
+    type=int,
+    default=10000,
+    help="Number of samples per chunk in streaming mode.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    default=1,
+    help="Number of processes used to compute the metrics (SAMSA, BERTScore and the word-level analysis stay single-process).",
+)
 def _evaluate_system_output(*args, **kwargs):
     kwargs["metrics"] = kwargs.pop("metrics").split(",")
     metrics_scores = evaluate_system_output(*args, **kwargs)
@@ -150,17 +213,47 @@ def evaluate_system_output(
     metrics=DEFAULT_METRICS,
     analysis=False,
     quality_estimation=False,
+    streaming=False,
+    chunk_size=10000,
+    jobs=1,
 ):
     """
     Evaluate a system output with automatic metrics.
     """
     for metric in metrics:
         assert metric in VALID_METRICS, f'"{metric}" is not a valid metric. Choose among: {VALID_METRICS}'
+    if streaming:
+        assert not analysis, "Word-level analysis is not available in streaming mode"
+        return corpus_scores_streaming(
+            yield_samples(test_set, sys_sents_path, orig_sents_path, refs_sents_paths),
+            chunk_size=chunk_size,
+            metrics=metrics,
+            lowercase=lowercase,
+            tokenizer=tokenizer,
+            quality_estimation=quality_estimation,
+        )
     sys_sents = get_sys_sents(test_set, sys_sents_path)
     orig_sents, refs_sents = get_orig_and_refs_sents(test_set, orig_sents_path, refs_sents_paths)
+    # Shared across metrics so that each sentence is normalized only once per (lowercase, tokenizer)
+    normalization_cache = NormalizationCache()
 
     # compute each metric
     metrics_scores = {}
+    if jobs > 1:
+        # Metrics that can be sharded are computed in a process pool, the others are computed below as usual
+        parallel_metrics = [metric for metric in metrics if metric in MERGEABLE_METRICS]
+        metrics_scores = corpus_scores_parallel(
+            orig_sents,
+            sys_sents,
+            refs_sents,
+            metrics=parallel_metrics,
+            lowercase=lowercase,
+            tokenizer=tokenizer,
+            quality_estimation=quality_estimation,
+            jobs=jobs,
+        )
+        metrics = [metric for metric in metrics if metric not in parallel_metrics]
+        quality_estimation = False
     if "bleu" in metrics:
         metrics_scores["bleu"] = corpus_bleu(
             sys_sents,
@@ -168,11 +261,12 @@ def evaluate_system_output(
             force=True,
             tokenizer=tokenizer,
             lowercase=lowercase,
+            normalization_cache=normalization_cache,
         )
 
     if "sent_bleu" in metrics:
         metrics_scores["sent_bleu"] = corpus_averaged_sentence_bleu(
-            sys_sents, refs_sents, tokenizer=tokenizer, lowercase=lowercase
+            sys_sents, refs_sents, tokenizer=tokenizer, lowercase=lowercase, normalization_cache=normalization_cache
         )
 
     if "sari" in metrics:
@@ -182,6 +276,7 @@ def evaluate_system_output(
             refs_sents,
             tokenizer=tokenizer,
             lowercase=lowercase,
+            normalization_cache=normalization_cache,
         )
 
     if "sari_legacy" in metrics:
@@ -192,6 +287,7 @@ def evaluate_system_output(
             tokenizer=tokenizer,
             lowercase=lowercase,
             legacy=True,
+            normalization_cache=normalization_cache,
         )
 
     if "sari_by_operation" in metrics:
@@ -205,6 +301,7 @@ def evaluate_system_output(
             refs_sents,
             tokenizer=tokenizer,
             lowercase=lowercase,
+            normalization_cache=normalization_cache,
         )
 
     if "samsa" in metrics:
@@ -216,13 +313,16 @@ def evaluate_system_output(
             tokenizer=tokenizer,
             lowercase=lowercase,
             verbose=True,
+            normalization_cache=normalization_cache,
         )
 
     if "fkgl" in metrics:
-        metrics_scores["fkgl"] = corpus_fkgl(sys_sents, tokenizer=tokenizer)
+        metrics_scores["fkgl"] = corpus_fkgl(sys_sents, tokenizer=tokenizer, normalization_cache=normalization_cache)
 
     if "f1_token" in metrics:
-        metrics_scores["f1_token"] = corpus_f1_token(sys_sents, refs_sents, tokenizer=tokenizer, lowercase=lowercase)
+        metrics_scores["f1_token"] = corpus_f1_token(
+            sys_sents, refs_sents, tokenizer=tokenizer, lowercase=lowercase, normalization_cache=normalization_cache
+        )
 
     if "bertscore" in metrics:
         from easse.bertscore import corpus_bertscore  # Inline import to use EASSE without installing all dependencies
@@ -231,7 +331,9 @@ def evaluate_system_output(
             metrics_scores["bertscore_precision"],
             metrics_scores["bertscore_recall"],
             metrics_scores["bertscore_f1"],
-        ) = corpus_bertscore(sys_sents, refs_sents, tokenizer=tokenizer, lowercase=lowercase)
+        ) = corpus_bertscore(
+            sys_sents, refs_sents, tokenizer=tokenizer, lowercase=lowercase, normalization_cache=normalization_cache
+        )
 
     if analysis:
         from easse.annotation.word_level import (
@@ -245,7 +347,7 @@ def evaluate_system_output(
 
     if quality_estimation:
         metrics_scores["quality_estimation"] = corpus_quality_estimation(
-            orig_sents, sys_sents, tokenizer=tokenizer, lowercase=lowercase
+            orig_sents, sys_sents, tokenizer=tokenizer, lowercase=lowercase, normalization_cache=normalization_cache
         )
 
     return metrics_scores
@@ -268,6 +370,24 @@ def evaluate_system_output(
     default="easse_report.html",
     help="Path to the output HTML report.",
 )
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    default=1,
+    help="Number of processes used to score the systems and baselines (BERTScore stays single-process).",
+)
+@click.option(
+    "--workspace_dir",
+    type=click.Path(),
+    default=None,
+    help="Directory caching the scores of each system, only new or changed systems are scored.",
+)
+@click.option(
+    "--scalable",
+    is_flag=True,
+    help="Write the report section by section with pre-binned plots, for large test sets.",
+)
 def _report(*args, **kwargs):
     kwargs["metrics"] = kwargs.pop("metrics").split(",")
     if kwargs["sys_sents_path"] is not None and len(kwargs["sys_sents_path"].split(",")) > 1:
@@ -287,6 +407,9 @@ def report(
     tokenizer="13a",
     lowercase=True,
     metrics=DEFAULT_METRICS,
+    jobs=1,
+    workspace_dir=None,
+    scalable=False,
 ):
     """
     Create a HTML report file with automatic metrics, plots and samples.
@@ -302,6 +425,9 @@ def report(
         lowercase=lowercase,
         tokenizer=tokenizer,
         metrics=metrics,
+        jobs=jobs,
+        workspace_dir=workspace_dir,
+        scalable=scalable,
     )
 
 
@@ -315,6 +441,9 @@ def multiple_systems_report(
     lowercase=True,
     metrics=DEFAULT_METRICS,
     system_names=None,
+    jobs=1,
+    workspace_dir=None,
+    scalable=False,
 ):
     """
     Create a HTML report file comparing multiple systems with automatic metrics, plots and samples.
@@ -333,4 +462,87 @@ def multiple_systems_report(
         lowercase=lowercase,
         tokenizer=tokenizer,
         metrics=metrics,
+        jobs=jobs,
+        workspace_dir=workspace_dir,
+        scalable=scalable,
+    )
+
+
+@cli.command("significance")
+@test_set_options
+@click.option(
+    "--metrics",
+    "-m",
+    type=str,
+    default=",".join(SIGNIFICANCE_METRICS),
+    help=f'Comma-separated list of metrics to compare. Valid: {",".join(SIGNIFICANCE_METRICS)}',
+)
+@click.option(
+    "--sys_sents_paths",
+    "-i",
+    type=str,
+    required=True,
+    help="Comma-separated list of paths to the system outputs to compare. The first system is the baseline.",
+)
+@click.option(
+    "--method",
+    type=click.Choice(["bootstrap", "ar"]),
+    default="bootstrap",
+    help="Paired bootstrap resampling or approximate randomization for the p-values.",
+)
+@click.option(
+    "--n_resamples",
+    type=int,
+    default=1000,
+    help="Number of resampled corpora (bootstrap) or of random swaps (approximate randomization).",
+)
+@click.option(
+    "--confidence",
+    type=float,
+    default=0.95,
+    help="Confidence level of the bootstrap confidence intervals.",
+)
+@click.option(
+    "--seed",
+    type=int,
+    default=1234,
+    help="Random seed.",
+)
+def _significance(*args, **kwargs):
+    kwargs["metrics"] = kwargs.pop("metrics").split(",")
+    kwargs["sys_sents_paths"] = kwargs.pop("sys_sents_paths").split(",")
+    significance_scores = significance(*args, **kwargs)
+    system_names = [Path(path).name for path in kwargs["sys_sents_paths"]]
+    print(format_significance_scores(significance_scores, system_names, confidence=kwargs["confidence"]))
+
+
+def significance(
+    test_set,
+    sys_sents_paths,
+    orig_sents_path=None,
+    refs_sents_paths=None,
+    tokenizer="13a",
+    lowercase=True,
+    metrics=SIGNIFICANCE_METRICS,
+    method="bootstrap",
+    n_resamples=1000,
+    confidence=0.95,
+    seed=1234,
+):
+    """
+    Compare multiple systems with paired significance tests against the first system.
+    """
+    sys_sents_list = [read_lines(path) for path in sys_sents_paths]
+    orig_sents, refs_sents = get_orig_and_refs_sents(test_set, orig_sents_path, refs_sents_paths)
+    return get_significance_scores(
+        orig_sents,
+        sys_sents_list,
+        refs_sents,
+        metrics=metrics,
+        method=method,
+        n_resamples=n_resamples,
+        confidence=confidence,
+        seed=seed,
+        lowercase=lowercase,
+        tokenizer=tokenizer,
     )
@@ -6,12 +6,20 @@ import easse.utils.preprocessing as utils_prep
 from easse.sari import compute_precision_recall_f1
 
 
-def corpus_f1_token(sys_sents: List[str], refs_sents: List[List[str]], lowercase: bool = True, tokenizer: str = '13a'):
+def get_sentence_f1_token_scores(
+    sys_sents: List[str],
+    refs_sents: List[List[str]],
+    lowercase: bool = True,
+    tokenizer: str = '13a',
+    normalization_cache: utils_prep.NormalizationCache = None,
+):
     def find_correct_tokens(sys_tokens, ref_tokens):
         return list((Counter(sys_tokens) & Counter(ref_tokens)).elements())
 
-    sys_sents = [utils_prep.normalize(sent, lowercase, tokenizer) for sent in sys_sents]
-    refs_sents = [[utils_prep.normalize(sent, lowercase, tokenizer) for sent in ref_sents] for ref_sents in refs_sents]
+    sys_sents = utils_prep.normalize_many(sys_sents, lowercase, tokenizer, cache=normalization_cache)
+    refs_sents = [
+        utils_prep.normalize_many(ref_sents, lowercase, tokenizer, cache=normalization_cache) for ref_sents in refs_sents
+    ]
 
     f1_token_scores = []
     for sys_sent, *ref_sents in zip(sys_sents, *refs_sents):
@@ -29,4 +37,17 @@ def corpus_f1_token(sys_sents: List[str], refs_sents: List[List[str]], lowercase
 
         f1_token_scores.append(np.max(candidate_f1_token_scores))
 
+    return f1_token_scores
+
+
+def corpus_f1_token(
+    sys_sents: List[str],
+    refs_sents: List[List[str]],
+    lowercase: bool = True,
+    tokenizer: str = '13a',
+    normalization_cache: utils_prep.NormalizationCache = None,
+):
+    f1_token_scores = get_sentence_f1_token_scores(
+        sys_sents, refs_sents, lowercase=lowercase, tokenizer=tokenizer, normalization_cache=normalization_cache
+    )
     return 100.0 * np.mean(f1_token_scores)
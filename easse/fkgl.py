@@ -1,13 +1,54 @@
 from typing import List
+import itertools
 
-from easse.utils.preprocessing import normalize
+import numpy as np
+
+from easse.utils.preprocessing import normalize_many, NormalizationCache
 from easse.utils.text import (
     to_sentences,
+    to_sentences_many,
+    to_words,
     count_words,
     count_syllables_in_sentence,
+    count_syllables_in_words,
 )
 
 
+def count_fkgl_stats(texts: List[str], pool=None):
+    """
+    Returns the number of words, syllables and sentences of each text as an array of shape (n_texts, 3).
+    The syllables of each distinct word of the corpus are only counted once, optionally with a worker pool.
+    """
+    sentences_per_text = to_sentences_many(texts)
+    words_per_text = [[word for sentence in sentences for word in to_words(sentence)] for sentences in sentences_per_text]
+    syllables_per_word = count_syllables_in_words(itertools.chain.from_iterable(words_per_text), pool=pool)
+    stats = [
+        (len(words), sum(map(syllables_per_word.__getitem__, words)), len(sentences))
+        for words, sentences in zip(words_per_text, sentences_per_text)
+    ]
+    return np.array(stats, dtype=np.int64).reshape(-1, 3)
+
+
+def get_sentence_fkgl_stats(
+    sentences: List[str], tokenizer: str = "13a", normalization_cache: NormalizationCache = None, pool=None
+):
+    """Same as count_fkgl_stats() on normalized sentences. Stats of several samples (e.g. a document or a bin of
+    samples) are summed to compute their FKGL with fkgl_from_stats()."""
+    return count_fkgl_stats(normalize_many(sentences, tokenizer=tokenizer, cache=normalization_cache), pool=pool)
+
+
+def fkgl_from_stats(stats):
+    """stats: number of words, syllables and sentences, e.g. summed over the rows of get_sentence_fkgl_stats()."""
+    nb_words, nb_syllables, nb_sentences = (int(value) for value in stats)
+    # Flesch-Kincaid grade level
+    if nb_sentences == 0 or nb_words == 0:
+        return 0
+    return max(
+        0,
+        0.39 * (nb_words / nb_sentences) + 11.8 * (nb_syllables / nb_words) - 15.59,
+    )
+
+
 class FKGLScorer:
     "https://en.wikipedia.org/wiki/Flesch%E2%80%93Kincaid_readability_tests"
 
@@ -22,18 +63,25 @@ class FKGLScorer:
             self.nb_syllables += count_syllables_in_sentence(sentence)
             self.nb_sentences += 1
 
+    def add_many(self, texts: List[str], pool=None):
+        self.add_stats(count_fkgl_stats(texts, pool=pool).sum(axis=0))
+
+    def add_stats(self, stats):
+        nb_words, nb_syllables, nb_sentences = (int(value) for value in stats)
+        self.nb_words += nb_words
+        self.nb_syllables += nb_syllables
+        self.nb_sentences += nb_sentences
+
+    def merge(self, other: "FKGLScorer"):
+        """Adds the counts of another scorer, e.g. computed on another part of the corpus."""
+        self.add_stats((other.nb_words, other.nb_syllables, other.nb_sentences))
+
     def score(self):
-        # Flesch-Kincaid grade level
-        if self.nb_sentences == 0 or self.nb_words == 0:
-            return 0
-        return max(
-            0,
-            0.39 * (self.nb_words / self.nb_sentences) + 11.8 * (self.nb_syllables / self.nb_words) - 15.59,
-        )
-
-
-def corpus_fkgl(sentences: List[str], tokenizer: str = "13a"):
-    scorer = FKGLScorer()
-    for sentence in sentences:
-        scorer.add(normalize(sentence, tokenizer=tokenizer))
-    return scorer.score()
+        return fkgl_from_stats((self.nb_words, self.nb_syllables, self.nb_sentences))
+
+
+def corpus_fkgl(
+    sentences: List[str], tokenizer: str = "13a", normalization_cache: NormalizationCache = None, pool=None
+):
+    stats = get_sentence_fkgl_stats(sentences, tokenizer=tokenizer, normalization_cache=normalization_cache, pool=pool)
+    return fkgl_from_stats(stats.sum(axis=0))
@@ -0,0 +1,101 @@
+"""
+Multi-process scoring: the corpus is split in shards that are scored in a process pool. Each shard returns mergeable
+statistics (integer counts and sentence-level scores) which are reduced to exactly the same scores as the serial path.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+import numpy as np
+
+from easse.bleu import bleu_from_stats
+from easse.fkgl import FKGLScorer
+from easse.sari import get_sari_operation_scores_from_stats
+from easse.streaming import get_chunk_stats
+from easse.utils.constants import DEFAULT_METRICS, MERGEABLE_METRICS
+
+
+def _reduce_shards_stats(shards_stats, metrics: List[str], quality_estimation: bool):
+    metrics_scores = {}
+    if 'bleu' in metrics:
+        metrics_scores['bleu'] = bleu_from_stats(np.sum([shard_stats['bleu'] for shard_stats in shards_stats], axis=0))
+    if 'sent_bleu' in metrics:
+        metrics_scores['sent_bleu'] = np.mean(
+            [score for shard_stats in shards_stats for score in shard_stats['sent_bleu']]
+        )
+    if 'sari' in metrics or 'sari_by_operation' in metrics:
+        sari_operation_scores = get_sari_operation_scores_from_stats(
+            np.sum([shard_stats['sari'] for shard_stats in shards_stats], axis=0)
+        )
+        if 'sari' in metrics:
+            metrics_scores['sari'] = sum(sari_operation_scores) / 3
+        if 'sari_by_operation' in metrics:
+            metrics_scores['sari_add'], metrics_scores['sari_keep'], metrics_scores['sari_del'] = sari_operation_scores
+    if 'sari_legacy' in metrics:
+        sari_legacy_stats = np.sum([shard_stats['sari_legacy'] for shard_stats in shards_stats], axis=0)
+        metrics_scores['sari_legacy'] = sum(get_sari_operation_scores_from_stats(sari_legacy_stats)) / 3
+    if 'fkgl' in metrics:
+        fkgl_scorer = FKGLScorer()
+        for shard_stats in shards_stats:
+            fkgl_scorer.merge(shard_stats['fkgl'])
+        metrics_scores['fkgl'] = fkgl_scorer.score()
+    if 'f1_token' in metrics:
+        metrics_scores['f1_token'] = 100.0 * np.mean(
+            [score for shard_stats in shards_stats for score in shard_stats['f1_token']]
+        )
+    if quality_estimation:
+        feature_names = shards_stats[0]['quality_estimation'].keys()
+        # Values are summed in the same order as in corpus_quality_estimation()
+        features = {
+            name: [value for shard_stats in shards_stats for value in shard_stats['quality_estimation'][name]]
+            for name in feature_names
+        }
+        metrics_scores['quality_estimation'] = {name: sum(values) / len(values) for name, values in features.items()}
+    return metrics_scores
+
+
+def corpus_scores_parallel(
+    orig_sents: List[str],
+    sys_sents: List[str],
+    refs_sents: List[List[str]],
+    metrics: List[str] = DEFAULT_METRICS,
+    lowercase: bool = True,
+    tokenizer: str = '13a',
+    quality_estimation: bool = False,
+    jobs: int = 1,
+    n_shards: int = None,
+):
+    """
+    Computes the metrics of MERGEABLE_METRICS on shards of the corpus with `jobs` processes, with the same keys as
+    easse.cli.evaluate_system_output(). Scores are identical to the ones computed in a single process.
+    n_shards: Number of contiguous shards, several per process by default to balance the load.
+    """
+    for metric in metrics:
+        assert (
+            metric in MERGEABLE_METRICS
+        ), f'"{metric}" can\'t be computed in parallel. Choose among: {MERGEABLE_METRICS}'
+    assert all(
+        len(ref_sents) == len(sys_sents) for ref_sents in refs_sents
+    ), "Reference sentences don't have the shape (n_references, n_samples)"
+    if n_shards is None:
+        n_shards = 4 * jobs
+    shard_size = max(-(-len(sys_sents) // n_shards), 1)
+    starts = range(0, max(len(sys_sents), 1), shard_size)
+    shards_args = [
+        (
+            orig_sents[start : start + shard_size],
+            sys_sents[start : start + shard_size],
+            [ref_sents[start : start + shard_size] for ref_sents in refs_sents],
+            metrics,
+            lowercase,
+            tokenizer,
+            quality_estimation,
+        )
+        for start in starts
+    ]
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            # map() keeps the order of the shards
+            shards_stats = list(executor.map(get_chunk_stats, *zip(*shards_args)))
+    else:
+        shards_stats = [get_chunk_stats(*shard_args) for shard_args in shards_args]
+    return _reduce_shards_stats(shards_stats, metrics, quality_estimation)
@@ -11,31 +11,76 @@ from tseval.feature_extraction import (
     wrap_single_sentence_vectorizer,
 )
 
-from easse.utils.preprocessing import normalize
+from easse.utils.preprocessing import normalize_many, NormalizationCache
 
 
-def get_average(vectorizer, orig_sentences, sys_sentences):
+def get_sum(vectorizer, orig_sentences, sys_sentences):
     cumsum = 0
     count = 0
     for orig_sentence, sys_sentence in zip(orig_sentences, sys_sentences):
         cumsum += vectorizer(orig_sentence, sys_sentence)
         count += 1
+    return cumsum, count
+
+
+def get_average(vectorizer, orig_sentences, sys_sentences):
+    cumsum, count = get_sum(vectorizer, orig_sentences, sys_sentences)
     return cumsum / count
 
 
-def corpus_quality_estimation(
-    orig_sentences: List[str], sys_sentences: List[str], lowercase: bool = False, tokenizer: str = '13a'
+def get_quality_estimation_vectorizers():
+    return {
+        'Compression ratio': get_compression_ratio,
+        'Sentence splits': count_sentence_splits,
+        'Levenshtein similarity': get_levenshtein_similarity,
+        'Exact copies': is_exact_match,
+        'Additions proportion': get_additions_proportion,
+        'Deletions proportion': get_deletions_proportion,
+        'Lexical complexity score': wrap_single_sentence_vectorizer(get_wordrank_score),
+    }
+
+
+def get_quality_estimation_sums(
+    orig_sentences: List[str],
+    sys_sentences: List[str],
+    lowercase: bool = False,
+    tokenizer: str = '13a',
+    normalization_cache: NormalizationCache = None,
 ):
-    orig_sentences = [normalize(sent, lowercase, tokenizer) for sent in orig_sentences]
-    sys_sentences = [normalize(sent, lowercase, tokenizer) for sent in sys_sentences]
+    """Returns the sum of each feature and the number of samples, so that averages can be accumulated by chunks."""
+    orig_sentences = normalize_many(orig_sentences, lowercase, tokenizer, cache=normalization_cache)
+    sys_sentences = normalize_many(sys_sentences, lowercase, tokenizer, cache=normalization_cache)
+    sums = {
+        name: get_sum(vectorizer, orig_sentences, sys_sentences)[0]
+        for name, vectorizer in get_quality_estimation_vectorizers().items()
+    }
+    return sums, min(len(orig_sentences), len(sys_sentences))
+
+
+def get_sentence_quality_estimation_features(
+    orig_sentences: List[str],
+    sys_sentences: List[str],
+    lowercase: bool = False,
+    tokenizer: str = '13a',
+    normalization_cache: NormalizationCache = None,
+):
+    """Returns the value of each feature for each sample, {feature_name: [value for each sample]}."""
+    orig_sentences = normalize_many(orig_sentences, lowercase, tokenizer, cache=normalization_cache)
+    sys_sentences = normalize_many(sys_sentences, lowercase, tokenizer, cache=normalization_cache)
     return {
-        'Compression ratio': get_average(get_compression_ratio, orig_sentences, sys_sentences),
-        'Sentence splits': get_average(count_sentence_splits, orig_sentences, sys_sentences),
-        'Levenshtein similarity': get_average(get_levenshtein_similarity, orig_sentences, sys_sentences),
-        'Exact copies': get_average(is_exact_match, orig_sentences, sys_sentences),
-        'Additions proportion': get_average(get_additions_proportion, orig_sentences, sys_sentences),
-        'Deletions proportion': get_average(get_deletions_proportion, orig_sentences, sys_sentences),
-        'Lexical complexity score': get_average(
-            wrap_single_sentence_vectorizer(get_wordrank_score), orig_sentences, sys_sentences
-        ),
+        name: [vectorizer(orig_sentence, sys_sentence) for orig_sentence, sys_sentence in zip(orig_sentences, sys_sentences)]
+        for name, vectorizer in get_quality_estimation_vectorizers().items()
     }
+
+
+def corpus_quality_estimation(
+    orig_sentences: List[str],
+    sys_sentences: List[str],
+    lowercase: bool = False,
+    tokenizer: str = '13a',
+    normalization_cache: NormalizationCache = None,
+):
+    sums, count = get_quality_estimation_sums(
+        orig_sentences, sys_sentences, lowercase=lowercase, tokenizer=tokenizer, normalization_cache=normalization_cache
+    )
+    return {name: cumsum / count for name, cumsum in sums.items()}
@@ -1,51 +1,309 @@
 from collections import OrderedDict
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
 from uuid import uuid4
 import html
+import os
 
 import numpy as np
 import pandas as pd
 import plotly.express as px
-from sacrebleu import corpus_bleu
-from tseval.feature_extraction import get_levenshtein_similarity, get_compression_ratio, count_sentences
+import plotly.graph_objects as go
+from tseval.feature_extraction import get_levenshtein_similarity, get_compression_ratio
 from yattag import Doc, indent
 
-from easse.fkgl import corpus_fkgl
-from easse.quality_estimation import corpus_quality_estimation
-from easse.sari import corpus_sari
+from easse.bleu import get_bleu_scorer_with_references, get_sentence_bleu_stats, bleu_from_stats
+from easse.fkgl import get_sentence_fkgl_stats, fkgl_from_stats
+from easse.quality_estimation import get_sentence_quality_estimation_features, get_quality_estimation_vectorizers
+from easse.sari import get_sentence_sari_stats, get_sentence_sari_scores, sari_from_stats
+from easse.utils.cache import get_content_hash
 from easse.utils.constants import DEFAULT_METRICS
-from easse.utils.helpers import add_dicts
-from easse.utils.text import to_words, count_words
+from easse.utils.helpers import get_smallest_indexes
+from easse.utils.preprocessing import NormalizationCache
+from easse.utils.text import to_words, count_words, to_sentences_many
 from easse.annotation.lcs import get_lcs
 
+QUALITY_ESTIMATION_FEATURES = list(get_quality_estimation_vectorizers().keys())
+# Saved tables of a previous version are not reused when the content of the tables changes
+SENTENCE_SCORES_TABLE_VERSION = 1
 
-def get_all_scores(
+
+class SentenceScoresTable:
+    '''
+    Statistics and features of each sample of a system output, as numpy arrays with one row per sample.
+    The scores of the corpus or of any subset of samples (e.g. a length bin) are aggregations of the rows and sentence
+    level sort keys are views of the columns, so that the metrics are computed only once per report.
+    Columns:
+        bleu_stats, sari_stats, fkgl_stats: Summable statistics of each metric (see get_sentence_*_stats())
+        samsa: SAMSA of each sample
+        bertscore: BERTScore (precision, recall, f1) of each sample
+        quality_estimation: Quality estimation features of each sample, in the order of QUALITY_ESTIMATION_FEATURES
+        sentence_sari: SARI of each sample
+        compression_ratio, levenshtein_similarity, sentence_splits: Features of the raw sentences used to sort samples
+    '''
+
+    def __init__(self, columns: Dict[str, np.ndarray], metrics: List[str] = DEFAULT_METRICS):
+        self.columns = columns
+        self.metrics = metrics
+
+    def __len__(self):
+        return len(self.columns['sentence_sari'])
+
+    def __getitem__(self, column_name):
+        return self.columns[column_name]
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written to a temporary file first so that an interrupted run never leaves a partial table
+        temp_path = path.with_name(f'{path.stem}.{os.getpid()}.tmp')
+        with open(temp_path, 'wb') as f:
+            np.savez(f, metrics=np.array(self.metrics, dtype=str), **self.columns)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def load(path: Path):
+        with np.load(path, allow_pickle=False) as data:
+            columns = {name: data[name] for name in data.files if name != 'metrics'}
+            return SentenceScoresTable(columns, data['metrics'].tolist())
+
+    def get_scores(self, indexes=None):
+        '''Same scores as computing the metrics on the samples of indexes (all samples if None)'''
+        columns = self.columns
+        if indexes is not None:
+            columns = {name: column[indexes] for name, column in columns.items()}
+        scores = OrderedDict()
+        if 'bleu' in self.metrics:
+            scores['BLEU'] = bleu_from_stats(columns['bleu_stats'])
+        if 'sari' in self.metrics:
+            scores['SARI'] = sari_from_stats(columns['sari_stats'])
+        if 'samsa' in self.metrics:
+            scores['SAMSA'] = np.mean(columns['samsa'])
+        if 'fkgl' in self.metrics:
+            scores['FKGL'] = fkgl_from_stats(columns['fkgl_stats'].sum(axis=0))
+        if 'bertscore' in self.metrics:
+            # Inline import to use EASSE without installing all dependencies
+            from easse.bertscore import bertscore_from_sentence_scores
+
+            scores['BERTScore P'], scores['BERTScore R'], scores['BERTScore F1'] = bertscore_from_sentence_scores(
+                columns['bertscore']
+            )
+        for feature_name, values in zip(QUALITY_ESTIMATION_FEATURES, columns['quality_estimation'].T):
+            # Summed in the same order as corpus_quality_estimation()
+            scores[feature_name] = sum(values.tolist()) / len(values)
+        return {key: round(value, 2) for key, value in scores.items()}
+
+
+def get_sentence_scores_table(
     orig_sents: List[str],
     sys_sents: List[str],
     refs_sents: List[List[str]],
     lowercase: bool = False,
     tokenizer: str = '13a',
     metrics: List[str] = DEFAULT_METRICS,
+    normalization_cache: NormalizationCache = None,
+    bertscore_sentence_scores: np.ndarray = None,
+    bleu_scorer=None,
 ):
-    scores = OrderedDict()
+    '''
+    bertscore_sentence_scores: Precomputed sentence BERTScores of these samples to avoid running the model again
+    bleu_scorer: Scorer of easse.bleu.get_bleu_scorer_with_references() built with refs_sents and the same options
+    '''
+    if normalization_cache is None:
+        normalization_cache = NormalizationCache()
+    kwargs = {'lowercase': lowercase, 'tokenizer': tokenizer, 'normalization_cache': normalization_cache}
+    columns = {}
     if 'bleu' in metrics:
-        scores['BLEU'] = corpus_bleu(sys_sents, refs_sents, force=True, tokenize=tokenizer, lowercase=lowercase).score
-    if 'sari' in metrics:
-        scores['SARI'] = corpus_sari(orig_sents, sys_sents, refs_sents, tokenizer=tokenizer, lowercase=lowercase)
+        columns['bleu_stats'] = get_sentence_bleu_stats(sys_sents, refs_sents, bleu_scorer=bleu_scorer, **kwargs)
+    # Always computed to sort the qualitative examples
+    columns['sari_stats'] = get_sentence_sari_stats(orig_sents, sys_sents, refs_sents, **kwargs)
+    columns['sentence_sari'] = np.array([sari_from_stats(stats) for stats in columns['sari_stats']], dtype=float)
     if 'samsa' in metrics:
-        from easse.samsa import corpus_samsa
+        from easse.samsa import get_samsa_sentence_scores
 
-        scores['SAMSA'] = corpus_samsa(orig_sents, sys_sents, tokenizer=tokenizer, verbose=True, lowercase=lowercase)
+        columns['samsa'] = np.array(get_samsa_sentence_scores(orig_sents, sys_sents, verbose=True, **kwargs))
     if 'fkgl' in metrics:
-        scores['FKGL'] = corpus_fkgl(sys_sents, tokenizer=tokenizer)
-    quality_estimation_scores = corpus_quality_estimation(
-        orig_sents, sys_sents, tokenizer=tokenizer, lowercase=lowercase
+        # Same normalization as corpus_fkgl()
+        columns['fkgl_stats'] = get_sentence_fkgl_stats(
+            sys_sents, tokenizer=tokenizer, normalization_cache=normalization_cache
+        )
+    if 'bertscore' in metrics:
+        if bertscore_sentence_scores is None:
+            # Inline import to use EASSE without installing all dependencies
+            from easse.bertscore import corpus_bertscore_with_sentence_scores
+
+            _, bertscore_sentence_scores = corpus_bertscore_with_sentence_scores(sys_sents, refs_sents, **kwargs)
+        columns['bertscore'] = np.asarray(bertscore_sentence_scores)
+    quality_estimation_features = get_sentence_quality_estimation_features(orig_sents, sys_sents, **kwargs)
+    columns['quality_estimation'] = np.array(
+        [quality_estimation_features[feature_name] for feature_name in QUALITY_ESTIMATION_FEATURES], dtype=float
+    ).T.reshape(-1, len(QUALITY_ESTIMATION_FEATURES))
+    columns.update(get_raw_features(orig_sents, sys_sents))
+    return SentenceScoresTable(columns, metrics)
+
+
+def get_raw_features(orig_sents: List[str], sys_sents: List[str]):
+    '''Features of the raw sentences displayed in the plots and used to sort the qualitative examples'''
+    return {
+        'compression_ratio': np.array(
+            [get_compression_ratio(orig_sent, sys_sent) for orig_sent, sys_sent in zip(orig_sents, sys_sents)],
+            dtype=float,
+        ),
+        'levenshtein_similarity': np.array(
+            [get_levenshtein_similarity(orig_sent, sys_sent) for orig_sent, sys_sent in zip(orig_sents, sys_sents)],
+            dtype=float,
+        ),
+        'sentence_splits': np.array(
+            [
+                len(sys_sentences) - len(orig_sentences)
+                for orig_sentences, sys_sentences in zip(to_sentences_many(orig_sents), to_sentences_many(sys_sents))
+            ],
+            dtype=np.int64,
+        ),
+    }
+
+
+# Inputs shared by all the systems scored in a worker process, see get_sentence_scores_tables()
+_scores_table_worker_inputs = {}
+
+
+def _init_scores_table_worker(orig_sents, refs_sents, lowercase, tokenizer, metrics, normalization_cache, bleu_scorer):
+    _scores_table_worker_inputs.update(
+        orig_sents=orig_sents,
+        refs_sents=refs_sents,
+        lowercase=lowercase,
+        tokenizer=tokenizer,
+        metrics=metrics,
+        normalization_cache=normalization_cache,
+        bleu_scorer=bleu_scorer,
+    )
+
+
+def _get_worker_sentence_scores_table(sys_sents, bertscore_sentence_scores=None):
+    inputs = _scores_table_worker_inputs
+    return get_sentence_scores_table(
+        inputs['orig_sents'],
+        sys_sents,
+        inputs['refs_sents'],
+        lowercase=inputs['lowercase'],
+        tokenizer=inputs['tokenizer'],
+        metrics=inputs['metrics'],
+        normalization_cache=inputs['normalization_cache'],
+        bleu_scorer=inputs['bleu_scorer'],
+        bertscore_sentence_scores=bertscore_sentence_scores,
+    )
+
+
+def get_sentence_scores_tables(
+    orig_sents: List[str],
+    sys_sents_list: List[List[str]],
+    refs_sents: List[List[str]],
+    lowercase: bool = False,
+    tokenizer: str = '13a',
+    metrics: List[str] = DEFAULT_METRICS,
+    normalization_cache: NormalizationCache = None,
+    jobs: int = 1,
+    workspace_dir: Path = None,
+):
+    '''
+    Returns the SentenceScoresTable of each system output, identical to the ones of get_sentence_scores_table().
+    The orig and reference sentences are normalized and the BLEU reference n-grams are extracted only once for all
+    systems, then the systems are scored in `jobs` processes. BERTScore is computed in this process to load the model
+    only once.
+    workspace_dir: Directory where the tables are saved, keyed by the hash of the sentences and scoring options.
+    Only the systems without a saved table are scored, e.g. a new checkpoint added to an existing comparison.
+    '''
+    if workspace_dir is None:
+        return _compute_sentence_scores_tables(
+            orig_sents, sys_sents_list, refs_sents, lowercase, tokenizer, metrics, normalization_cache, jobs
+        )
+    inputs_hash = get_content_hash(
+        SENTENCE_SCORES_TABLE_VERSION, orig_sents, refs_sents, lowercase, tokenizer, sorted(metrics)
     )
-    scores = add_dicts(
-        scores,
-        quality_estimation_scores,
+    paths = [
+        Path(workspace_dir) / f'{get_content_hash(inputs_hash, sys_sents)}.npz' for sys_sents in sys_sents_list
+    ]
+    tables = [SentenceScoresTable.load(path) if path.exists() else None for path in paths]
+    missing_indexes = [i for i, table in enumerate(tables) if table is None]
+    missing_tables = _compute_sentence_scores_tables(
+        orig_sents,
+        [sys_sents_list[i] for i in missing_indexes],
+        refs_sents,
+        lowercase,
+        tokenizer,
+        metrics,
+        normalization_cache,
+        jobs,
     )
-    return {key: round(value, 2) for key, value in scores.items()}
+    for i, table in zip(missing_indexes, missing_tables):
+        table.save(paths[i])
+        tables[i] = table
+    return tables
+
+
+def _compute_sentence_scores_tables(
+    orig_sents, sys_sents_list, refs_sents, lowercase, tokenizer, metrics, normalization_cache, jobs
+):
+    if len(sys_sents_list) == 0:
+        return []
+    if normalization_cache is None:
+        normalization_cache = NormalizationCache()
+    for sents in [orig_sents, *refs_sents]:
+        normalization_cache.normalize_many(sents, lowercase, tokenizer)
+    bleu_scorer = None
+    if 'bleu' in metrics:
+        bleu_scorer = get_bleu_scorer_with_references(
+            refs_sents, lowercase=lowercase, tokenizer=tokenizer, normalization_cache=normalization_cache
+        )
+    bertscores_list = [None] * len(sys_sents_list)
+    if 'bertscore' in metrics:
+        # Inline import to use EASSE without installing all dependencies
+        from easse.bertscore import corpus_bertscore_with_sentence_scores
+
+        bertscores_list = [
+            corpus_bertscore_with_sentence_scores(
+                sys_sents,
+                refs_sents,
+                lowercase=lowercase,
+                tokenizer=tokenizer,
+                normalization_cache=normalization_cache,
+            )[1]
+            for sys_sents in sys_sents_list
+        ]
+    worker_inputs = (orig_sents, refs_sents, lowercase, tokenizer, metrics, normalization_cache, bleu_scorer)
+    if jobs > 1:
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_scores_table_worker, initargs=worker_inputs
+        ) as executor:
+            # map() keeps the order of the systems
+            return list(executor.map(_get_worker_sentence_scores_table, sys_sents_list, bertscores_list))
+    _init_scores_table_worker(*worker_inputs)
+    try:
+        return list(map(_get_worker_sentence_scores_table, sys_sents_list, bertscores_list))
+    finally:
+        _scores_table_worker_inputs.clear()
+
+
+def get_all_scores(
+    orig_sents: List[str],
+    sys_sents: List[str],
+    refs_sents: List[List[str]],
+    lowercase: bool = False,
+    tokenizer: str = '13a',
+    metrics: List[str] = DEFAULT_METRICS,
+    bertscore_sentence_scores: np.ndarray = None,
+):
+    '''bertscore_sentence_scores: Precomputed sentence BERTScores of these samples to avoid running the model again'''
+    return get_sentence_scores_table(
+        orig_sents,
+        sys_sents,
+        refs_sents,
+        lowercase=lowercase,
+        tokenizer=tokenizer,
+        metrics=metrics,
+        bertscore_sentence_scores=bertscore_sentence_scores,
+    ).get_scores()
 
 
 def make_differing_words_bold(orig_sent, sys_sent, make_bold):
@@ -85,43 +343,66 @@ def get_random_html_id():
     return 'a' + html_id[1:]  # HTML id can't start with a number
 
 
-def get_qualitative_examples_html(orig_sents, sys_sents, refs_sents):
+def get_qualitative_examples_html(orig_sents, sys_sents, refs_sents, sentence_scores_table=None, n_samples=50):
+    '''
+    sentence_scores_table: Precomputed SentenceScoresTable of the samples, the sort keys are read from it
+    n_samples: Number of samples displayed for each sort key
+    '''
+    if sentence_scores_table is None:
+        sentence_scores_table = get_sentence_scores_table(
+            orig_sents, sys_sents, refs_sents, lowercase=True, metrics=[]
+        )
+    sentence_saris = sentence_scores_table['sentence_sari']
+    compression_ratios = sentence_scores_table['compression_ratio']
+    levenshtein_similarities = sentence_scores_table['levenshtein_similarity']
+    sentence_splits = sentence_scores_table['sentence_splits']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        paraphrasing_values = levenshtein_similarities / compression_ratios
+    # Sort keys are evaluated once for all samples, samples with the lowest values are displayed first
     title_key_print = [
-        ('Randomly sampled simplifications', lambda c, s, refs: 0, lambda value: ''),
-        (
-            'Best simplifications according to SARI',
-            lambda c, s, refs: -corpus_sari([c], [s], [[ref] for ref in refs]),
-            lambda value: f'SARI={-value:.2f}',
-        ),
-        (
-            'Worst simplifications according to SARI',
-            lambda c, s, refs: corpus_sari([c], [s], [[ref] for ref in refs]),
-            lambda value: f'SARI={value:.2f}',
-        ),
+        ('Randomly sampled simplifications', np.zeros(len(orig_sents)), lambda value: ''),
+        ('Best simplifications according to SARI', -sentence_saris, lambda value: f'SARI={-value:.2f}'),
+        ('Worst simplifications according to SARI', sentence_saris, lambda value: f'SARI={value:.2f}'),
+    ]
+    if 'bertscore' in sentence_scores_table.columns:
+        sentence_bertscores = sentence_scores_table['bertscore'][:, 2]
+        title_key_print += [
+            (
+                'Best simplifications according to BERTScore',
+                -sentence_bertscores,
+                lambda value: f'BERTScore F1={-value:.2f}',
+            ),
+            (
+                'Worst simplifications according to BERTScore',
+                sentence_bertscores,
+                lambda value: f'BERTScore F1={value:.2f}',
+            ),
+        ]
+    title_key_print += [
         (
             'Simplifications with the most compression',
-            lambda c, s, refs: get_compression_ratio(c, s),
+            compression_ratios,
             lambda value: f'compression_ratio={value:.2f}',
         ),
         (
             'Simplifications with a high amount of paraphrasing',
-            lambda c, s, refs: get_levenshtein_similarity(c, s) / get_compression_ratio(c, s),
+            paraphrasing_values,
             lambda value: f'levenshtein_similarity={value:.2f}',
         ),
         (
             'Simplifications with the most sentence splits (if any)',
-            lambda c, s, refs: -(count_sentences(s) - count_sentences(c)),
+            -sentence_splits,
             lambda value: f'#sentence_splits={-value:.2f}',
         ),
     ]
 
-    def get_one_sample_html(orig_sent, sys_sent, ref_sents, sort_key, print_func):
+    def get_one_sample_html(orig_sent, sys_sent, ref_sents, sort_value, print_func):
         orig_sent, sys_sent, *ref_sents = [html.escape(sent) for sent in [orig_sent, sys_sent, *ref_sents]]
         doc = Doc()
         with doc.tag('div', klass='mb-2 p-1'):
             # Sort key
             with doc.tag('div', klass='text-muted small'):
-                doc.asis(print_func(sort_key(orig_sent, sys_sent, ref_sents)))
+                doc.asis(print_func(sort_value))
             with doc.tag('div', klass='ml-2'):
                 orig_sent_bold, sys_sent_bold = make_differing_words_bold(orig_sent, sys_sent, make_text_bold_html)
                 # Source
@@ -149,24 +430,18 @@ def get_qualitative_examples_html(orig_sents, sys_sents, refs_sents):
         return doc.getvalue()
 
     doc = Doc()
-    for title, sort_key, print_func in title_key_print:
+    for title, sort_values, print_func in title_key_print:
         with doc.tag('div', klass='container-fluid mt-4 p-2 border'):
             collapse_id = get_random_html_id()
             with doc.tag('a', ('data-toggle', 'collapse'), ('href', f'#{collapse_id}')):
                 doc.line('h3', klass='m-2', text_content=title)
             # Now lets print the examples
             # Shapes: orig_sents: n_samples, sys_sents: n_samples, refs_sents: (n_refs, n_sample)
-            sample_generator = sorted(
-                zip(orig_sents, sys_sents, zip(*refs_sents)),
-                key=lambda args: sort_key(*args),
-            )
             # Samples displayed by default
             with doc.tag('div', klass='collapse', id=collapse_id):
-                n_samples = 50
-                for i, (orig_sent, sys_sent, refs) in enumerate(sample_generator):
-                    if i >= n_samples:
-                        break
-                    doc.asis(get_one_sample_html(orig_sent, sys_sent, refs, sort_key, print_func))
+                for i in get_smallest_indexes(sort_values, n_samples):
+                    refs = [ref_sents[i] for ref_sents in refs_sents]
+                    doc.asis(get_one_sample_html(orig_sents[i], sys_sents[i], refs, sort_values[i], print_func))
     return doc.getvalue()
 
 
@@ -182,12 +457,12 @@ def get_test_set_description_html(test_set, orig_sents, refs_sents):
     df.loc[test_set, 'Words / source'] = np.average(np.vectorize(count_words)(orig_sents))
     df.loc[test_set, 'Words / reference'] = np.average(np.vectorize(count_words)(refs_sents.flatten()))
 
-    def modified_count_sentences(sent):
-        return max(count_sentences(sent), 1)
+    def modified_count_sentences(sents):
+        return np.array([max(len(sentences), 1) for sentences in to_sentences_many(sents)])
 
-    orig_sent_counts = np.vectorize(modified_count_sentences)(orig_sents)
+    orig_sent_counts = modified_count_sentences(orig_sents)
     expanded_orig_sent_counts = np.expand_dims(orig_sent_counts, 0).repeat(len(refs_sents), axis=0)
-    refs_sent_counts = np.vectorize(modified_count_sentences)(refs_sents)
+    refs_sent_counts = np.stack([modified_count_sentences(ref_sents) for ref_sents in refs_sents])
     ratio = np.average((expanded_orig_sent_counts == 1) & (refs_sent_counts == 1))
     df.loc[test_set, '1-to-1 alignments*'] = f'{ratio*100:.1f}%'
     ratio = np.average((expanded_orig_sent_counts == 1) & (refs_sent_counts > 1))
@@ -214,12 +489,12 @@ def get_plotly_html(plotly_figure):
     return doc.getvalue()
 
 
-def get_plotly_histogram(orig_sents, sys_sents, ref_sents, feature_extractor, feature_name):
-    '''feature_extractor(orig_sent, sys_sent) -> scalar'''
+def get_plotly_histogram(sys_values, ref_values, feature_name):
+    '''sys_values, ref_values: value of the feature for each system output and reference'''
     data = []
-    for orig_sent, sys_sent, ref_sent in zip(orig_sents, sys_sents, ref_sents):
-        data.append({'Model': 'System output', feature_name: feature_extractor(orig_sent, sys_sent)})
-        data.append({'Model': 'Reference', feature_name: feature_extractor(orig_sent, ref_sent)})
+    for sys_value, ref_value in zip(sys_values, ref_values):
+        data.append({'Model': 'System output', feature_name: sys_value})
+        data.append({'Model': 'Reference', feature_name: ref_value})
     figure = px.histogram(
         pd.DataFrame(data),
         title=feature_name,
@@ -238,16 +513,66 @@ def get_plotly_histogram(orig_sents, sys_sents, ref_sents, feature_extractor, fe
     return figure
 
 
-def get_plots_html(orig_sents, sys_sents, ref_sents):
+def get_plotly_prebinned_histogram(sys_values, ref_values, feature_name, n_bins=100):
+    '''Same histogram as get_plotly_histogram() but the counts are computed here, the size of the figure doesn't depend
+    on the number of samples'''
+    sys_values = np.asarray(sys_values, dtype=float)
+    ref_values = np.asarray(ref_values, dtype=float)
+    sys_values = sys_values[np.isfinite(sys_values)]
+    ref_values = ref_values[np.isfinite(ref_values)]
+    # Same bins for the system output and the reference so that they can be compared
+    bin_edges = np.histogram_bin_edges(np.concatenate([sys_values, ref_values]), bins=n_bins)
+    bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+    figure = go.Figure()
+    for model, values, color in [('System output', sys_values, '#B22222'), ('Reference', ref_values, '#228B22')]:
+        counts, _ = np.histogram(values, bins=bin_edges)
+        # Lists instead of arrays so that the figure is serialized as plain JSON
+        figure.add_bar(
+            x=bin_centers.tolist(),
+            y=counts.tolist(),
+            width=np.diff(bin_edges).tolist(),
+            name=model,
+            marker_color=color,
+            opacity=0.7,
+        )
+    figure.update_layout(
+        title=feature_name,
+        barmode='overlay',
+        width=800,
+        xaxis_title=feature_name,
+        yaxis_title='count',
+        legend_title_text='Model',
+    )
+    figure.layout['hovermode'] = 'x'  # To compare on hover
+    figure.data[-1]['marker']['opacity'] = 0.5  # So that the reference is transparent in front of the system output
+    return figure
+
+
+def get_plots_html(orig_sents, sys_sents, ref_sents, sentence_scores_table=None, prebinned=False):
+    '''
+    sentence_scores_table: Precomputed SentenceScoresTable of the system outputs
+    prebinned: Histograms embed the counts of each bin instead of the value of each sample
+    '''
     doc = Doc()
+    # Feature name: (column of SentenceScoresTable, feature extractor)
     features = {
-        'Compression ratio': get_compression_ratio,
-        'Levenshtein similarity': get_levenshtein_similarity,
+        'Compression ratio': ('compression_ratio', get_compression_ratio),
+        'Levenshtein similarity': ('levenshtein_similarity', get_levenshtein_similarity),
     }
     with doc.tag('div', klass='row'):
-        for feature_name, feature_extractor in features.items():
+        for feature_name, (column_name, feature_extractor) in features.items():
+            if sentence_scores_table is not None:
+                sys_values = sentence_scores_table[column_name].tolist()
+            else:
+                sys_values = [
+                    feature_extractor(orig_sent, sys_sent) for orig_sent, sys_sent in zip(orig_sents, sys_sents)
+                ]
+            ref_values = [feature_extractor(orig_sent, ref_sent) for orig_sent, ref_sent in zip(orig_sents, ref_sents)]
             with doc.tag('div', klass='col-auto shadow-sm p-0 m-2'):
-                figure = get_plotly_histogram(orig_sents, sys_sents, ref_sents, feature_extractor, feature_name)
+                if prebinned:
+                    figure = get_plotly_prebinned_histogram(sys_values, ref_values, feature_name)
+                else:
+                    figure = get_plotly_histogram(sys_values, ref_values, feature_name)
                 doc.asis(get_plotly_html(figure))
     return doc.getvalue()
 
@@ -265,7 +590,10 @@ def get_scores_by_length_html(
     lowercase: bool = False,
     tokenizer: str = '13a',
     metrics: List[str] = DEFAULT_METRICS,
+    sentence_scores_table: SentenceScoresTable = None,
 ):
+    '''sentence_scores_table: Precomputed SentenceScoresTable of the samples, bins aggregate its rows'''
+
     def get_intervals_from_limits(limits):
         return list(zip(limits[:-1], limits[1:]))
 
@@ -286,34 +614,16 @@ def get_scores_by_length_html(
         assert sum([len(b) for b in bins]) == len(sents)
         return bins
 
-    def split_sents_by_bins(sents, bins):
-        sents = np.array(sents)
-        sents_by_bin = []
-        for sent_indexes in bins:
-            sents_by_bin.append(np.array(sents)[sent_indexes].tolist())
-        return sents_by_bin
-
+    if sentence_scores_table is None:
+        sentence_scores_table = get_sentence_scores_table(
+            orig_sents, sys_sents, refs_sents, lowercase=lowercase, tokenizer=tokenizer, metrics=metrics
+        )
     intervals = get_equally_populated_intervals(orig_sents, n_bins)
     bins = split_sents_by_lengths(orig_sents, intervals)
-    # Split files by bins
-    orig_sents_by_bins = split_sents_by_bins(orig_sents, bins)
-    sys_sents_by_bins = split_sents_by_bins(sys_sents, bins)
-    refs_sents_by_bins = [split_sents_by_bins(ref_sents, bins) for ref_sents in refs_sents]
     # Get scores for each bin
     table = []
-    for i in range(len(intervals)):
-        interval = intervals[i]
-        splitted_orig_sents = orig_sents_by_bins[i]
-        splitted_sys_sents = sys_sents_by_bins[i]
-        splitted_refs_sents = [ref_sents_by_bins[i] for ref_sents_by_bins in refs_sents_by_bins]
-        row = get_all_scores(
-            splitted_orig_sents,
-            splitted_sys_sents,
-            splitted_refs_sents,
-            lowercase=lowercase,
-            tokenizer=tokenizer,
-            metrics=metrics,
-        )
+    for interval, sent_indexes in zip(intervals, bins):
+        row = sentence_scores_table.get_scores(sent_indexes)
         row['index'] = f'length=[{interval[0]};{interval[1]}]'
         table.append(row)
     df_bins = pd.DataFrame.from_records(table, index='index')
@@ -368,47 +678,104 @@ def get_table_html(header, rows, row_names=None):
     return doc.getvalue()
 
 
-def get_score_table_html_single_system(orig_sents, sys_sents, refs_sents, lowercase, tokenizer, metrics):
+def get_score_table_html_single_system(
+    orig_sents,
+    sys_sents,
+    refs_sents,
+    lowercase,
+    tokenizer,
+    metrics,
+    sentence_scores_tables=None,
+    jobs: int = 1,
+    workspace_dir: Path = None,
+):
+    '''sentence_scores_tables: Precomputed SentenceScoresTable of the system followed by the ones of the baselines'''
     return get_score_table_html_multiple_systems(
-        orig_sents, [sys_sents], refs_sents, ['System output'], lowercase, tokenizer, metrics
+        orig_sents,
+        [sys_sents],
+        refs_sents,
+        ['System output'],
+        lowercase,
+        tokenizer,
+        metrics,
+        sentence_scores_tables=sentence_scores_tables,
+        jobs=jobs,
+        workspace_dir=workspace_dir,
     )
 
 
-def get_score_table_html_multiple_systems(
-    orig_sents, sys_sents_list, refs_sents, system_names, lowercase, tokenizer, metrics
-):
+def get_baselines(orig_sents):
+    '''Returns the outputs of the baselines displayed with the systems, {baseline name: baseline sentences}'''
+
     def truncate(sentence):
         # Take first 80% words
         words = to_words(sentence)
         return ' '.join(words[: int(len(words) * 0.8)]) + '.'
 
+    return {
+        'Identity baseline': orig_sents,
+        'Truncate baseline': [truncate(sentence) for sentence in orig_sents],
+    }
+
+
+def get_score_table_html_multiple_systems(
+    orig_sents,
+    sys_sents_list,
+    refs_sents,
+    system_names,
+    lowercase,
+    tokenizer,
+    metrics,
+    sentence_scores_tables=None,
+    jobs: int = 1,
+    workspace_dir: Path = None,
+):
+    '''
+    sentence_scores_tables: Precomputed SentenceScoresTable of each system followed by the ones of the baselines, the
+    missing ones (None or beyond the end of the list) are computed in `jobs` processes.
+    workspace_dir: Directory of saved tables, see get_sentence_scores_tables()
+    '''
     doc = Doc()
     # We don't want changes to propagate out of this scope
     sys_sents_list = sys_sents_list.copy()
     system_names = system_names.copy()
-    # Add the identity baseline
-    sys_sents_list.append(orig_sents)
-    system_names.append('Identity baseline')
-    # Add the truncate baseline
-    sys_sents_list.append([truncate(sentence) for sentence in orig_sents])
-    system_names.append('Truncate baseline')
-    # Evaluate systems
-    sys_scores_list = [
-        get_all_scores(orig_sents, sys_sents, refs_sents, lowercase=lowercase, tokenizer=tokenizer, metrics=metrics)
-        for sys_sents in sys_sents_list
-    ]
+    # Add the baselines
+    for baseline_name, baseline_sents in get_baselines(orig_sents).items():
+        sys_sents_list.append(baseline_sents)
+        system_names.append(baseline_name)
+    sentence_scores_tables = list(sentence_scores_tables or [])
+    sentence_scores_tables += [None] * (len(sys_sents_list) - len(sentence_scores_tables))
+    # Evaluate the systems that were not precomputed, orig and reference sentences are normalized once for all
+    normalization_cache = NormalizationCache()
+    missing_indexes = [i for i, table in enumerate(sentence_scores_tables) if table is None]
+    missing_tables = get_sentence_scores_tables(
+        orig_sents,
+        [sys_sents_list[i] for i in missing_indexes],
+        refs_sents,
+        lowercase=lowercase,
+        tokenizer=tokenizer,
+        metrics=metrics,
+        normalization_cache=normalization_cache,
+        jobs=jobs,
+        workspace_dir=workspace_dir,
+    )
+    for i, sentence_scores_table in zip(missing_indexes, missing_tables):
+        sentence_scores_tables[i] = sentence_scores_table
+    sys_scores_list = [sentence_scores_table.get_scores() for sentence_scores_table in sentence_scores_tables]
     rows = [sys_scores.values() for sys_scores in sys_scores_list]
     if len(refs_sents) > 1:
         # Evaluate the first reference against all the others (the second reference is duplicated to have the same number of reference as for systems).
         # TODO: Ideally the system and references should be evaluated with exactly the same number of references.
-        ref_scores = get_all_scores(
+        ref_scores = get_sentence_scores_tables(
             orig_sents,
-            refs_sents[0],
+            [refs_sents[0]],
             [refs_sents[1]] + refs_sents[1:],
             lowercase=lowercase,
             tokenizer=tokenizer,
             metrics=metrics,
-        )
+            normalization_cache=normalization_cache,
+            workspace_dir=workspace_dir,
+        )[0].get_scores()
         assert all([sys_scores.keys() == ref_scores.keys() for sys_scores in sys_scores_list])
         rows.append(ref_scores.values())
         system_names.append('Reference*')
@@ -429,7 +796,34 @@ def get_score_table_html_multiple_systems(
     return doc.getvalue()
 
 
-def get_html_report(
+def yield_html_report_header(test_set, orig_sents, refs_sents):
+    '''Yields the beginning of a report, until the test set description'''
+    yield '<!doctype html><html lang="en">'
+    yield get_head_html()
+    doc = Doc()
+    doc.asis('<body class="container-fluid m-2 mb-5">')
+    doc.line('h1', 'EASSE report', klass='mt-4')
+    with doc.tag('a', klass='btn btn-link', href='https://forms.gle/J8KVkJsqYe8GvYW46'):
+        doc.text('Any feedback welcome!')
+    doc.stag('hr')
+    doc.line('h2', 'Test set')
+    doc.stag('hr')
+    with doc.tag('div', klass='container-fluid'):
+        doc.asis(
+            get_test_set_description_html(
+                test_set=test_set,
+                orig_sents=orig_sents,
+                refs_sents=refs_sents,
+            )
+        )
+    yield doc.getvalue()
+
+
+def yield_html_report_footer():
+    yield '</body></html>'
+
+
+def yield_html_report(
     orig_sents: List[str],
     sys_sents: List[str],
     refs_sents: List[List[str]],
@@ -437,59 +831,132 @@ def get_html_report(
     lowercase: bool = False,
     tokenizer: str = '13a',
     metrics: List[str] = DEFAULT_METRICS,
+    jobs: int = 1,
+    workspace_dir: Path = None,
+    scalable: bool = False,
+    n_samples: int = 50,
 ):
+    '''
+    Yields the HTML report section by section so that it can be written without holding the whole document in memory.
+    jobs: Number of processes used to score the system and the baselines
+    workspace_dir: Directory where the scores of the system and baselines are saved to be reused by later reports
+    scalable: Plots are pre-binned histograms so that their size doesn't depend on the number of samples
+    n_samples: Number of samples displayed in each list of qualitative examples
+    '''
+    # Metrics are computed once, every section aggregates or sorts the rows of these tables. The system and the
+    # baselines are scored against the same orig and reference sentences.
+    sentence_scores_tables = get_sentence_scores_tables(
+        orig_sents,
+        [sys_sents] + list(get_baselines(orig_sents).values()),
+        refs_sents,
+        lowercase=lowercase,
+        tokenizer=tokenizer,
+        metrics=metrics,
+        jobs=jobs,
+        workspace_dir=workspace_dir,
+    )
+    sentence_scores_table = sentence_scores_tables[0]
+    yield from yield_html_report_header(test_set, orig_sents, refs_sents)
     doc = Doc()
-    doc.asis('<!doctype html>')
-    with doc.tag('html', lang='en'):
-        doc.asis(get_head_html())
-        with doc.tag('body', klass='container-fluid m-2 mb-5'):
-            doc.line('h1', 'EASSE report', klass='mt-4')
-            with doc.tag('a', klass='btn btn-link', href='https://forms.gle/J8KVkJsqYe8GvYW46'):
-                doc.text('Any feedback welcome!')
-            doc.stag('hr')
-            doc.line('h2', 'Test set')
-            doc.stag('hr')
-            with doc.tag('div', klass='container-fluid'):
-                doc.asis(
-                    get_test_set_description_html(
-                        test_set=test_set,
-                        orig_sents=orig_sents,
-                        refs_sents=refs_sents,
-                    )
-                )
-            doc.line('h2', 'Scores')
-            doc.stag('hr')
-            with doc.tag('div', klass='container-fluid'):
-                doc.line('h3', 'System vs. Reference')
-                doc.stag('hr')
-                doc.asis(
-                    get_score_table_html_single_system(orig_sents, sys_sents, refs_sents, lowercase, tokenizer, metrics)
-                )
-                doc.line('h3', 'By sentence length (characters)')
-                doc.stag('hr')
-                doc.asis(get_scores_by_length_html(orig_sents, sys_sents, refs_sents))
-            doc.line('h2', 'Plots')
-            doc.stag('hr')
-            with doc.tag('div', klass='container-fluid'):
-                doc.asis(get_plots_html(orig_sents, sys_sents, refs_sents[0]))
-            doc.line('h2', 'Qualitative evaluation')
-            doc.stag('hr')
-            with doc.tag('div', klass='container-fluid'):
-                doc.asis(get_qualitative_examples_html(orig_sents, sys_sents, refs_sents))
-    return indent(doc.getvalue())
-
-
-def write_html_report(filepath, *args, **kwargs):
+    doc.line('h2', 'Scores')
+    doc.stag('hr')
+    with doc.tag('div', klass='container-fluid'):
+        doc.line('h3', 'System vs. Reference')
+        doc.stag('hr')
+        doc.asis(
+            get_score_table_html_single_system(
+                orig_sents,
+                sys_sents,
+                refs_sents,
+                lowercase,
+                tokenizer,
+                metrics,
+                sentence_scores_tables=sentence_scores_tables,
+                workspace_dir=workspace_dir,
+            )
+        )
+        doc.line('h3', 'By sentence length (characters)')
+        doc.stag('hr')
+        doc.asis(
+            get_scores_by_length_html(
+                orig_sents,
+                sys_sents,
+                refs_sents,
+                lowercase=lowercase,
+                tokenizer=tokenizer,
+                metrics=metrics,
+                sentence_scores_table=sentence_scores_table,
+            )
+        )
+    yield doc.getvalue()
+    doc = Doc()
+    doc.line('h2', 'Plots')
+    doc.stag('hr')
+    with doc.tag('div', klass='container-fluid'):
+        doc.asis(
+            get_plots_html(
+                orig_sents,
+                sys_sents,
+                refs_sents[0],
+                sentence_scores_table=sentence_scores_table,
+                prebinned=scalable,
+            )
+        )
+    yield doc.getvalue()
+    doc = Doc()
+    doc.line('h2', 'Qualitative evaluation')
+    doc.stag('hr')
+    with doc.tag('div', klass='container-fluid'):
+        doc.asis(
+            get_qualitative_examples_html(
+                orig_sents,
+                sys_sents,
+                refs_sents,
+                sentence_scores_table=sentence_scores_table,
+                n_samples=n_samples,
+            )
+        )
+    yield doc.getvalue()
+    yield from yield_html_report_footer()
+
+
+def get_html_report(*args, **kwargs):
+    '''Same arguments as yield_html_report(), returns the whole indented document'''
+    return indent(''.join(yield_html_report(*args, **kwargs)))
+
+
+def write_html_report(filepath, *args, scalable: bool = False, **kwargs):
+    '''
+    scalable: For large test sets, each section is written as soon as it is generated, the document is not indented
+    and the plots are pre-binned, so that the size of the report and memory usage are bounded.
+    '''
     with open(filepath, 'w') as f:
-        f.write(get_html_report(*args, **kwargs) + '\n')
+        if scalable:
+            for html_section in yield_html_report(*args, scalable=True, **kwargs):
+                f.write(html_section)
+            f.write('\n')
+        else:
+            f.write(get_html_report(*args, **kwargs) + '\n')
 
 
-def get_multiple_systems_qualitative_examples_html(orig_sents, sys_sents_list, refs_sents, system_names):
-    def get_relative_sari(orig_sent, sys_sents, refs_sents, system_idx):
-        saris = [corpus_sari([orig_sent], [sys_sent], refs_sents) for sys_sent in sys_sents]
-        return saris[system_idx] / np.average(saris)
+def get_multiple_systems_qualitative_examples_html(
+    orig_sents, sys_sents_list, refs_sents, system_names, sentence_scores_tables=None, n_samples=50
+):
+    '''
+    sentence_scores_tables: Precomputed SentenceScoresTable of each system, the sort keys are read from them
+    n_samples: Number of samples displayed for each sort key
+    '''
+    # Shape: (n_systems, n_samples), SARI of all samples computed at once for each system
+    if sentence_scores_tables is not None:
+        sentence_saris = np.array([table['sentence_sari'] for table in sentence_scores_tables[: len(sys_sents_list)]])
+    else:
+        sentence_saris = np.array(
+            [get_sentence_sari_scores(orig_sents, sys_sents, refs_sents) for sys_sents in sys_sents_list]
+        )
+    # SARI of each system relative to the average SARI of all systems on the same sample
+    relative_saris = sentence_saris / sentence_saris.mean(axis=0, keepdims=True)
 
-    def get_one_sample_html(orig_sent, sys_sents, ref_sents, system_names, sort_key, print_func):
+    def get_one_sample_html(orig_sent, sys_sents, ref_sents, system_names, sort_value, print_func):
         def get_one_sentence_html(sentence, system_name):
             doc = Doc()
             with doc.tag('div', klass='row'):
@@ -503,7 +970,7 @@ def get_multiple_systems_qualitative_examples_html(orig_sents, sys_sents_list, r
         with doc.tag('div', klass='mb-2 p-1'):
             # Sort key
             with doc.tag('div', klass='text-muted small'):
-                doc.asis(print_func(sort_key(orig_sent, sys_sents, ref_sents)))
+                doc.asis(print_func(sort_value))
             with doc.tag('div', klass='ml-2'):
                 # Source
                 with doc.tag('div'):
@@ -526,76 +993,114 @@ def get_multiple_systems_qualitative_examples_html(orig_sents, sys_sents_list, r
                                 doc.asis(ref_sent_bold)
         return doc.getvalue()
 
-    title_key_print = [('Randomly sampled simplifications', lambda c, s, refs: 0, lambda value: ''),] + [
+    title_key_print = [('Randomly sampled simplifications', np.zeros(len(orig_sents)), lambda value: ''),] + [
         (
             f'Worst relative simplifications (SARI) for {system_names[i]}',
-            lambda c, sys_sents, refs_sents: get_relative_sari(c, sys_sents, refs_sents, system_idx=i),
+            relative_saris[i],
             lambda value: f'Relative SARI={value:.2f}',
         )
         for i in range(len(system_names))
     ]
     doc = Doc()
-    for title, sort_key, print_func in title_key_print:
+    for title, sort_values, print_func in title_key_print:
         with doc.tag('div', klass='container-fluid mt-4 p-2 border'):
             collapse_id = get_random_html_id()
             with doc.tag('a', ('data-toggle', 'collapse'), ('href', f'#{collapse_id}')):
                 doc.line('h3', klass='m-2', text_content=title)
             # Now lets print the examples
-            sample_generator = sorted(
-                zip(orig_sents, zip(*sys_sents_list), zip(*refs_sents)),
-                key=lambda args: sort_key(*args),
-            )
             # Samples displayed by default
             with doc.tag('div', klass='collapse', id=collapse_id):
-                n_samples = 50
-                for i, (orig_sent, sys_sents, refs) in enumerate(sample_generator):
-                    if i >= n_samples:
-                        break
-                    doc.asis(get_one_sample_html(orig_sent, sys_sents, refs, system_names, sort_key, print_func))
+                for i in get_smallest_indexes(sort_values, n_samples):
+                    sample_sys_sents = [sys_sents[i] for sys_sents in sys_sents_list]
+                    refs = [ref_sents[i] for ref_sents in refs_sents]
+                    doc.asis(
+                        get_one_sample_html(
+                            orig_sents[i], sample_sys_sents, refs, system_names, sort_values[i], print_func
+                        )
+                    )
     return doc.getvalue()
 
 
-def get_multiple_systems_html_report(
-    orig_sents, sys_sents_list, refs_sents, system_names, test_set, lowercase, tokenizer, metrics
+def yield_multiple_systems_html_report(
+    orig_sents,
+    sys_sents_list,
+    refs_sents,
+    system_names,
+    test_set,
+    lowercase,
+    tokenizer,
+    metrics,
+    jobs: int = 1,
+    workspace_dir: Path = None,
+    n_samples: int = 50,
 ):
+    '''
+    Yields the HTML report section by section so that it can be written without holding the whole document in memory.
+    jobs: Number of processes used to score the systems
+    workspace_dir: Directory where the scores of each system are saved, only new or changed systems are scored
+    n_samples: Number of samples displayed in each list of qualitative examples
+    '''
+    # Systems and baselines are scored once against the same orig and reference sentences
+    sentence_scores_tables = get_sentence_scores_tables(
+        orig_sents,
+        sys_sents_list + list(get_baselines(orig_sents).values()),
+        refs_sents,
+        lowercase=lowercase,
+        tokenizer=tokenizer,
+        metrics=metrics,
+        jobs=jobs,
+        workspace_dir=workspace_dir,
+    )
+    yield from yield_html_report_header(test_set, orig_sents, refs_sents)
     doc = Doc()
-    doc.asis('<!doctype html>')
-    with doc.tag('html', lang='en'):
-        doc.asis(get_head_html())
-        with doc.tag('body', klass='container-fluid m-2 mb-5'):
-            doc.line('h1', 'EASSE report', klass='mt-4')
-            with doc.tag('a', klass='btn btn-link', href='https://forms.gle/J8KVkJsqYe8GvYW46'):
-                doc.text('Any feedback welcome!')
-            doc.stag('hr')
-            doc.line('h2', 'Test set')
-            doc.stag('hr')
-            with doc.tag('div', klass='container-fluid'):
-                doc.asis(
-                    get_test_set_description_html(
-                        test_set=test_set,
-                        orig_sents=orig_sents,
-                        refs_sents=refs_sents,
-                    )
-                )
-            doc.line('h2', 'Scores')
-            doc.stag('hr')
-            with doc.tag('div', klass='container-fluid'):
-                doc.line('h3', 'System vs. Reference')
-                doc.stag('hr')
-                doc.asis(
-                    get_score_table_html_multiple_systems(
-                        orig_sents, sys_sents_list, refs_sents, system_names, lowercase, tokenizer, metrics
-                    )
-                )
-            doc.line('h2', 'Qualitative evaluation')
-            doc.stag('hr')
-            with doc.tag('div', klass='container-fluid'):
-                doc.asis(
-                    get_multiple_systems_qualitative_examples_html(orig_sents, sys_sents_list, refs_sents, system_names)
-                )
-    return indent(doc.getvalue())
+    doc.line('h2', 'Scores')
+    doc.stag('hr')
+    with doc.tag('div', klass='container-fluid'):
+        doc.line('h3', 'System vs. Reference')
+        doc.stag('hr')
+        doc.asis(
+            get_score_table_html_multiple_systems(
+                orig_sents,
+                sys_sents_list,
+                refs_sents,
+                system_names,
+                lowercase,
+                tokenizer,
+                metrics,
+                sentence_scores_tables=sentence_scores_tables,
+                workspace_dir=workspace_dir,
+            )
+        )
+    yield doc.getvalue()
+    doc = Doc()
+    doc.line('h2', 'Qualitative evaluation')
+    doc.stag('hr')
+    with doc.tag('div', klass='container-fluid'):
+        doc.asis(
+            get_multiple_systems_qualitative_examples_html(
+                orig_sents,
+                sys_sents_list,
+                refs_sents,
+                system_names,
+                sentence_scores_tables=sentence_scores_tables,
+                n_samples=n_samples,
+            )
+        )
+    yield doc.getvalue()
+    yield from yield_html_report_footer()
+
+
+def get_multiple_systems_html_report(*args, **kwargs):
+    '''Same arguments as yield_multiple_systems_html_report(), returns the whole indented document'''
+    return indent(''.join(yield_multiple_systems_html_report(*args, **kwargs)))
 
 
-def write_multiple_systems_html_report(filepath, *args, **kwargs):
+def write_multiple_systems_html_report(filepath, *args, scalable: bool = False, **kwargs):
+    '''scalable: Each section is written as soon as it is generated and the document is not indented'''
     with open(filepath, 'w') as f:
-        f.write(get_multiple_systems_html_report(*args, **kwargs) + '\n')
+        if scalable:
+            for html_section in yield_multiple_systems_html_report(*args, **kwargs):
+                f.write(html_section)
+            f.write('\n')
+        else:
+            f.write(get_multiple_systems_html_report(*args, **kwargs) + '\n')
@@ -10,7 +10,7 @@ from easse.utils.ucca_utils import (
     Passage,
 )
 from easse.aligner.aligner import MonolingualWordAligner
-from easse.aligner.corenlp_utils import syntactic_parse_texts
+from easse.aligner.corenlp_utils import syntactic_parse_texts, prepareSentence
 import easse.utils.preprocessing as utils_prep
 
 
@@ -43,6 +43,9 @@ def syntactic_parse_ucca_scenes(ucca_passages, tokenize=False, sentence_split=Fa
 
 def align_scenes_sentences(synt_scenes, synt_sents, allow_mutiple_matches):
     word_aligner = MonolingualWordAligner()
+    # Each scene is aligned with each sentence, their annotations are only extracted once
+    synt_scenes = [prepareSentence(synt_scene) for synt_scene in synt_scenes]
+    synt_sents = [prepareSentence(synt_sent) for synt_sent in synt_sents]
     scenes_sents_aligns = []
     already_matched = []
     for synt_scene in synt_scenes:
@@ -269,10 +272,11 @@ def get_samsa_sentence_scores(
     lowercase: bool = False,
     tokenizer: str = "13a",
     verbose: bool = False,
+    normalization_cache: utils_prep.NormalizationCache = None,
 ):
     print("Warning: SAMSA metric is long to compute (120 sentences ~ 4min), disable it if you need fast evaluation.")
 
-    orig_sents = [utils_prep.normalize(sent, lowercase, tokenizer) for sent in orig_sents]
+    orig_sents = utils_prep.normalize_many(orig_sents, lowercase, tokenizer, cache=normalization_cache)
     orig_ucca_passages = ucca_parse_texts(orig_sents)
     orig_synt_scenes = syntactic_parse_ucca_scenes(
         orig_ucca_passages,
@@ -281,7 +285,7 @@ def get_samsa_sentence_scores(
         verbose=verbose,
     )
 
-    sys_sents = [utils_prep.normalize(output, lowercase, tokenizer) for output in sys_sents]
+    sys_sents = utils_prep.normalize_many(sys_sents, lowercase, tokenizer, cache=normalization_cache)
     sys_sents_synt = syntactic_parse_texts(sys_sents, tokenize=False, sentence_split=True, verbose=verbose)
 
     sentences_scores = []
@@ -300,9 +304,10 @@ def corpus_samsa(
     lowercase: bool = False,
     tokenizer: str = "13a",
     verbose: bool = False,
+    normalization_cache: utils_prep.NormalizationCache = None,
 ):
 
-    return np.mean(get_samsa_sentence_scores(orig_sents, sys_sents, lowercase, tokenizer, verbose))
+    return np.mean(get_samsa_sentence_scores(orig_sents, sys_sents, lowercase, tokenizer, verbose, normalization_cache))
 
 
 def sentence_samsa(
@@ -1,5 +1,9 @@
 from collections import Counter
+from itertools import chain
 from typing import List
+
+import numpy as np
+
 import easse.utils.preprocessing as utils_prep
 
 NGRAM_ORDER = 4
@@ -177,6 +181,169 @@ def compute_ngram_stats(orig_sents: List[str], sys_sents: List[str], refs_sents:
     )
 
 
+def _encode_sents(sents: List[str], vocab: dict):
+    """Maps each token to an integer id (shared through `vocab`) and returns the flat array of ids with the lengths."""
+    # Splitting a single string is much faster than splitting each sentence, sentence boundaries are marked with a
+    # separator token that whitespace tokenized text can't contain in practice
+    separator = "\x00"
+    if len(sents) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    tokens = f" {separator} ".join(sents).split()
+    for token in dict.fromkeys(tokens):
+        vocab.setdefault(token, len(vocab))
+    token_ids = np.fromiter(map(vocab.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+    is_separator = token_ids == vocab.get(separator, -1)
+    if is_separator.sum() != max(len(sents) - 1, 0):
+        # Fall back to splitting each sentence if the separator appears in the sentences
+        tokenized_sents = list(map(str.split, sents))
+        lengths = np.fromiter(map(len, tokenized_sents), dtype=np.int64, count=len(tokenized_sents))
+        tokens = list(chain.from_iterable(tokenized_sents))
+        token_ids = np.fromiter(map(vocab.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        return token_ids, lengths
+    boundaries = np.append(np.flatnonzero(is_separator), len(token_ids))
+    lengths = np.diff(boundaries, prepend=-1) - 1
+    return token_ids[~is_separator], lengths
+
+
+def _make_dense(ids):
+    """Maps ids to 0..n_unique_ids-1 while preserving equality, the packing of n-grams is sparse otherwise."""
+    _, dense_ids = np.unique(ids, return_inverse=True)
+    return dense_ids.reshape(-1), int(dense_ids.max()) + 1 if len(dense_ids) > 0 else 1
+
+
+def _iterate_ngram_ids(token_ids, seq_ids, vocab_size, max_n_ids, max_order=NGRAM_ORDER):
+    """
+    Yields, for each n-gram order, the integer id of the n-gram starting at each position of the flat token array, a
+    mask of the n-grams that don't span two sequences and an upper bound on the ids.
+    Two n-grams have the same id if and only if they have the same tokens.
+    """
+    ngram_ids = token_ids
+    n_ids = vocab_size
+    for n in range(1, max_order + 1):
+        if n > 1:
+            if n_ids * vocab_size > np.iinfo(np.int64).max:
+                ngram_ids, n_ids = _make_dense(ngram_ids)
+            # An n-gram is the pair ((n-1)-gram id, last token id)
+            ngram_ids = ngram_ids[:-1] * vocab_size + token_ids[n - 1 :]
+            n_ids *= vocab_size
+        if n_ids > max_n_ids:
+            ngram_ids, n_ids = _make_dense(ngram_ids)
+        n_ngrams = len(ngram_ids)
+        yield ngram_ids, seq_ids[:n_ngrams] == seq_ids[n - 1 : n - 1 + n_ngrams], n_ids
+
+
+def _count_unique(keys):
+    """Same as np.unique(keys, return_counts=True)"""
+    keys = np.sort(keys)
+    is_new_key = np.ones(len(keys), dtype=bool)
+    is_new_key[1:] = keys[1:] != keys[:-1]
+    key_starts = np.flatnonzero(is_new_key)
+    return keys[key_starts], np.diff(np.append(key_starts, len(keys)))
+
+
+def _compute_operation_counts(keys, n_ngrams, num_refs):
+    """
+    Counts the occurrences of each n-gram in the original (src=0), system (src=1) and reference (src=2) sentences and
+    returns the nine add/keep/del statistics of compute_ngram_stats() for each distinct (sentence, n-gram) group.
+    keys: one key per n-gram occurrence, computed as (sent_id * n_ngrams + ngram_id) * 4 + src
+    """
+    keys, counts = _count_unique(keys)
+    # Bit operations are much faster than integer division
+    group_keys = keys >> 2
+    is_new_group = np.ones(len(group_keys), dtype=bool)
+    is_new_group[1:] = group_keys[1:] != group_keys[:-1]
+    group_indexes = np.cumsum(is_new_group) - 1
+    counts_per_src = np.zeros((3, int(is_new_group.sum())), dtype=np.int64)
+    counts_per_src[keys & 3, group_indexes] = counts
+    orig_counts, sys_counts, refs_counts = counts_per_src
+    in_orig, in_sys, in_refs = counts_per_src > 0
+    # Keep and delete statistics are weighted by the number of references
+    orig_counts = orig_counts * num_refs
+    sys_counts = sys_counts * num_refs
+    orig_and_sys = np.minimum(orig_counts, sys_counts)
+    orig_and_ref = np.minimum(orig_counts, refs_counts)
+    orig_and_not_sys = np.maximum(orig_counts - sys_counts, 0)
+    orig_and_not_ref = np.maximum(orig_counts - refs_counts, 0)
+    sys_and_not_orig = in_sys & ~in_orig
+    ref_and_not_orig = in_refs & ~in_orig
+    operation_counts = np.stack(
+        [
+            sys_and_not_orig & in_refs,
+            sys_and_not_orig,
+            ref_and_not_orig,
+            np.minimum(orig_and_sys, orig_and_ref),
+            orig_and_sys,
+            orig_and_ref,
+            np.minimum(orig_and_not_sys, orig_and_not_ref),
+            orig_and_not_sys,
+            orig_and_not_ref,
+        ]
+    )
+    return group_keys[is_new_group] // n_ngrams, operation_counts
+
+
+def _compute_chunk_sentence_ngram_stats(orig_sents: List[str], sys_sents: List[str], refs_sents: List[List[str]]):
+    n_samples = max(len(orig_sents), 1)
+    num_refs = len(refs_sents)
+    all_sents = list(chain(orig_sents, sys_sents, *refs_sents))
+    token_ids, lengths = _encode_sents(all_sents, vocab={})
+    # Sentences are laid out in blocks: originals, system outputs, then each set of references
+    sent_indexes = np.arange(len(all_sents))
+    seq_ids = np.repeat(sent_indexes, lengths)
+    sent_ids = np.repeat(sent_indexes % n_samples, lengths)
+    srcs = np.repeat(np.minimum(sent_indexes // n_samples, 2), lengths)
+    vocab_size = int(token_ids.max()) + 1 if len(token_ids) > 0 else 1
+
+    # Counting keys must fit in int64
+    max_n_ids = np.iinfo(np.int64).max // (4 * n_samples)
+    stats = np.zeros((len(orig_sents), 9, NGRAM_ORDER), dtype=np.int64)
+    for n, (ngram_ids, is_valid, n_ids) in enumerate(_iterate_ngram_ids(token_ids, seq_ids, vocab_size, max_n_ids)):
+        n_ngrams = len(ngram_ids)
+        keys = (((sent_ids[:n_ngrams] * n_ids + ngram_ids) << 2) | srcs[:n_ngrams])[is_valid]
+        group_sent_ids, operation_counts = _compute_operation_counts(keys, n_ids, num_refs)
+        if len(group_sent_ids) == 0:
+            continue
+        # Groups are sorted by sentence, sum the groups of each sentence
+        is_new_sent = np.ones(len(group_sent_ids), dtype=bool)
+        is_new_sent[1:] = group_sent_ids[1:] != group_sent_ids[:-1]
+        sent_starts = np.flatnonzero(is_new_sent)
+        stats[group_sent_ids[sent_starts], :, n] = np.add.reduceat(operation_counts, sent_starts, axis=1).T
+    return stats
+
+
+def compute_sentence_ngram_stats_vectorized(
+    orig_sents: List[str], sys_sents: List[str], refs_sents: List[List[str]], chunk_size: int = 1000
+):
+    """
+    Returns the add/keep/del statistics of compute_ngram_stats() for each sample as an array of shape
+    (n_samples, 9, NGRAM_ORDER). Summing the rows of any subset of samples gives the statistics of that subset.
+    Tokens are mapped to integer ids and all n-gram counts are computed with numpy on integer keys instead of building
+    Counters of strings. The corpus is processed by chunks of `chunk_size` samples to bound memory usage.
+    """
+    assert len(orig_sents) == len(
+        sys_sents
+    ), "Original sentences and system sentences don't have the same number of samples"
+    assert all(
+        len(ref_sents) == len(orig_sents) for ref_sents in refs_sents
+    ), "Reference sentences don't have the shape (n_references, n_samples)"
+    stats = np.zeros((len(orig_sents), 9, NGRAM_ORDER), dtype=np.int64)
+    for start in range(0, len(orig_sents), chunk_size):
+        stats[start : start + chunk_size] = _compute_chunk_sentence_ngram_stats(
+            orig_sents[start : start + chunk_size],
+            sys_sents[start : start + chunk_size],
+            [ref_sents[start : start + chunk_size] for ref_sents in refs_sents],
+        )
+    return stats
+
+
+def compute_ngram_stats_vectorized(
+    orig_sents: List[str], sys_sents: List[str], refs_sents: List[List[str]], chunk_size: int = 1000
+):
+    """Same inputs and outputs as compute_ngram_stats() but much faster on large corpora."""
+    sentence_stats = compute_sentence_ngram_stats_vectorized(orig_sents, sys_sents, refs_sents, chunk_size)
+    return tuple(sentence_stats.sum(axis=0).tolist())
+
+
 def compute_precision_recall_f1(sys_correct, sys_total, ref_total):
     precision = 0.0
     if sys_total > 0:
@@ -225,36 +392,42 @@ def compute_macro_sari(
     return add_f1, keep_f1, del_f1
 
 
-def get_corpus_sari_operation_scores(
+def get_sentence_sari_stats(
     orig_sents: List[str],
     sys_sents: List[str],
     refs_sents: List[List[str]],
     lowercase: bool = True,
     tokenizer: str = '13a',
     legacy=False,
-    use_f1_for_deletion=True,
-    use_paper_version=False,
+    normalization_cache: utils_prep.NormalizationCache = None,
 ):
     """
-    Inputs:
-    orig_sents: list of original sentences (len = n_samples)
-    sys_sents: list of system sentences (len = n_samples)
-    refs_sents: list of list of reference sentences (shape = (n_references, n_samples))
-    legacy: Allows reproducing scores reported in previous work.
-    It replicates a bug in the original JAVA implementation where only the system outputs and the reference sentences
-    are further tokenized.
-    In addition, it assumes that all sentences are already lowercased.
+    Returns the add/keep/del statistics of each sample as an array of shape (n_samples, 9, NGRAM_ORDER).
+    The SARI of any subset of samples can then be computed with get_sari_operation_scores_from_stats() on the
+    corresponding rows, without tokenizing and counting n-grams again.
+    Inputs are the same as get_corpus_sari_operation_scores().
     """
     if legacy:
         lowercase = False
     else:
-        orig_sents = [utils_prep.normalize(sent, lowercase, tokenizer) for sent in orig_sents]
+        orig_sents = utils_prep.normalize_many(orig_sents, lowercase, tokenizer, cache=normalization_cache)
 
-    sys_sents = [utils_prep.normalize(sent, lowercase, tokenizer) for sent in sys_sents]
-    refs_sents = [[utils_prep.normalize(sent, lowercase, tokenizer) for sent in ref_sents] for ref_sents in refs_sents]
+    sys_sents = utils_prep.normalize_many(sys_sents, lowercase, tokenizer, cache=normalization_cache)
+    refs_sents = [
+        utils_prep.normalize_many(ref_sents, lowercase, tokenizer, cache=normalization_cache) for ref_sents in refs_sents
+    ]
+    return compute_sentence_ngram_stats_vectorized(orig_sents, sys_sents, refs_sents)
 
-    stats = compute_ngram_stats(orig_sents, sys_sents, refs_sents)
 
+def get_sari_operation_scores_from_stats(stats, use_f1_for_deletion=True, use_paper_version=False):
+    """
+    stats: statistics of get_sentence_sari_stats(), either of shape (n_samples, 9, NGRAM_ORDER) which are summed over
+    the samples or already summed with shape (9, NGRAM_ORDER).
+    """
+    stats = np.asarray(stats)
+    if stats.ndim == 3:
+        stats = stats.sum(axis=0)
+    stats = stats.tolist()
     if not use_paper_version:
         add_score, keep_score, del_score = compute_macro_sari(*stats, use_f1_for_deletion=use_f1_for_deletion)
     else:
@@ -262,6 +435,59 @@ def get_corpus_sari_operation_scores(
     return 100.0 * add_score, 100.0 * keep_score, 100.0 * del_score
 
 
+def sari_from_stats(*args, **kwargs):
+    add_score, keep_score, del_score = get_sari_operation_scores_from_stats(*args, **kwargs)
+    return (add_score + keep_score + del_score) / 3
+
+
+def get_corpus_sari_operation_scores(
+    orig_sents: List[str],
+    sys_sents: List[str],
+    refs_sents: List[List[str]],
+    lowercase: bool = True,
+    tokenizer: str = '13a',
+    legacy=False,
+    use_f1_for_deletion=True,
+    use_paper_version=False,
+    normalization_cache: utils_prep.NormalizationCache = None,
+):
+    """
+    Inputs:
+    orig_sents: list of original sentences (len = n_samples)
+    sys_sents: list of system sentences (len = n_samples)
+    refs_sents: list of list of reference sentences (shape = (n_references, n_samples))
+    legacy: Allows reproducing scores reported in previous work.
+    It replicates a bug in the original JAVA implementation where only the system outputs and the reference sentences
+    are further tokenized.
+    In addition, it assumes that all sentences are already lowercased.
+    normalization_cache: Optional cache shared across metrics to avoid normalizing the same sentences several times.
+    """
+    stats = get_sentence_sari_stats(
+        orig_sents,
+        sys_sents,
+        refs_sents,
+        lowercase=lowercase,
+        tokenizer=tokenizer,
+        legacy=legacy,
+        normalization_cache=normalization_cache,
+    )
+    return get_sari_operation_scores_from_stats(
+        stats, use_f1_for_deletion=use_f1_for_deletion, use_paper_version=use_paper_version
+    )
+
+
 def corpus_sari(*args, **kwargs):
     add_score, keep_score, del_score = get_corpus_sari_operation_scores(*args, **kwargs)
     return (add_score + keep_score + del_score) / 3
+
+
+def get_sentence_sari_scores(*args, use_f1_for_deletion=True, use_paper_version=False, **kwargs):
+    """Returns the SARI of each sample, inputs are the same as get_sentence_sari_stats()."""
+    return [
+        sari_from_stats(sentence_stats, use_f1_for_deletion=use_f1_for_deletion, use_paper_version=use_paper_version)
+        for sentence_stats in get_sentence_sari_stats(*args, **kwargs)
+    ]
+
+
+def sentence_sari(orig_sent: str, sys_sent: str, ref_sents: List[str], **kwargs):
+    return corpus_sari([orig_sent], [sys_sent], [[ref_sent] for ref_sent in ref_sents], **kwargs)
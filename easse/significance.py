@@ -0,0 +1,236 @@
+"""
+Paired significance tests (bootstrap resampling and approximate randomization) between several systems.
+The sentence-level statistics of each metric are computed only once, resampled corpora are then scored by summing
+the rows of these statistics.
+"""
+from typing import List
+
+import numpy as np
+
+import easse.utils.preprocessing as utils_prep
+from easse.bleu import get_sentence_bleu_stats, bleu_from_stats
+from easse.compression import get_sentence_f1_token_scores
+from easse.sari import get_sentence_sari_stats, sari_from_stats
+from easse.utils.constants import SIGNIFICANCE_METRICS
+
+
+def get_sentence_stats(
+    metric: str,
+    orig_sents: List[str],
+    sys_sents: List[str],
+    refs_sents: List[List[str]],
+    lowercase: bool = True,
+    tokenizer: str = '13a',
+    normalization_cache: utils_prep.NormalizationCache = None,
+):
+    """Returns the statistics of each sample for the given metric as a 2D array of shape (n_samples, n_stats)."""
+    assert metric in SIGNIFICANCE_METRICS, f'"{metric}" is not a valid metric. Choose among: {SIGNIFICANCE_METRICS}'
+    if metric in ['sari', 'sari_micro']:
+        stats = get_sentence_sari_stats(
+            orig_sents,
+            sys_sents,
+            refs_sents,
+            lowercase=lowercase,
+            tokenizer=tokenizer,
+            normalization_cache=normalization_cache,
+        )
+        return stats.reshape(len(sys_sents), -1)
+    if metric == 'bleu':
+        return get_sentence_bleu_stats(
+            sys_sents, refs_sents, lowercase=lowercase, tokenizer=tokenizer, normalization_cache=normalization_cache
+        )
+    if metric == 'f1_token':
+        f1_token_scores = get_sentence_f1_token_scores(
+            sys_sents, refs_sents, lowercase=lowercase, tokenizer=tokenizer, normalization_cache=normalization_cache
+        )
+        # The number of samples is kept as a statistic to compute the average
+        return np.stack([f1_token_scores, np.ones(len(f1_token_scores))], axis=1)
+
+
+def get_score_from_stats(metric: str, stats):
+    """stats: statistics of get_sentence_stats() summed over the samples, shape (n_stats,)."""
+    if metric == 'sari':
+        return sari_from_stats(np.reshape(stats, (9, -1)))
+    if metric == 'sari_micro':
+        return sari_from_stats(np.reshape(stats, (9, -1)), use_paper_version=True)
+    if metric == 'bleu':
+        return bleu_from_stats(np.rint(stats).astype(np.int64))
+    if metric == 'f1_token':
+        f1_token_sum, n_samples = stats
+        return 100.0 * f1_token_sum / n_samples
+
+
+def _iterate_weight_batches(get_batch_weights, n_resamples, batch_size=100):
+    for start in range(0, n_resamples, batch_size):
+        yield get_batch_weights(min(batch_size, n_resamples - start))
+
+
+def _get_bootstrap_weights(rng, n_resamples, n_samples):
+    """Returns how many times each sample was drawn in each resampled corpus, shape (n_resamples, n_samples)."""
+    indexes = rng.integers(0, n_samples, size=(n_resamples, n_samples))
+    indexes += np.arange(n_resamples)[:, None] * n_samples
+    return np.bincount(indexes.reshape(-1), minlength=n_resamples * n_samples).reshape(n_resamples, n_samples)
+
+
+def _score_rows(metric, summed_stats):
+    return np.array([get_score_from_stats(metric, row) for row in summed_stats])
+
+
+def paired_bootstrap_resampling(
+    metric: str,
+    sys_stats_list,
+    baseline_idx: int = 0,
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: int = 1234,
+):
+    """
+    Paired bootstrap resampling (Koehn, 2004) of all systems at once, the same resampled corpora are used for every
+    system.
+    sys_stats_list: statistics of get_sentence_stats() for each system, shape (n_systems, n_samples, n_stats)
+    Returns the bootstrap mean, the confidence interval and the p-value of the difference with the baseline (None for
+    the baseline) for each system. The p-value is computed as in sacrebleu, i.e. with the null hypothesis that the
+    resampled differences are centered on 0.
+    """
+    sys_stats_list = np.asarray(sys_stats_list, dtype=np.float64)
+    n_systems, n_samples, _ = sys_stats_list.shape
+    rng = np.random.default_rng(seed)
+    resampled_scores = np.concatenate(
+        [
+            # Shape: (n_systems, batch_size)
+            np.stack([_score_rows(metric, summed_stats) for summed_stats in np.matmul(weights, sys_stats_list)], axis=0)
+            for weights in _iterate_weight_batches(
+                lambda batch_size: _get_bootstrap_weights(rng, batch_size, n_samples).astype(np.float64), n_resamples
+            )
+        ],
+        axis=1,
+    )
+    scores = [get_score_from_stats(metric, sys_stats.sum(axis=0)) for sys_stats in sys_stats_list]
+    alpha = 1 - confidence
+    results = []
+    for i in range(n_systems):
+        p_value = None
+        if i != baseline_idx:
+            observed_diff = scores[i] - scores[baseline_idx]
+            resampled_diffs = resampled_scores[i] - resampled_scores[baseline_idx]
+            n_extreme = np.sum(np.abs(resampled_diffs - resampled_diffs.mean()) >= np.abs(observed_diff))
+            p_value = float((n_extreme + 1) / (n_resamples + 1))
+        results.append(
+            {
+                'score': float(scores[i]),
+                'mean': float(resampled_scores[i].mean()),
+                'ci': tuple(np.quantile(resampled_scores[i], [alpha / 2, 1 - alpha / 2]).tolist()),
+                'p_value': p_value,
+            }
+        )
+    return results
+
+
+def paired_approximate_randomization(
+    metric: str,
+    sys_stats_list,
+    baseline_idx: int = 0,
+    n_resamples: int = 10000,
+    seed: int = 1234,
+):
+    """
+    Paired approximate randomization (Riezler and Maxwell, 2005) of each system against the baseline: the outputs of
+    both systems are swapped for a random half of the samples.
+    sys_stats_list: statistics of get_sentence_stats() for each system, shape (n_systems, n_samples, n_stats)
+    Returns the p-value of each system (None for the baseline).
+    """
+    sys_stats_list = np.asarray(sys_stats_list, dtype=np.float64)
+    baseline_stats = sys_stats_list[baseline_idx]
+    p_values = []
+    for i, sys_stats in enumerate(sys_stats_list):
+        if i == baseline_idx:
+            p_values.append(None)
+            continue
+        # Same swaps for every system
+        rng = np.random.default_rng(seed)
+        observed_diff = abs(
+            get_score_from_stats(metric, sys_stats.sum(axis=0)) - get_score_from_stats(metric, baseline_stats.sum(axis=0))
+        )
+        stats_diff = baseline_stats - sys_stats
+        n_extreme = 0
+        for swaps in _iterate_weight_batches(
+            lambda batch_size: (rng.random((batch_size, len(sys_stats))) < 0.5).astype(np.float64), n_resamples
+        ):
+            swapped_stats_diff = np.matmul(swaps, stats_diff)
+            swapped_sys_scores = _score_rows(metric, sys_stats.sum(axis=0) + swapped_stats_diff)
+            swapped_baseline_scores = _score_rows(metric, baseline_stats.sum(axis=0) - swapped_stats_diff)
+            n_extreme += np.sum(np.abs(swapped_sys_scores - swapped_baseline_scores) >= observed_diff)
+        p_values.append(float((n_extreme + 1) / (n_resamples + 1)))
+    return p_values
+
+
+def get_significance_scores(
+    orig_sents: List[str],
+    sys_sents_list: List[List[str]],
+    refs_sents: List[List[str]],
+    metrics: List[str] = SIGNIFICANCE_METRICS,
+    baseline_idx: int = 0,
+    method: str = 'bootstrap',
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: int = 1234,
+    lowercase: bool = True,
+    tokenizer: str = '13a',
+):
+    """
+    Compares several system outputs of the same test set against the baseline system (sys_sents_list[baseline_idx]).
+    method: "bootstrap" for paired bootstrap resampling or "ar" for approximate randomization, used for the p-values.
+    Confidence intervals are always computed with bootstrap resampling.
+    Returns a dict {metric: [{'score', 'mean', 'ci', 'p_value'} for each system]}.
+    """
+    assert method in ['bootstrap', 'ar'], f'"{method}" is not a valid method. Choose among: bootstrap, ar'
+    for metric in metrics:
+        assert metric in SIGNIFICANCE_METRICS, f'"{metric}" is not a valid metric. Choose among: {SIGNIFICANCE_METRICS}'
+    normalization_cache = utils_prep.NormalizationCache()
+    significance_scores = {}
+    for metric in metrics:
+        sys_stats_list = [
+            get_sentence_stats(
+                metric,
+                orig_sents,
+                sys_sents,
+                refs_sents,
+                lowercase=lowercase,
+                tokenizer=tokenizer,
+                normalization_cache=normalization_cache,
+            )
+            for sys_sents in sys_sents_list
+        ]
+        results = paired_bootstrap_resampling(
+            metric, sys_stats_list, baseline_idx=baseline_idx, n_resamples=n_resamples, confidence=confidence, seed=seed
+        )
+        if method == 'ar':
+            p_values = paired_approximate_randomization(
+                metric, sys_stats_list, baseline_idx=baseline_idx, n_resamples=n_resamples, seed=seed
+            )
+            for result, p_value in zip(results, p_values):
+                result['p_value'] = p_value
+        significance_scores[metric] = results
+    return significance_scores
+
+
+def format_significance_scores(significance_scores, system_names: List[str], confidence: float = 0.95):
+    """Formats the output of get_significance_scores() as a text table, one row per (metric, system)."""
+    header = ['metric', 'system', 'score', 'mean', f'{100 * confidence:g}% CI', 'p-value']
+    rows = [header]
+    for metric, results in significance_scores.items():
+        for system_name, result in zip(system_names, results):
+            p_value = '(baseline)' if result['p_value'] is None else f'{result["p_value"]:.4f}'
+            ci_low, ci_high = result['ci']
+            rows.append(
+                [
+                    metric,
+                    system_name,
+                    f'{result["score"]:.2f}',
+                    f'{result["mean"]:.2f}',
+                    f'[{ci_low:.2f}, {ci_high:.2f}]',
+                    p_value,
+                ]
+            )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    return '\n'.join('  '.join(value.ljust(width) for value, width in zip(row, widths)).rstrip() for row in rows)
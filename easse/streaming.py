@@ -0,0 +1,158 @@
+"""
+Streaming evaluation: the corpus is read and scored by chunks, only the sufficient statistics of each metric are kept
+in memory so that memory usage does not depend on the size of the corpus.
+"""
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from easse.bleu import get_sentence_bleu_stats, bleu_from_stats, sentence_bleu
+from easse.compression import get_sentence_f1_token_scores
+from easse.fkgl import FKGLScorer
+from easse.sari import get_sentence_sari_stats, get_sari_operation_scores_from_stats, NGRAM_ORDER
+from easse.utils.constants import DEFAULT_METRICS, MERGEABLE_METRICS
+from easse.utils.helpers import yield_chunks
+from easse.utils.preprocessing import normalize_many, NormalizationCache
+
+
+def get_chunk_stats(
+    orig_sents: List[str],
+    sys_sents: List[str],
+    refs_sents: List[List[str]],
+    metrics: List[str],
+    lowercase: bool,
+    tokenizer: str,
+    quality_estimation: bool,
+):
+    """
+    Returns the mergeable statistics of each metric of MERGEABLE_METRICS on a chunk of the corpus: summed counts for
+    bleu, sari and fkgl, sentence-level scores for sent_bleu, f1_token and the quality estimation features.
+    """
+    # Only shared within the chunk so that memory usage stays constant
+    normalization_cache = NormalizationCache()
+    kwargs = {'lowercase': lowercase, 'tokenizer': tokenizer, 'normalization_cache': normalization_cache}
+    chunk_stats = {}
+    if 'bleu' in metrics:
+        chunk_stats['bleu'] = get_sentence_bleu_stats(sys_sents, refs_sents, **kwargs).sum(axis=0)
+    if 'sent_bleu' in metrics:
+        chunk_stats['sent_bleu'] = [
+            sentence_bleu(sys_sent, ref_sents, **kwargs) for sys_sent, *ref_sents in zip(sys_sents, *refs_sents)
+        ]
+    if 'sari' in metrics or 'sari_by_operation' in metrics:
+        chunk_stats['sari'] = get_sentence_sari_stats(orig_sents, sys_sents, refs_sents, **kwargs).sum(axis=0)
+    if 'sari_legacy' in metrics:
+        chunk_stats['sari_legacy'] = get_sentence_sari_stats(
+            orig_sents, sys_sents, refs_sents, legacy=True, **kwargs
+        ).sum(axis=0)
+    if 'fkgl' in metrics:
+        fkgl_scorer = FKGLScorer()
+        fkgl_scorer.add_many(normalize_many(sys_sents, tokenizer=tokenizer, cache=normalization_cache))
+        chunk_stats['fkgl'] = fkgl_scorer
+    if 'f1_token' in metrics:
+        chunk_stats['f1_token'] = get_sentence_f1_token_scores(sys_sents, refs_sents, **kwargs)
+    if quality_estimation:
+        # Inline import to use EASSE without installing all dependencies
+        from easse.quality_estimation import get_sentence_quality_estimation_features
+
+        chunk_stats['quality_estimation'] = get_sentence_quality_estimation_features(orig_sents, sys_sents, **kwargs)
+    return chunk_stats
+
+
+class StreamingScorer:
+    """Accumulates the statistics of each metric chunk by chunk, scores are the same as when computed on the whole
+    corpus at once."""
+
+    def __init__(
+        self,
+        metrics: List[str] = DEFAULT_METRICS,
+        lowercase: bool = True,
+        tokenizer: str = '13a',
+        quality_estimation: bool = False,
+    ):
+        for metric in metrics:
+            assert (
+                metric in MERGEABLE_METRICS
+            ), f'"{metric}" is not available in streaming mode. Choose among: {MERGEABLE_METRICS}'
+        self.metrics = metrics
+        self.lowercase = lowercase
+        self.tokenizer = tokenizer
+        self.quality_estimation = quality_estimation
+        self.n_samples = 0
+        self.bleu_stats = None
+        self.sent_bleu_sum = 0
+        self.sari_stats = np.zeros((9, NGRAM_ORDER), dtype=np.int64)
+        self.sari_legacy_stats = np.zeros((9, NGRAM_ORDER), dtype=np.int64)
+        self.f1_token_sum = 0
+        self.fkgl_scorer = FKGLScorer()
+        self.quality_estimation_sums = {}
+
+    def add(self, orig_sents: List[str], sys_sents: List[str], refs_sents: List[List[str]]):
+        """Adds a chunk of samples, refs_sents has the shape (n_references, n_samples) as for the corpus metrics."""
+        chunk_stats = get_chunk_stats(
+            orig_sents, sys_sents, refs_sents, self.metrics, self.lowercase, self.tokenizer, self.quality_estimation
+        )
+        self.n_samples += len(sys_sents)
+        if 'bleu' in chunk_stats:
+            bleu_stats = chunk_stats['bleu']
+            self.bleu_stats = bleu_stats if self.bleu_stats is None else self.bleu_stats + bleu_stats
+        if 'sent_bleu' in chunk_stats:
+            self.sent_bleu_sum += sum(chunk_stats['sent_bleu'])
+        if 'sari' in chunk_stats:
+            self.sari_stats += chunk_stats['sari']
+        if 'sari_legacy' in chunk_stats:
+            self.sari_legacy_stats += chunk_stats['sari_legacy']
+        if 'fkgl' in chunk_stats:
+            self.fkgl_scorer.merge(chunk_stats['fkgl'])
+        if 'f1_token' in chunk_stats:
+            self.f1_token_sum += sum(chunk_stats['f1_token'])
+        if 'quality_estimation' in chunk_stats:
+            for name, values in chunk_stats['quality_estimation'].items():
+                self.quality_estimation_sums[name] = self.quality_estimation_sums.get(name, 0) + sum(values)
+
+    def score(self):
+        """Returns the scores with the same keys as easse.cli.evaluate_system_output()."""
+        metrics_scores = {}
+        if 'bleu' in self.metrics:
+            metrics_scores['bleu'] = bleu_from_stats(self.bleu_stats) if self.bleu_stats is not None else 0.0
+        if 'sent_bleu' in self.metrics:
+            metrics_scores['sent_bleu'] = self.sent_bleu_sum / self.n_samples
+        if 'sari' in self.metrics:
+            metrics_scores['sari'] = sum(get_sari_operation_scores_from_stats(self.sari_stats)) / 3
+        if 'sari_legacy' in self.metrics:
+            metrics_scores['sari_legacy'] = sum(get_sari_operation_scores_from_stats(self.sari_legacy_stats)) / 3
+        if 'sari_by_operation' in self.metrics:
+            (
+                metrics_scores['sari_add'],
+                metrics_scores['sari_keep'],
+                metrics_scores['sari_del'],
+            ) = get_sari_operation_scores_from_stats(self.sari_stats)
+        if 'fkgl' in self.metrics:
+            metrics_scores['fkgl'] = self.fkgl_scorer.score()
+        if 'f1_token' in self.metrics:
+            metrics_scores['f1_token'] = 100.0 * self.f1_token_sum / self.n_samples
+        if self.quality_estimation:
+            metrics_scores['quality_estimation'] = {
+                name: cumsum / self.n_samples for name, cumsum in self.quality_estimation_sums.items()
+            }
+        return metrics_scores
+
+
+def corpus_scores_streaming(
+    samples: Iterable[Tuple[str, str, Tuple[str, ...]]],
+    chunk_size: int = 10000,
+    metrics: List[str] = DEFAULT_METRICS,
+    lowercase: bool = True,
+    tokenizer: str = '13a',
+    quality_estimation: bool = False,
+):
+    """
+    samples: iterable of (orig_sent, sys_sent, ref_sents) tuples, e.g. read lazily from files.
+    Only chunk_size samples are held in memory at the same time.
+    """
+    scorer = StreamingScorer(
+        metrics=metrics, lowercase=lowercase, tokenizer=tokenizer, quality_estimation=quality_estimation
+    )
+    for chunk in yield_chunks(samples, chunk_size):
+        orig_sents, sys_sents, refs_per_sample = zip(*chunk)
+        scorer.add(list(orig_sents), list(sys_sents), [list(ref_sents) for ref_sents in zip(*refs_per_sample)])
+    return scorer.score()
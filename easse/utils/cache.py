@@ -0,0 +1,54 @@
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+
+def get_content_hash(*args):
+    """Hash of JSON serializable arguments, used as a content-addressed key."""
+    return hashlib.sha256(json.dumps(args, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class SQLiteCache:
+    """Persistent key-value store on disk, values are pickled. Safe to use from several threads."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB)')
+
+    def get_many(self, keys: List[str]) -> Dict[str, object]:
+        """Returns the cached values of the keys that are present in the cache."""
+        unique_keys = list(dict.fromkeys(keys))
+        values = {}
+        # SQLite limits the number of parameters per query
+        batch_size = 500
+        with self._lock:
+            for start in range(0, len(unique_keys), batch_size):
+                batch_keys = unique_keys[start : start + batch_size]
+                rows = self._connection.execute(
+                    f'SELECT key, value FROM cache WHERE key IN ({",".join("?" * len(batch_keys))})', batch_keys
+                )
+                values.update((key, pickle.loads(value)) for key, value in rows)
+        return values
+
+    def set_many(self, items: Dict[str, object]):
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)',
+                ((key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)) for key, value in items.items()),
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 
@@ -9,6 +10,11 @@ DATA_DIR = RESOURCES_DIR / "data"
 STANFORD_CORENLP_DIR = TOOLS_DIR / "stanford-corenlp-full-2018-10-05"
 UCCA_DIR = TOOLS_DIR / "ucca-bilstm-1.3.10"
 UCCA_PARSER_PATH = UCCA_DIR / "models/ucca-bilstm"
+# Files computed by EASSE (e.g. parses and indexes), outside of the package so that it can be installed read-only
+CACHE_DIR = Path(os.environ.get("EASSE_CACHE_DIR", Path.home() / ".cache" / "easse"))
+CORENLP_PARSE_CACHE_PATH = CACHE_DIR / "corenlp_parses.sqlite"
+PPDB_PATH = RESOURCES_DIR / "ppdb-1.0-xxxl-lexical.extended.synonyms.uniquepairs"
+PPDB_INDEX_PATH = CACHE_DIR / "ppdb_index.npy"
 TEST_SETS_PATHS = {
     ('asset_test', 'orig'): DATA_DIR / f'test_sets/asset/asset.test.orig',
     ('asset_test', 'refs'): [DATA_DIR / f'test_sets/asset/asset.test.simp.{i}' for i in range(10)],
@@ -64,3 +70,6 @@ VALID_METRICS = [
     'bertscore',
 ]
 DEFAULT_METRICS = ['bleu', 'sari', 'fkgl']
+# Metrics whose statistics can be computed on chunks of the corpus and merged (streaming and multi-process modes)
+MERGEABLE_METRICS = ['bleu', 'sent_bleu', 'sari', 'sari_legacy', 'sari_by_operation', 'fkgl', 'f1_token']
+SIGNIFICANCE_METRICS = ['bleu', 'sari', 'sari_micro', 'f1_token']
@@ -1,7 +1,11 @@
+from itertools import islice
 from typing import List
 from pathlib import Path
 import tempfile
 
+import numpy as np
+
+
 def safe_divide(a,b):
     return a/b if b else 0
 
@@ -19,6 +23,41 @@ def read_lines(filename):
     return lines
 
 
+def yield_lines(filename):
+    """Same as read_lines() but reads the file lazily, line by line."""
+    with open(filename, encoding="utf-8") as f:
+        for line in f:
+            yield line.strip()
+
+
+def yield_chunks(iterable, chunk_size):
+    """Yields lists of at most chunk_size consecutive items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+
+def get_smallest_indexes(values, k):
+    """
+    Returns the indexes of the k smallest values in increasing order of value, in O(n + k log k) instead of sorting all
+    the values. Ties are kept in the order of the indexes, i.e. same order as sorted() on the values, NaNs come last.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    k = min(k, len(values))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    kth_value = np.partition(values, k - 1)[k - 1]
+    if np.isnan(kth_value):
+        smaller_indexes, tied_indexes = np.flatnonzero(~np.isnan(values)), np.flatnonzero(np.isnan(values))
+    else:
+        smaller_indexes, tied_indexes = np.flatnonzero(values < kth_value), np.flatnonzero(values == kth_value)
+    indexes = np.concatenate([smaller_indexes, tied_indexes[: k - len(smaller_indexes)]])
+    return indexes[np.lexsort((indexes, values[indexes]))]
+
+
 def add_dicts(*dicts):
     return {k: v for dic in dicts for k, v in dic.items()}
 
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import List
 
 from importlib import import_module
@@ -5,31 +6,83 @@ from importlib import import_module
 import sacremoses
 
 _TOKENIZERS = {
-    "none": "tokenizer_base.BaseTokenizer",
     "13a": "tokenizer_13a.Tokenizer13a",
     "intl": "tokenizer_intl.TokenizerV14International",
 }
+VALID_TOKENIZERS = ["none"] + list(_TOKENIZERS.keys()) + ["moses", "penn"]
 
 
-def _get_tokenizer(name: str):
+def _get_sacrebleu_tokenizer_class(name: str):
     """Dynamically import tokenizer as importing all is slow."""
     module_name, class_name = _TOKENIZERS[name].rsplit(".", 1)
     return getattr(import_module(f".tokenizers.{module_name}", "sacrebleu"), class_name)
 
 
+@lru_cache(maxsize=None)
+def _get_moses_tokenizer(lang: str = "en"):
+    return sacremoses.MosesTokenizer(lang=lang)
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(name: str):
+    """Returns a callable str -> str for the given tokenizer name, a single instance is shared across all calls."""
+    assert name in VALID_TOKENIZERS, f'"{name}" is not a valid tokenizer. Choose among: {VALID_TOKENIZERS}'
+    if name == "none":
+        # sacrebleu's NoneTokenizer only exists since 2.2.0
+        return lambda sentence: sentence
+    if name in _TOKENIZERS:
+        return _get_sacrebleu_tokenizer_class(name)()
+    moses_tokenizer = _get_moses_tokenizer()
+    if name == "moses":
+        return lambda sentence: moses_tokenizer.tokenize(sentence, return_str=True, escape=False)
+    return lambda sentence: moses_tokenizer.penn_tokenize(sentence, return_str=True)
+
+
 def normalize(sentence: str, lowercase: bool = True, tokenizer: str = "13a", return_str: bool = True):
     if lowercase:
         sentence = sentence.lower()
 
-    if tokenizer in ["13a", "intl", "none"]:
-        tokenizer_obj = _get_tokenizer(name=tokenizer)()
-        normalized_sent = tokenizer_obj(sentence)
-    elif tokenizer == "moses":
-        normalized_sent = sacremoses.MosesTokenizer().tokenize(sentence, return_str=True, escape=False)
-    elif tokenizer == "penn":
-        normalized_sent = sacremoses.MosesTokenizer().penn_tokenize(sentence, return_str=True)
+    normalized_sent = get_tokenizer(tokenizer)(sentence)
 
     if not return_str:
         normalized_sent = normalized_sent.split()
 
     return normalized_sent
+
+
+def normalize_many(
+    sentences: List[str],
+    lowercase: bool = True,
+    tokenizer: str = "13a",
+    return_str: bool = True,
+    cache: "NormalizationCache" = None,
+):
+    if cache is not None:
+        normalized_sents = cache.normalize_many(sentences, lowercase, tokenizer)
+        if not return_str:
+            normalized_sents = [normalized_sent.split() for normalized_sent in normalized_sents]
+        return normalized_sents
+    tokenizer_obj = get_tokenizer(tokenizer)
+    if lowercase:
+        sentences = [sentence.lower() for sentence in sentences]
+    normalized_sents = [tokenizer_obj(sentence) for sentence in sentences]
+    if not return_str:
+        normalized_sents = [normalized_sent.split() for normalized_sent in normalized_sents]
+    return normalized_sents
+
+
+class NormalizationCache:
+    """Normalizes each (sentence, lowercase, tokenizer) combination only once.
+
+    A single instance can be shared across several metrics computed on the same corpus so that the original, system
+    and reference sentences are not tokenized again by every metric.
+    """
+
+    def __init__(self):
+        self._normalized = {}
+
+    def normalize_many(self, sentences: List[str], lowercase: bool = True, tokenizer: str = "13a"):
+        normalized = self._normalized.setdefault((lowercase, tokenizer), {})
+        missing_sents = [sentence for sentence in dict.fromkeys(sentences) if sentence not in normalized]
+        normalized.update(zip(missing_sents, normalize_many(missing_sents, lowercase, tokenizer)))
+        return [normalized[sentence] for sentence in sentences]
@@ -101,5 +101,15 @@ def get_refs_sents(test_set):
     return [read_lines(ref_sents_path) for ref_sents_path in TEST_SETS_PATHS[(test_set, 'refs')]]
 
 
+def get_orig_sents_path(test_set):
+    test_set = maybe_map_deprecated_test_set_to_new_test_set(test_set)
+    return TEST_SETS_PATHS[(test_set, 'orig')]
+
+
+def get_refs_sents_paths(test_set):
+    test_set = maybe_map_deprecated_test_set_to_new_test_set(test_set)
+    return TEST_SETS_PATHS[(test_set, 'refs')]
+
+
 def get_system_outputs_dir(test_set):
     return SYSTEM_OUTPUTS_DIRS_MAP[test_set]
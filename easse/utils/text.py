@@ -1,5 +1,7 @@
 import re
+import threading
 from functools import lru_cache
+from typing import List
 
 import nltk
 
@@ -12,90 +14,115 @@ def count_words(text):
     return len(to_words(text))
 
 
+_sentence_tokenizers = {}
+_sentence_tokenizers_lock = threading.Lock()
+
+
+def get_sentence_tokenizer(language='english'):
+    """Punkt sentence tokenizer of the language, unpickled only once per process."""
+    tokenizer = _sentence_tokenizers.get(language)
+    if tokenizer is None:
+        with _sentence_tokenizers_lock:
+            if language not in _sentence_tokenizers:
+                try:
+                    tokenizer = nltk.data.load(f'tokenizers/punkt/{language}.pickle')
+                except LookupError:
+                    nltk.download('punkt')
+                    tokenizer = nltk.data.load(f'tokenizers/punkt/{language}.pickle')
+                _sentence_tokenizers[language] = tokenizer
+            tokenizer = _sentence_tokenizers[language]
+    return tokenizer
+
+
 def to_sentences(text, language='english'):
-    try:
-        tokenizer = nltk.data.load(f'tokenizers/punkt/{language}.pickle')
-    except LookupError:
-        nltk.download('punkt')
-        tokenizer = nltk.data.load(f'tokenizers/punkt/{language}.pickle')
-    return tokenizer.tokenize(text)
+    return get_sentence_tokenizer(language).tokenize(text)
+
+
+def to_sentences_many(texts: List[str], language='english') -> List[List[str]]:
+    """Splits each text in sentences, repeated texts are only split once."""
+    tokenizer = get_sentence_tokenizer(language)
+    sentences_per_text = {}
+    for text in texts:
+        if text not in sentences_per_text:
+            sentences_per_text[text] = tokenizer.tokenize(text)
+    return [list(sentences_per_text[text]) for text in texts]
 
 
 def count_sentences(text, language='english'):
     return len(to_sentences(text, language))
 
 
-@lru_cache(maxsize=100000)
-def count_syllables_in_word(word):
-    # The syllables counting logic is adapted from the following scripts:
-    # https://github.com/XingxingZhang/dress/blob/master/dress/scripts/readability/syllables_en.py
-    # https://github.com/nltk/nltk_contrib/blob/master/nltk_contrib/readability/syllables_en.py
-    special_words = {
-        'the': 1,
-        'tottered': 2,
-        'chummed': 1,
-        'peeped': 1,
-        'moustaches': 2,
-        'shamefully': 3,
-        'messieurs': 2,
-        'satiated': 4,
-        'sailmaker': 4,
-        'sheered': 1,
-        'disinterred': 3,
-        'propitiatory': 6,
-        'bepatched': 2,
-        'particularized': 5,
-        'caressed': 2,
-        'trespassed': 2,
-        'sepulchre': 3,
-        'flapped': 1,
-        'hemispheres': 3,
-        'pencilled': 2,
-        'motioned': 2,
-        'poleman': 2,
-        'slandered': 2,
-        'sombre': 2,
-        'etc': 4,
-        'sidespring': 2,
-        'mimes': 1,
-        'effaces': 2,
-        'mr': 2,
-        'mrs': 2,
-        'ms': 1,
-        'dr': 2,
-        'st': 1,
-        'sr': 2,
-        'jr': 2,
-        'truckle': 2,
-        'foamed': 1,
-        'fringed': 2,
-        'clattered': 2,
-        'capered': 2,
-        'mangroves': 2,
-        'suavely': 2,
-        'reclined': 2,
-        'brutes': 1,
-        'effaced': 2,
-        'quivered': 2,
-        "h'm": 1,
-        'veriest': 3,
-        'sententiously': 4,
-        'deafened': 2,
-        'manoeuvred': 3,
-        'unstained': 2,
-        'gaped': 1,
-        'stammered': 2,
-        'shivered': 2,
-        'discoloured': 3,
-        'gravesend': 2,
-        '60': 2,
-        'lb': 1,
-        'unexpressed': 3,
-        'greyish': 2,
-        'unostentatious': 5,
-    }
-    special_syllables_substract = ['cial', 'tia', 'cius', 'cious', 'gui', 'ion', 'iou', 'sia$', '.ely$']
-    special_syllables_add = [
+# Compiled once instead of at each call of count_syllables_in_word()
+_SPECIAL_SYLLABLE_WORDS = {
+    'the': 1,
+    'tottered': 2,
+    'chummed': 1,
+    'peeped': 1,
+    'moustaches': 2,
+    'shamefully': 3,
+    'messieurs': 2,
+    'satiated': 4,
+    'sailmaker': 4,
+    'sheered': 1,
+    'disinterred': 3,
+    'propitiatory': 6,
+    'bepatched': 2,
+    'particularized': 5,
+    'caressed': 2,
+    'trespassed': 2,
+    'sepulchre': 3,
+    'flapped': 1,
+    'hemispheres': 3,
+    'pencilled': 2,
+    'motioned': 2,
+    'poleman': 2,
+    'slandered': 2,
+    'sombre': 2,
+    'etc': 4,
+    'sidespring': 2,
+    'mimes': 1,
+    'effaces': 2,
+    'mr': 2,
+    'mrs': 2,
+    'ms': 1,
+    'dr': 2,
+    'st': 1,
+    'sr': 2,
+    'jr': 2,
+    'truckle': 2,
+    'foamed': 1,
+    'fringed': 2,
+    'clattered': 2,
+    'capered': 2,
+    'mangroves': 2,
+    'suavely': 2,
+    'reclined': 2,
+    'brutes': 1,
+    'effaced': 2,
+    'quivered': 2,
+    "h'm": 1,
+    'veriest': 3,
+    'sententiously': 4,
+    'deafened': 2,
+    'manoeuvred': 3,
+    'unstained': 2,
+    'gaped': 1,
+    'stammered': 2,
+    'shivered': 2,
+    'discoloured': 3,
+    'gravesend': 2,
+    '60': 2,
+    'lb': 1,
+    'unexpressed': 3,
+    'greyish': 2,
+    'unostentatious': 5,
+}
+_SPECIAL_SYLLABLES_SUBSTRACT = [
+    re.compile(pattern) for pattern in ['cial', 'tia', 'cius', 'cious', 'gui', 'ion', 'iou', 'sia$', '.ely$']
+]
+_SPECIAL_SYLLABLES_ADD = [
+    re.compile(pattern)
+    for pattern in [
         'ia',
         'riet',
         'dien',
@@ -116,9 +143,17 @@ def count_syllables_in_word(word):
         '(.)(?!\\1)[gq]ua(.)(?!\\2)[aeiou]',
         'dnt$',
     ]
+]
+
+
+@lru_cache(maxsize=100000)
+def count_syllables_in_word(word):
+    # The syllables counting logic is adapted from the following scripts:
+    # https://github.com/XingxingZhang/dress/blob/master/dress/scripts/readability/syllables_en.py
+    # https://github.com/nltk/nltk_contrib/blob/master/nltk_contrib/readability/syllables_en.py
     word = word.lower().strip()
-    if word in special_words:
-        return special_words[word]
+    if word in _SPECIAL_SYLLABLE_WORDS:
+        return _SPECIAL_SYLLABLE_WORDS[word]
     # Remove final silent 'e'
     word = word.rstrip('e')
     # Count vowel groups
@@ -131,14 +166,25 @@ def count_syllables_in_word(word):
         prev_was_vowel = is_vowel
 
     # Add & subtract syllables
-    for r in special_syllables_add:
-        if re.search(r, word):
+    for pattern in _SPECIAL_SYLLABLES_ADD:
+        if pattern.search(word):
             count += 1
-    for r in special_syllables_substract:
-        if re.search(r, word):
+    for pattern in _SPECIAL_SYLLABLES_SUBSTRACT:
+        if pattern.search(word):
             count -= 1
     return count
 
 
 def count_syllables_in_sentence(sentence):
     return sum([count_syllables_in_word(word) for word in to_words(sentence)])
+
+
+def count_syllables_in_words(words: List[str], pool=None):
+    """Returns {word: number of syllables} for each distinct word, optionally counted with a worker pool (any object
+    with a map() method such as multiprocessing.Pool or concurrent.futures executors)."""
+    vocabulary = list(dict.fromkeys(words))
+    if pool is None:
+        counts = map(count_syllables_in_word, vocabulary)
+    else:
+        counts = pool.map(count_syllables_in_word, vocabulary)
+    return dict(zip(vocabulary, counts))
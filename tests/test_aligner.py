@@ -1,6 +1,14 @@
 import pytest
 
 import easse.aligner.aligner as aligner
+from easse.aligner.utils import findAllCommonContiguousSublists
+from easse.aligner.word_sim import (
+    present_in_ppdb,
+    wordRelatedness,
+    get_word_sim_cache_info,
+    clear_word_sim_caches,
+    _load_ppdb_index,
+)
 
 
 @pytest.mark.skip(reason="TODO: Aligner is currently broken")
@@ -39,3 +47,46 @@ def test_align_tokens():
         ['accident', 'collision'],
         ['an', 'a'],
     ]
+
+
+def test_find_all_common_contiguous_sublists():
+    sentence1 = ['The', 'cat', 'sat', 'on', 'the', 'mat', '.']
+    sentence2 = ['the', 'cat', 'is', 'on', 'the', 'mat']
+    assert findAllCommonContiguousSublists(sentence1, sentence2) == [
+        [[3, 4, 5], [3, 4, 5]],
+        [[0, 1], [0, 1]],
+        [[4], [0]],
+        [[0], [4]],
+    ]
+    # Sublists of the longest common sublists are not returned, repeated ones are
+    assert findAllCommonContiguousSublists(['a', 'b', 'a', 'b'], ['a', 'b']) == [[[0, 1], [0, 1]], [[2, 3], [0, 1]]]
+
+
+def test_present_in_ppdb():
+    assert present_in_ppdb('big', 'large')
+    assert present_in_ppdb('Large', 'big')
+    assert not present_in_ppdb('big', 'car')
+
+
+def test_load_ppdb_index_fallbacks(tmp_path):
+    ppdb_path = tmp_path / 'ppdb.txt'
+    ppdb_path.write_text('big\tlarge\nsmall\tlittle\n', encoding='utf-8')
+    # Missing PPDB file: empty index
+    with pytest.warns(UserWarning):
+        assert len(_load_ppdb_index(tmp_path / 'missing.txt', tmp_path / 'cache/missing.npy')) == 0
+    # Compiled and saved on first use, then memory-mapped
+    index_path = tmp_path / 'cache/ppdb_index.npy'
+    assert len(_load_ppdb_index(ppdb_path, index_path)) == 2
+    assert index_path.exists()
+    assert len(_load_ppdb_index(ppdb_path, index_path)) == 2
+    # Cache directory that can't be created: the index is only built in memory
+    (tmp_path / 'not_a_dir').write_text('')
+    assert len(_load_ppdb_index(ppdb_path, tmp_path / 'not_a_dir/ppdb_index.npy')) == 2
+
+
+def test_word_relatedness_cache():
+    clear_word_sim_caches()
+    assert wordRelatedness('cats', 'NNS', 'cat', 'NN') == 1
+    assert wordRelatedness('cats', 'NNS', 'cat', 'NN') == 1
+    cache_info = get_word_sim_cache_info()['word_relatedness']
+    assert (cache_info.hits, cache_info.misses) == (1, 1)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("bert_score")
+
+import torch
+from bert_score import BERTScorer
+
+from easse.bertscore import (
+    EmbeddingsCache,
+    bertscore_from_sentence_scores,
+    get_bertscore_sentence_scores,
+)
+from easse.utils.preprocessing import normalize_many
+from easse.utils.resources import get_orig_sents, get_refs_sents
+
+
+def test_get_bertscore_sentence_scores():
+    n_samples = 8
+    sys_sents = get_orig_sents("asset_test")[:n_samples]
+    refs_sents = [ref_sents[:n_samples] for ref_sents in get_refs_sents("asset_test")[:3]]
+    embeddings_cache = EmbeddingsCache()
+    sentence_scores = get_bertscore_sentence_scores(sys_sents, refs_sents, embeddings_cache=embeddings_cache)
+    # Same scores as bert_score on the normalized sentences, each sample is scored against its best reference
+    expected_scores = BERTScorer(lang="en", rescale_with_baseline=True).score(
+        normalize_many(sys_sents, lowercase=False, tokenizer="13a"),
+        [list(ref_sents) for ref_sents in zip(*[normalize_many(sents, False, "13a") for sents in refs_sents])],
+    )
+    for scores, expected in zip(sentence_scores, expected_scores):
+        assert scores.tolist() == pytest.approx(expected.tolist(), abs=1e-5)
+    # The references are encoded once
+    assert len(embeddings_cache) > 0
+    cached_scores = get_bertscore_sentence_scores(sys_sents, refs_sents, embeddings_cache=embeddings_cache)
+    for scores, expected in zip(cached_scores, sentence_scores):
+        assert scores.tolist() == pytest.approx(expected.tolist(), abs=1e-6)
+
+
+def test_embeddings_cache():
+    def get_embedding():
+        # 4 tokens of dimension 2 and their idf weights: 48 bytes
+        return torch.zeros((4, 2)), torch.zeros(4)
+
+    embeddings_cache = EmbeddingsCache(max_bytes=100)
+    embeddings_cache.set_many({"a": get_embedding(), "b": get_embedding()})
+    assert embeddings_cache.n_bytes == 96
+    # "a" is used more recently than "b", which is evicted
+    assert embeddings_cache.get_many(["a", "missing"]).keys() == {"a"}
+    embeddings_cache.set_many({"c": get_embedding()})
+    assert embeddings_cache.get_many(["a", "b", "c"]).keys() == {"a", "c"}
+    assert embeddings_cache.n_bytes == 96
+    embeddings_cache.clear()
+    assert len(embeddings_cache) == 0 and embeddings_cache.n_bytes == 0
+
+
+def test_bertscore_from_sentence_scores():
+    sentence_scores = np.array([[0.1, 0.2, 0.3], [0.5, 0.4, 0.6], [0.9, 0.0, 0.3]], dtype=np.float32)
+    assert bertscore_from_sentence_scores(sentence_scores[[0, 2]]) == pytest.approx((0.5, 0.1, 0.3))
+    assert bertscore_from_sentence_scores(sentence_scores) == pytest.approx((0.5, 0.2, 0.4))
+    assert bertscore_from_sentence_scores(sentence_scores[:0]) == (0.0, 0.0, 0.0)
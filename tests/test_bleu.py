@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from sacrebleu.metrics import BLEU
+
+from easse.bleu import bleu_from_stats, corpus_bleu, get_bleu_scorer_with_references, get_sentence_bleu_stats
+from easse.utils.helpers import read_lines
+from easse.utils.resources import get_refs_sents, get_system_outputs_dir
+
+
+def test_get_sentence_bleu_stats():
+    refs_sents = get_refs_sents('turkcorpus_test')
+    sys_sents = read_lines(get_system_outputs_dir('turkcorpus_test') / "ACCESS")
+    stats = get_sentence_bleu_stats(sys_sents, refs_sents, lowercase=True)
+    assert stats.shape == (len(sys_sents), 10)
+    assert bleu_from_stats(stats) == corpus_bleu(sys_sents, refs_sents, lowercase=True)
+    assert bleu_from_stats(stats[:100]) == pytest.approx(
+        corpus_bleu(sys_sents[:100], [ref_sents[:100] for ref_sents in refs_sents], lowercase=True)
+    )
+    # The references of the scorer are reused for several systems
+    bleu_scorer = get_bleu_scorer_with_references(refs_sents, lowercase=True)
+    np.testing.assert_array_equal(
+        get_sentence_bleu_stats(sys_sents, refs_sents, lowercase=True, bleu_scorer=bleu_scorer), stats
+    )
+    np.testing.assert_array_equal(
+        get_sentence_bleu_stats(refs_sents[0], refs_sents, lowercase=True, bleu_scorer=bleu_scorer),
+        get_sentence_bleu_stats(refs_sents[0], refs_sents, lowercase=True),
+    )
+
+
+def test_sentence_bleu_stats_layout():
+    # The statistics come from a private sacrebleu method, they must match the public BLEUScore of each sentence
+    refs_sents = [ref_sents[:20] for ref_sents in get_refs_sents('turkcorpus_test')]
+    sys_sents = read_lines(get_system_outputs_dir('turkcorpus_test') / "ACCESS")[:20]
+    stats = get_sentence_bleu_stats(sys_sents, refs_sents, tokenizer='none')
+    bleu_scorer = BLEU(tokenize='none', force=True)
+    for sample_stats, sys_sent, *ref_sents in zip(stats, sys_sents, *refs_sents):
+        bleu_score = bleu_scorer.corpus_score([sys_sent], [[ref_sent] for ref_sent in ref_sents])
+        expected_stats = [bleu_score.sys_len, bleu_score.ref_len, *bleu_score.counts, *bleu_score.totals]
+        assert sample_stats.tolist() == expected_stats
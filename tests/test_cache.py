@@ -0,0 +1,15 @@
+from easse.utils.cache import SQLiteCache, get_content_hash
+
+
+def test_sqlite_cache(tmp_path):
+    cache_path = tmp_path / 'cache.sqlite'
+    cache = SQLiteCache(cache_path)
+    key = get_content_hash('A sentence .', ['tokenize', 'ssplit'], {'ssplit.eolonly': True})
+    assert key != get_content_hash('A sentence .', ['tokenize', 'ssplit'], {'ssplit.eolonly': False})
+    assert cache.get_many([key]) == {}
+    cache.set_many({key: {'sentences': [{'words': [('A', {'Lemma': 'a'})]}]}})
+    cache.close()
+    # Persisted on disk
+    cache = SQLiteCache(cache_path)
+    assert cache.get_many([key, key, 'missing']) == {key: {'sentences': [{'words': [('A', {'Lemma': 'a'})]}]}}
+    assert len(cache) == 1
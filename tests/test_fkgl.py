@@ -1,9 +1,29 @@
 import pytest
 
-from easse.fkgl import corpus_fkgl
+from easse.fkgl import corpus_fkgl, FKGLScorer, get_sentence_fkgl_stats, fkgl_from_stats
+from easse.utils.text import to_sentences_many
 from easse.utils.resources import get_orig_sents, get_refs_sents
 
 
 def test_corpus_fkgl():
     assert corpus_fkgl(get_orig_sents('turkcorpus_test_legacy')) == pytest.approx(9.9, abs=1e-1)
     assert corpus_fkgl(get_refs_sents('turkcorpus_test_legacy')[0]) == pytest.approx(8.2, abs=1e-1)
+
+
+def test_fkgl_scorer_add_many():
+    sentences = get_orig_sents('turkcorpus_test_legacy')[:100]
+    scorer = FKGLScorer()
+    for sentence in sentences:
+        scorer.add(sentence)
+    batch_scorer = FKGLScorer()
+    batch_scorer.add_many(sentences)
+    assert batch_scorer.score() == scorer.score()
+    assert to_sentences_many(['First sentence. Second one.', 'Third.']) == [['First sentence.', 'Second one.'], ['Third.']]
+
+
+def test_get_sentence_fkgl_stats():
+    sentences = get_orig_sents('turkcorpus_test_legacy')
+    stats = get_sentence_fkgl_stats(sentences)
+    assert stats.shape == (len(sentences), 3)
+    assert fkgl_from_stats(stats.sum(axis=0)) == corpus_fkgl(sentences)
+    assert fkgl_from_stats(stats[:10].sum(axis=0)) == corpus_fkgl(sentences[:10])
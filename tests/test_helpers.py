@@ -0,0 +1,15 @@
+import numpy as np
+
+from easse.utils.helpers import get_smallest_indexes
+
+
+def test_get_smallest_indexes():
+    rng = np.random.RandomState(0)
+    # Few distinct values so that there are many ties
+    values = rng.randint(0, 5, size=1000).astype(float)
+    values[rng.choice(1000, size=20)] = np.nan
+    expected = sorted(range(len(values)), key=lambda i: (np.isnan(values[i]), values[i]))
+    for k in [0, 1, 10, 300, 990, 1000, 2000]:
+        assert get_smallest_indexes(values, k).tolist() == expected[:k]
+    assert get_smallest_indexes(np.zeros(100), 5).tolist() == [0, 1, 2, 3, 4]
+    assert get_smallest_indexes([], 5).tolist() == []
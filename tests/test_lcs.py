@@ -0,0 +1,17 @@
+from easse.annotation.lcs import get_lcs, get_lcs_alignment
+
+
+def test_get_lcs():
+    seq1 = 'the cat sat on the mat'.split()
+    seq2 = 'a cat is on the red mat'.split()
+    assert get_lcs(seq1, seq2) == ['cat', 'on', 'the', 'mat']
+    assert get_lcs_alignment(seq1, seq2) == [(1, 1), (3, 3), (4, 4), (5, 6)]
+    # Ties are broken by dropping the last item of seq1 first
+    assert get_lcs(['a', 'b'], ['b', 'a']) == ['a']
+    assert get_lcs([], seq2) == []
+
+
+def test_get_lcs_long_sequences():
+    seq1 = ['a', 'b', 'c'] * 2000
+    seq2 = ['a', 'c'] * 2000
+    assert get_lcs(seq1, seq2) == ['a', 'c'] * 2000
@@ -0,0 +1,21 @@
+from easse.bleu import corpus_bleu, corpus_averaged_sentence_bleu
+from easse.compression import corpus_f1_token
+from easse.parallel import corpus_scores_parallel
+from easse.sari import corpus_sari
+from easse.utils.helpers import read_lines
+from easse.utils.resources import get_orig_sents, get_refs_sents, get_system_outputs_dir
+
+
+def test_corpus_scores_parallel():
+    orig_sents = get_orig_sents('turkcorpus_test')
+    refs_sents = get_refs_sents('turkcorpus_test')
+    sys_sents = read_lines(get_system_outputs_dir('turkcorpus_test') / "ACCESS")
+    metrics_scores = corpus_scores_parallel(
+        orig_sents, sys_sents, refs_sents, metrics=['bleu', 'sent_bleu', 'sari', 'sari_legacy', 'f1_token'], jobs=2
+    )
+    # Exactly the same scores as the serial path
+    assert metrics_scores['bleu'] == corpus_bleu(sys_sents, refs_sents, lowercase=True)
+    assert metrics_scores['sent_bleu'] == corpus_averaged_sentence_bleu(sys_sents, refs_sents, lowercase=True)
+    assert metrics_scores['sari'] == corpus_sari(orig_sents, sys_sents, refs_sents)
+    assert metrics_scores['sari_legacy'] == corpus_sari(orig_sents, sys_sents, refs_sents, legacy=True)
+    assert metrics_scores['f1_token'] == corpus_f1_token(sys_sents, refs_sents)
@@ -0,0 +1,28 @@
+from easse.utils.preprocessing import get_tokenizer, normalize, normalize_many, NormalizationCache
+
+
+def test_get_tokenizer_is_shared():
+    assert get_tokenizer('13a') is get_tokenizer('13a')
+    assert get_tokenizer('moses') is get_tokenizer('moses')
+
+
+def test_normalize_many():
+    sentences = ["Hello, World!", "It's a \"test\"."]
+    for tokenizer in ['13a', 'intl', 'moses', 'none']:
+        for lowercase in [True, False]:
+            assert normalize_many(sentences, lowercase, tokenizer) == [
+                normalize(sentence, lowercase, tokenizer) for sentence in sentences
+            ]
+    assert normalize_many(sentences, return_str=False) == [
+        normalize(sentence, return_str=False) for sentence in sentences
+    ]
+
+
+def test_normalization_cache():
+    sentences = ["Hello, World!", "It's a \"test\".", "Hello, World!"]
+    cache = NormalizationCache()
+    for lowercase in [True, False]:
+        assert cache.normalize_many(sentences, lowercase, '13a') == normalize_many(sentences, lowercase, '13a')
+        assert normalize_many(sentences, lowercase, '13a', return_str=False, cache=cache) == normalize_many(
+            sentences, lowercase, '13a', return_str=False
+        )
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from easse.bleu import corpus_bleu
+from easse.fkgl import corpus_fkgl
+from easse.quality_estimation import corpus_quality_estimation
+import easse.report as report
+from easse.report import SentenceScoresTable, get_all_scores, get_sentence_scores_table, get_sentence_scores_tables
+from easse.sari import corpus_sari
+from easse.utils.helpers import read_lines
+from easse.utils.resources import get_orig_sents, get_refs_sents, get_system_outputs_dir
+
+
+def get_samples(n_samples=100):
+    orig_sents = get_orig_sents('turkcorpus_test')[:n_samples]
+    refs_sents = [ref_sents[:n_samples] for ref_sents in get_refs_sents('turkcorpus_test')]
+    sys_sents = read_lines(get_system_outputs_dir('turkcorpus_test') / "ACCESS")[:n_samples]
+    return orig_sents, sys_sents, refs_sents
+
+
+def test_sentence_scores_table_get_scores():
+    orig_sents, sys_sents, refs_sents = get_samples()
+    metrics = ['bleu', 'sari', 'fkgl']
+    table = get_sentence_scores_table(orig_sents, sys_sents, refs_sents, lowercase=True, metrics=metrics)
+    # e.g. a length bin
+    indexes = np.arange(5, len(orig_sents), 3)
+    sub_orig_sents = [orig_sents[i] for i in indexes]
+    sub_sys_sents = [sys_sents[i] for i in indexes]
+    sub_refs_sents = [[ref_sents[i] for i in indexes] for ref_sents in refs_sents]
+    scores = table.get_scores(indexes)
+    assert scores == get_all_scores(sub_orig_sents, sub_sys_sents, sub_refs_sents, lowercase=True, metrics=metrics)
+    assert scores['BLEU'] == pytest.approx(corpus_bleu(sub_sys_sents, sub_refs_sents, lowercase=True), abs=0.005)
+    assert scores['SARI'] == pytest.approx(
+        corpus_sari(sub_orig_sents, sub_sys_sents, sub_refs_sents, lowercase=True), abs=0.005
+    )
+    assert scores['FKGL'] == pytest.approx(corpus_fkgl(sub_sys_sents), abs=0.005)
+    quality_estimation = corpus_quality_estimation(sub_orig_sents, sub_sys_sents, lowercase=True)
+    for feature_name, value in quality_estimation.items():
+        assert scores[feature_name] == pytest.approx(value, abs=0.005)
+    # All samples
+    assert table.get_scores() == get_all_scores(orig_sents, sys_sents, refs_sents, lowercase=True, metrics=metrics)
+
+
+def test_sentence_scores_table_save_load(tmp_path):
+    orig_sents, sys_sents, refs_sents = get_samples(20)
+    table = get_sentence_scores_table(orig_sents, sys_sents, refs_sents, metrics=['bleu', 'sari'])
+    table.save(tmp_path / 'table.npz')
+    loaded_table = SentenceScoresTable.load(tmp_path / 'table.npz')
+    assert loaded_table.metrics == ['bleu', 'sari']
+    assert loaded_table.columns.keys() == table.columns.keys()
+    for name, column in table.columns.items():
+        np.testing.assert_array_equal(loaded_table[name], column)
+    assert loaded_table.get_scores() == table.get_scores()
+
+
+def test_sentence_scores_tables_workspace_dir(tmp_path, monkeypatch):
+    orig_sents, sys_sents, refs_sents = get_samples(20)
+    sys_sents_list = [sys_sents, orig_sents]
+    tables = get_sentence_scores_tables(orig_sents, sys_sents_list, refs_sents, workspace_dir=tmp_path)
+    paths = sorted(tmp_path.glob('*.npz'))
+    assert len(paths) == 2
+    mtimes = [path.stat().st_mtime_ns for path in paths]
+    # Loaded from the workspace, nothing is scored or written again
+    n_scored_systems = []
+    compute_sentence_scores_tables = report._compute_sentence_scores_tables
+
+    def counting_compute_sentence_scores_tables(orig_sents, sys_sents_list, *args):
+        n_scored_systems.append(len(sys_sents_list))
+        return compute_sentence_scores_tables(orig_sents, sys_sents_list, *args)
+
+    monkeypatch.setattr(report, '_compute_sentence_scores_tables', counting_compute_sentence_scores_tables)
+    loaded_tables = get_sentence_scores_tables(orig_sents, sys_sents_list, refs_sents, workspace_dir=tmp_path)
+    assert sorted(tmp_path.glob('*.npz')) == paths
+    assert [path.stat().st_mtime_ns for path in paths] == mtimes
+    assert n_scored_systems == [0]
+    assert [table.get_scores() for table in loaded_tables] == [table.get_scores() for table in tables]
+    # Other scoring options are saved in other tables
+    get_sentence_scores_tables(orig_sents, [sys_sents], refs_sents, lowercase=True, workspace_dir=tmp_path)
+    assert len(list(tmp_path.glob('*.npz'))) == 3
+    get_sentence_scores_tables(orig_sents, [sys_sents], refs_sents, tokenizer='none', workspace_dir=tmp_path)
+    assert len(list(tmp_path.glob('*.npz'))) == 4
+
+
+def test_sentence_scores_table_bertscore():
+    # Scores are aggregated from precomputed sentence BERTScores, the model is not loaded
+    pytest.importorskip('bert_score')
+    orig_sents, sys_sents, refs_sents = get_samples(20)
+    bertscore_sentence_scores = np.random.RandomState(0).rand(len(sys_sents), 3).astype(np.float32)
+    table = get_sentence_scores_table(
+        orig_sents,
+        sys_sents,
+        refs_sents,
+        metrics=['sari', 'bertscore'],
+        bertscore_sentence_scores=bertscore_sentence_scores,
+    )
+    indexes = [1, 4, 7]
+    scores = table.get_scores(indexes)
+    expected_scores = bertscore_sentence_scores[indexes].mean(axis=0, dtype=np.float64)
+    assert (scores['BERTScore P'], scores['BERTScore R'], scores['BERTScore F1']) == pytest.approx(
+        expected_scores, abs=0.005
+    )
+    html = report.get_qualitative_examples_html(orig_sents, sys_sents, refs_sents, sentence_scores_table=table)
+    assert 'Best simplifications according to BERTScore' in html
+    assert 'Worst simplifications according to BERTScore' in html
+    assert f'BERTScore F1={bertscore_sentence_scores[:, 2].max():.2f}' in html
+    assert f'BERTScore F1={bertscore_sentence_scores[:, 2].min():.2f}' in html
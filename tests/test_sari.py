@@ -64,3 +64,45 @@ def test_corpus_sari():
     hyp_sents = read_lines(system_outputs_dir / "ACCESS")
     sari_score = sari.corpus_sari(orig_sents, hyp_sents, refs_sents)
     assert sari_score == pytest.approx(41.381013)  # Scores from MUSS https://arxiv.org/abs/2005.00352
+
+
+def test_compute_ngram_stats_vectorized():
+    orig_sents = get_orig_sents('turkcorpus_test_legacy')
+    refs_sents = get_refs_sents('turkcorpus_test_legacy')
+    sys_sents = read_lines(get_system_outputs_dir('turkcorpus_test') / "tok.low/Dress-Ls.tok.low")
+    assert sari.compute_ngram_stats_vectorized(orig_sents, sys_sents, refs_sents) == sari.compute_ngram_stats(
+        orig_sents, sys_sents, refs_sents
+    )
+    # Repeated n-grams, empty sentences and no references
+    orig_sents = ["a a b a a b", "", "a b c d"]
+    sys_sents = ["a a b", "a", ""]
+    for refs_sents in [[], [["a b a", "", "a b c d"]], [["a a a", "b", "d"], ["a b a a b", "a a", "a b c d a b c d"]]]:
+        assert sari.compute_ngram_stats_vectorized(orig_sents, sys_sents, refs_sents) == sari.compute_ngram_stats(
+            orig_sents, sys_sents, refs_sents
+        )
+
+
+def test_get_sentence_sari_stats():
+    orig_sents = get_orig_sents('turkcorpus_test')
+    refs_sents = get_refs_sents('turkcorpus_test')
+    sys_sents = read_lines(get_system_outputs_dir('turkcorpus_test') / "ACCESS")
+    stats = sari.get_sentence_sari_stats(orig_sents, sys_sents, refs_sents)
+    assert stats.shape == (len(orig_sents), 9, sari.NGRAM_ORDER)
+    assert sari.sari_from_stats(stats) == pytest.approx(41.381013)
+    # Scores of a subset of samples from the rows of the statistics
+    indexes = [3, 14, 15, 92, 65]
+    subset_refs_sents = [[ref_sents[i] for i in indexes] for ref_sents in refs_sents]
+    assert sari.sari_from_stats(stats[indexes]) == pytest.approx(
+        sari.corpus_sari([orig_sents[i] for i in indexes], [sys_sents[i] for i in indexes], subset_refs_sents)
+    )
+    assert sari.sari_from_stats(stats[indexes], use_paper_version=True) == pytest.approx(
+        sari.corpus_sari(
+            [orig_sents[i] for i in indexes],
+            [sys_sents[i] for i in indexes],
+            subset_refs_sents,
+            use_paper_version=True,
+        )
+    )
+    assert sari.sari_from_stats(stats[7]) == pytest.approx(
+        sari.sentence_sari(orig_sents[7], sys_sents[7], [ref_sents[7] for ref_sents in refs_sents])
+    )
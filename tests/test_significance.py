@@ -0,0 +1,25 @@
+import pytest
+
+from easse.significance import get_significance_scores
+from easse.utils.helpers import read_lines
+from easse.utils.resources import get_orig_sents, get_refs_sents, get_system_outputs_dir
+
+
+@pytest.mark.parametrize('method', ['bootstrap', 'ar'])
+def test_get_significance_scores(method):
+    orig_sents = get_orig_sents('turkcorpus_test')
+    refs_sents = get_refs_sents('turkcorpus_test')
+    system_outputs_dir = get_system_outputs_dir('turkcorpus_test')
+    sys_sents_list = [read_lines(system_outputs_dir / system_name) for system_name in ['ACCESS', 'ACCESS', 'Hybrid']]
+    significance_scores = get_significance_scores(
+        orig_sents, sys_sents_list, refs_sents, method=method, n_resamples=200
+    )
+    assert significance_scores['sari'][0]['score'] == pytest.approx(41.381013)
+    for results in significance_scores.values():
+        assert results[0]['p_value'] is None
+        # Same system as the baseline
+        assert results[1]['p_value'] == pytest.approx(1.0)
+        assert results[2]['p_value'] < 0.05
+        for result in results:
+            ci_low, ci_high = result['ci']
+            assert ci_low <= result['score'] <= ci_high
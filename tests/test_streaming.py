@@ -0,0 +1,25 @@
+import pytest
+
+from easse.bleu import corpus_bleu
+from easse.compression import corpus_f1_token
+from easse.sari import corpus_sari, get_corpus_sari_operation_scores
+from easse.streaming import corpus_scores_streaming
+from easse.utils.helpers import read_lines
+from easse.utils.resources import get_orig_sents, get_refs_sents, get_system_outputs_dir
+
+
+def test_corpus_scores_streaming():
+    orig_sents = get_orig_sents('turkcorpus_test')
+    refs_sents = get_refs_sents('turkcorpus_test')
+    sys_sents = read_lines(get_system_outputs_dir('turkcorpus_test') / "ACCESS")
+    samples = zip(orig_sents, sys_sents, zip(*refs_sents))
+    metrics_scores = corpus_scores_streaming(
+        samples, chunk_size=97, metrics=['bleu', 'sari', 'sari_legacy', 'sari_by_operation', 'f1_token']
+    )
+    assert metrics_scores['bleu'] == pytest.approx(corpus_bleu(sys_sents, refs_sents, lowercase=True))
+    assert metrics_scores['sari'] == pytest.approx(corpus_sari(orig_sents, sys_sents, refs_sents))
+    assert metrics_scores['sari_legacy'] == pytest.approx(corpus_sari(orig_sents, sys_sents, refs_sents, legacy=True))
+    assert (metrics_scores['sari_add'], metrics_scores['sari_keep'], metrics_scores['sari_del']) == pytest.approx(
+        get_corpus_sari_operation_scores(orig_sents, sys_sents, refs_sents)
+    )
+    assert metrics_scores['f1_token'] == pytest.approx(corpus_f1_token(sys_sents, refs_sents))